@@ -8,10 +8,22 @@ import sys
 import json
 import logging
 import argparse
-import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from backend.scrapers.web import WebsiteScraper
-from backend.config import RAW_DIR, PROCESSED_DIR
+import pandas as pd
+
+from backend.storage.results import ResultWriter, compact_results, load_results
+from backend.storage.checkpoint import CrawlCheckpoint
+from backend.storage.archive import CrawlArchive
+from backend.storage.columnar import (
+    PACKAGES_TABLE, packages_frame, sites_frame, read_packages_table, read_sites_table, write_packages_table
+)
+from backend.processors.dedup import annotate_duplicates, unique_packages
+from backend.processors.enrichment import EnrichmentRunner
+from backend.processors import analytics
+from backend.config import RAW_DIR, PROCESSED_DIR, CACHE_DIR, BROWSER_POOL_SIZE
 
 # Set up logging
 logging.basicConfig(
@@ -24,6 +36,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger("TrippyPick")
 
+# Streamed (JSON Lines) and compacted (legacy JSON) results files
+RESULTS_JSONL = os.path.join(RAW_DIR, 'website_packages.jsonl')
+RESULTS_JSON = os.path.join(RAW_DIR, 'website_packages.json')
+
+# Unique packages with NLP results, written by --nlp-workers
+ENRICHED_JSONL = os.path.join(PROCESSED_DIR, 'enriched_packages.jsonl')
+
+# Journal of finished sites and package pages, used by --resume
+CHECKPOINT_FILE = os.path.join(CACHE_DIR, 'crawl_checkpoint.jsonl')
+
 # List of travel websites to scrape
 TRAVEL_WEBSITES = {
     "wanderon": {
@@ -95,87 +117,238 @@ def load_websites_list(file_path=None):
             return json.load(f)
     return TRAVEL_WEBSITES
 
-def scrape_websites(websites_dict):
-    """Scrape travel websites for package information"""
-    website_scraper = WebsiteScraper(output_dir=RAW_DIR)
+def _scrape_site(website_scraper, name, info, checkpoint=None):
+    """Scrape a single website and attach its listing metadata"""
+    url = info['url']
+    logger.info(f"Scraping {name}: {url}")
+    
+    metadata = {
+        'company_name': name,
+        'category': info.get('category', 'Unknown'),
+        'popularity': info.get('popularity', 'Unknown')
+    }
+    # Packages only go to the results writer, so memory does not grow with the crawl
+    website_data = website_scraper.scrape(url, metadata=metadata, keep_packages=False)
+    if website_data:
+        # Log summary
+        packages_count = website_data['package_count']
+        logger.info(f"✓ Found {packages_count} packages from {name}")
+        
+        # Sites that failed are retried by --resume
+        if checkpoint is not None and not website_data.get('error'):
+            checkpoint.mark_site_done(name)
+    
+    return website_data
+
+def scrape_websites(websites_dict, workers=1, result_writer=None, checkpoint=None):
+    """
+    Scrape travel websites for package information
+    
+    Args:
+        websites_dict (dict): Websites to scrape, keyed by company name
+        workers (int): Number of websites to scrape at the same time
+        result_writer (ResultWriter): Writer packages are streamed to as they
+            are extracted; each scraper keeps its own file if not given
+        checkpoint (CrawlCheckpoint): Progress journal; sites and package pages
+            it marks as done are skipped
+    
+    Returns:
+        dict: Scraped website data keyed by company name, without the packages
+            themselves (read them back with compact_results)
+    """
+    if checkpoint is not None:
+        done = [name for name in websites_dict if checkpoint.is_site_done(name)]
+        if done:
+            logger.info(f"Skipping {len(done)} websites finished by a previous run: {', '.join(done)}")
+            websites_dict = {name: info for name, info in websites_dict.items() if name not in done}
+    
+    if workers > 1 and len(websites_dict) > 1:
+        return _scrape_websites_concurrently(websites_dict, workers, result_writer, checkpoint)
+    
+    from backend.scrapers.web import WebsiteScraper
+    
+    website_scraper = WebsiteScraper(output_dir=RAW_DIR, result_writer=result_writer,
+                                     checkpoint=checkpoint)
     results = {}
     
     try:
         for name, info in websites_dict.items():
-            url = info['url']
-            logger.info(f"Scraping {name}: {url}")
-            
             try:
-                website_data = website_scraper.scrape(url)
+                website_data = _scrape_site(website_scraper, name, info, checkpoint)
                 if website_data:
-                    # Add metadata
-                    website_data['company_name'] = name
-                    website_data['category'] = info.get('category', 'Unknown')
-                    website_data['popularity'] = info.get('popularity', 'Unknown')
                     results[name] = website_data
-                    
-                    # Log summary
-                    packages_count = len(website_data.get('packages', []))
-                    logger.info(f"✓ Found {packages_count} packages from {name}")
-                    
+            
             except Exception as e:
                 logger.error(f"Error scraping {name}: {e}")
                 continue
-            
-            # Delay between sites
-            time.sleep(5)
-            
+    
     finally:
         website_scraper.close()
     
     return results
 
-def analyze_results(results):
-    """Analyze and summarize scraped data"""
-    total_websites = len(results)
-    total_packages = sum(len(data.get('packages', [])) for data in results.values())
-    
-    by_category = {}
-    for name, data in results.items():
-        category = data.get('category', 'Unknown')
-        if category not in by_category:
-            by_category[category] = {'count': 0, 'packages': 0}
-        by_category[category]['count'] += 1
-        by_category[category]['packages'] += len(data.get('packages', []))
-    
-    # Find popular destinations
-    destinations = {}
-    for data in results.values():
-        for package in data.get('packages', []):
-            dest = package.get('destination')
-            if dest:
-                destinations[dest] = destinations.get(dest, 0) + 1
-    
-    popular_destinations = sorted(destinations.items(), key=lambda x: x[1], reverse=True)[:10]
-    
-    # Price range analysis
-    prices = []
-    for data in results.values():
-        for package in data.get('packages', []):
-            price = package.get('price')
-            if price:
-                # Extract numeric price
-                import re
-                price_match = re.search(r'(\d+)', price.replace(',', ''))
-                if price_match:
-                    prices.append(int(price_match.group(1)))
-    
-    return {
-        'total_websites': total_websites,
-        'total_packages': total_packages,
-        'by_category': by_category,
-        'popular_destinations': popular_destinations,
-        'price_range': {
-            'min': min(prices) if prices else 0,
-            'max': max(prices) if prices else 0,
-            'avg': sum(prices) // len(prices) if prices else 0
-        }
-    }
+def _scrape_websites_concurrently(websites_dict, workers, result_writer=None, checkpoint=None):
+    """
+    Scrape several websites at once, one domain per worker
+    
+    Each worker leases its own WebsiteScraper (session and politeness
+    budget) while all of them render pages on one shared browser pool, so
+    the number of Chrome instances stays bounded. Results are merged back
+    in the order of websites_dict.
+    """
+    from backend.scrapers.web import WebsiteScraper
+    from backend.scrapers.browser_pool import BrowserPool
+    
+    workers = min(workers, len(websites_dict))
+    logger.info(f"Scraping {len(websites_dict)} websites with {workers} workers")
+    
+    # Scrapers are created lazily and handed back to the pool after each site
+    # so a worker reuses its warm browser for the next domain
+    idle_scrapers = queue.Queue()
+    all_scrapers = []
+    scrapers_lock = threading.Lock()
+    browser_pool = BrowserPool(size=max(workers, BROWSER_POOL_SIZE))
+    
+    def lease_scraper():
+        try:
+            return idle_scrapers.get_nowait()
+        except queue.Empty:
+            website_scraper = WebsiteScraper(output_dir=RAW_DIR, browser_pool=browser_pool,
+                                             result_writer=result_writer, checkpoint=checkpoint)
+            with scrapers_lock:
+                all_scrapers.append(website_scraper)
+            return website_scraper
+    
+    def scrape_one(name, info):
+        website_scraper = lease_scraper()
+        try:
+            return _scrape_site(website_scraper, name, info, checkpoint)
+        finally:
+            idle_scrapers.put(website_scraper)
+    
+    scraped = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="site") as executor:
+            futures = {
+                executor.submit(scrape_one, name, info): name
+                for name, info in websites_dict.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    website_data = future.result()
+                    if website_data:
+                        scraped[name] = website_data
+                except Exception as e:
+                    logger.error(f"Error scraping {name}: {e}")
+    finally:
+        for website_scraper in all_scrapers:
+            website_scraper.close()
+        browser_pool.close()
+    
+    # Keep the same ordering as a sequential run
+    return {name: scraped[name] for name in websites_dict if name in scraped}
+
+def analyze_results(results, packages=None, top_n=10):
+    """
+    Analyze and summarize scraped data
+    
+    Args:
+        results (dict): Website data keyed by site
+        packages (DataFrame): Normalized package table (built from results if not given)
+        top_n (int): Number of popular destinations to list
+    """
+    if packages is None:
+        packages = packages_frame(results)
+    return analytics.analyze(packages, sites_frame(results), top_n=top_n)
+
+def _load_analysis(path=None, top_n=10):
+    """
+    Analyze a results file or package table
+    
+    The Parquet package table is read column by column, so only the
+    columns the analysis needs are loaded; it is used when asked for or
+    when it is at least as new as the latest results file. Its sites table
+    supplies the websites without packages, as the results files do.
+    """
+    if path is None:
+        results_path = _latest_results_file()
+        if os.path.exists(PACKAGES_TABLE) and (
+            not os.path.exists(results_path) or os.path.getmtime(PACKAGES_TABLE) >= os.path.getmtime(results_path)
+        ):
+            path = PACKAGES_TABLE
+        else:
+            path = results_path
+    
+    if path.endswith('.parquet'):
+        packages = read_packages_table(path, columns=analytics.ANALYSIS_COLUMNS)
+        return analytics.analyze(packages, read_sites_table(path), top_n=top_n)
+    return analyze_results(load_results(path), top_n=top_n)
+
+def _latest_results_file():
+    """Return whichever results file was written last (JSON or JSON Lines)"""
+    existing = [path for path in (RESULTS_JSON, RESULTS_JSONL) if os.path.exists(path)]
+    if not existing:
+        return RESULTS_JSON
+    return max(existing, key=os.path.getmtime)
+
+def _format_price(price_paise, currency):
+    """Price in paise as display text, e.g. ₹12,999"""
+    symbol = '₹' if currency in (None, 'INR') else f"{currency} "
+    return f"{symbol}{price_paise / 100:,.0f}"
+
+def show_price_changes(price_history=None, price_movers=None):
+    """Print a package's price history and/or the latest crawl's price movers from the archive"""
+    with CrawlArchive() as archive:
+        if price_history:
+            history = archive.price_history(price_history)
+            print(f"\n=== Price History: {price_history} ===")
+            if history.empty:
+                print("  Not in the archive")
+            for row in history.itertuples():
+                price = "no price" if pd.isna(row.price_paise) else _format_price(row.price_paise, row.currency)
+                print(f"  {row.scraped_at}: {price}")
+        
+        if price_movers is not None:
+            movers = archive.price_movers(price_movers)
+            print(f"\n=== Packages whose price moved {price_movers:g}% or more since their last crawl ===")
+            if movers.empty:
+                print("  None")
+            for row in movers.itertuples():
+                print(f"  {row.url}: {_format_price(row.old_price_paise, row.currency)} -> "
+                      f"{_format_price(row.new_price_paise, row.currency)} ({row.change_pct:+.1f}%)")
+
+def load_database(results):
+    """Upsert the organisers and packages of a crawl into the database (see DATABASE_URL)"""
+    from backend.storage.database import PackageLoader
+    
+    stats = PackageLoader().load(results)
+    print(f"✓ Loaded {stats['packages']} packages from {stats['organisers']} organisers into the database "
+          f"in {stats['seconds']:.1f}s ({stats['packages_per_minute']:,.0f} packages/min)")
+
+def enrich_results(results, workers):
+    """
+    Run NLP over the unique scraped packages
+    
+    Duplicates marked by annotate_duplicates are skipped. Enriched packages
+    are streamed to ENRICHED_JSONL as they come back, followed by the site
+    records, so the file loads like any JSON Lines results file.
+    
+    Args:
+        results (dict): Compacted results keyed by site
+        workers (int): NLP worker processes
+    """
+    runner = EnrichmentRunner(workers=workers)
+    enriched = 0
+    
+    with ResultWriter(ENRICHED_JSONL) as writer:
+        for site, package in runner.enrich(unique_packages(results)):
+            writer.write_package(site, results[site].get('domain'), package)
+            enriched += 1
+        for site, website_data in results.items():
+            writer.write_site(site, website_data)
+    
+    logger.info(f"Enriched {enriched} unique packages with {workers} NLP workers into {ENRICHED_JSONL}")
 
 def main():
     parser = argparse.ArgumentParser(description="TrippyPick Travel Package Scraper")
@@ -183,35 +356,73 @@ def main():
     parser.add_argument('--category', help="Scrape only specific category")
     parser.add_argument('--analyze', action='store_true', help="Analyze existing data")
     parser.add_argument('--file', help="Load websites from JSON file")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of websites to scrape concurrently (default: 1)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continue an interrupted crawl, skipping finished sites and packages")
+    parser.add_argument('--nlp-workers', type=int, default=0,
+                        help="Run NLP over the scraped packages with this many processes (default: 0, skip)")
+    parser.add_argument('--results',
+                        help="Results file to analyze (.json, .jsonl or a .parquet package table; "
+                             "default: newest of data/raw and the package table)")
+    parser.add_argument('--price-history', metavar='URL',
+                        help="Show the archived price history of a package")
+    parser.add_argument('--price-movers', type=float, metavar='PERCENT',
+                        help="Show packages whose price moved at least PERCENT since their previous crawl")
+    parser.add_argument('--top', type=int, default=10,
+                        help="Number of popular destinations shown by --analyze (default: 10)")
+    parser.add_argument('--load-db', action='store_true',
+                        help="Upsert the crawl's packages into the database; with --results, load that file "
+                             "instead of scraping")
     
     args = parser.parse_args()
     
-    # Create directories
-    os.makedirs(RAW_DIR, exist_ok=True)
-    os.makedirs(PROCESSED_DIR, exist_ok=True)
+    if args.price_history or args.price_movers is not None:
+        show_price_changes(args.price_history, args.price_movers)
+        return
+    
+    if args.load_db and args.results:
+        load_database(load_results(args.results))
+        return
     
     if args.analyze:
         # Analyze existing data
         try:
-            with open(os.path.join(RAW_DIR, 'website_packages.json'), 'r') as f:
-                results = json.load(f)
-                analysis = analyze_results(results)
-                
-                print("\n=== Scraping Analysis ===")
-                print(f"Total websites scraped: {analysis['total_websites']}")
-                print(f"Total packages found: {analysis['total_packages']}")
-                
-                print("\nBy Category:")
-                for cat, data in analysis['by_category'].items():
-                    print(f"  {cat}: {data['count']} sites, {data['packages']} packages")
-                
-                print("\nPopular Destinations:")
-                for dest, count in analysis['popular_destinations']:
-                    print(f"  {dest}: {count} packages")
-                
-                print(f"\nPrice Range: ₹{analysis['price_range']['min']:,} - ₹{analysis['price_range']['max']:,}")
-                print(f"Average Price: ₹{analysis['price_range']['avg']:,}")
-                
+            analysis = _load_analysis(args.results, top_n=args.top)
+            
+            print("\n=== Scraping Analysis ===")
+            print(f"Total websites scraped: {analysis['total_websites']}")
+            print(f"Total packages found: {analysis['total_packages']}")
+            
+            print("\nBy Category:")
+            for cat, data in analysis['by_category'].items():
+                print(f"  {cat}: {data['count']} sites, {data['packages']} packages")
+            
+            print("\nPopular Destinations:")
+            for dest, count in analysis['popular_destinations']:
+                print(f"  {dest}: {count} packages")
+            
+            price_range = analysis['price_range']
+            print(f"\nPrice Range: ₹{price_range['min']:,} - ₹{price_range['max']:,}")
+            print(f"Average Price: ₹{price_range['avg']:,}")
+            print("Percentiles: " + ", ".join(
+                f"p{p}: ₹{price_range[f'p{p}']:,}" for p in analytics.PRICE_PERCENTILES
+            ))
+            
+            print("\nPrice Bands:")
+            for band, count in analysis['price_histogram']:
+                if count:
+                    print(f"  {band}: {count} packages")
+            
+            print("\nMedian Price by Category:")
+            for cat, price in analysis['price_by_category'].items():
+                print(f"  {cat}: ₹{price:,}")
+            
+            durations = analysis['durations']
+            print(f"\nTrip Length: mean {durations['mean']} days, median {durations['median']:g} days")
+            for days, count in durations['days']:
+                print(f"  {days} days: {count} packages")
+        
         except FileNotFoundError:
             print("No data found. Run scraper first.")
         return
@@ -233,18 +444,32 @@ def main():
     
     logger.info(f"Starting to scrape {len(websites)} websites...")
     
-    # Scrape websites
-    results = scrape_websites(websites)
+    # Scrape websites, streaming packages to the JSON Lines file. A resumed
+    # run appends to the records and journal of the interrupted one.
+    with ResultWriter(RESULTS_JSONL, append=args.resume) as result_writer, \
+            CrawlCheckpoint(CHECKPOINT_FILE, resume=args.resume) as checkpoint:
+        scrape_websites(websites, workers=args.workers, result_writer=result_writer,
+                        checkpoint=checkpoint)
+    
+    # Compact into the legacy JSON file (including sites from a resumed run),
+    # giving near-duplicate packages across sites a shared canonical_id
+    results = compact_results(RESULTS_JSONL, RESULTS_JSON, transform=annotate_duplicates)
+    logger.info(f"Results saved to {RESULTS_JSON}")
+    
+    # Typed price/duration/destination columns for analytics
+    packages = write_packages_table(results)
+    with CrawlArchive() as archive:
+        archive.append(packages)
     
-    # Save results
-    output_file = os.path.join(RAW_DIR, 'website_packages.json')
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=4, ensure_ascii=False)
+    if args.load_db:
+        load_database(results)
     
-    logger.info(f"Results saved to {output_file}")
+    # Post-scrape NLP enrichment
+    if args.nlp_workers > 0:
+        enrich_results(results, args.nlp_workers)
     
     # Show summary
-    analysis = analyze_results(results)
+    analysis = analyze_results(results, packages)
     print(f"\n✓ Scraped {analysis['total_websites']} websites")
     print(f"✓ Found {analysis['total_packages']} packages")
     print(f"✓ Price range: ₹{analysis['price_range']['min']:,} - ₹{analysis['price_range']['max']:,}")
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from urllib.parse import quote_plus
 from dotenv import load_dotenv
 
 # Load environment variables from .env file if it exists
@@ -8,15 +9,12 @@ load_dotenv()
 # Project base directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Data directories
+# Data directories (created by whichever writer first needs them)
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 RAW_DIR = os.path.join(DATA_DIR, 'raw')
 PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
 CACHE_DIR = os.path.join(DATA_DIR, 'cache')
-
-# Ensure directories exist
-for directory in [RAW_DIR, PROCESSED_DIR, CACHE_DIR]:
-    os.makedirs(directory, exist_ok=True)
+ARCHIVE_DIR = os.path.join(DATA_DIR, 'archive')  # Past crawls
 
 # Instagram handles file
 INSTAGRAM_HANDLES_FILE = os.path.join(RAW_DIR, 'instagram_handles.txt')
@@ -29,6 +27,7 @@ INSTAGRAM_PASSWORD = os.getenv('INSTAGRAM_PASSWORD', '')  # Set in .env file
 SCRAPER_DELAY_MIN = 2  # Minimum delay between requests in seconds
 SCRAPER_DELAY_MAX = 7  # Maximum delay between requests in seconds
 USE_SELENIUM_FOR_WEBSITES = True  # Changed to True for better scraping
+FETCH_MODE_TTL_DAYS = 30  # Re-probe whether a domain needs a browser after this many days
 HEADLESS_BROWSER = False  # Changed to False for Instagram (helps avoid detection)
 
 # Enhanced user agents list
@@ -72,19 +71,55 @@ PACKAGE_KEYWORDS = [
     'luxury travel', 'camping', 'glamping', 'workation'
 ]
 
-# Database settings (if needed later)
+# Database settings
 DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = int(os.getenv('DB_PORT', '5432'))
 DB_NAME = os.getenv('DB_NAME', 'trippypick')
 DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', '')
+DATABASE_URL = os.getenv('DATABASE_URL') or (
+    f"postgresql+psycopg2://{DB_USER}:{quote_plus(DB_PASSWORD)}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)  # Set DATABASE_URL to e.g. sqlite:///data/trippypick.db to use SQLite instead
+DB_POOL_SIZE = 5  # Connections kept open in the engine's pool
+DB_MAX_OVERFLOW = 10  # Extra connections allowed when the pool is busy
+DB_LOAD_BATCH_SIZE = 1000  # Packages upserted per INSERT ... ON CONFLICT statement
 
 # Additional settings for better scraping
 MAX_RETRIES = 3
 TIMEOUT = 30
-MAX_PACKAGES_PER_WEBSITE = 20
+# Per-host politeness: by default one request at a time, one every ~3.3 seconds
+# (the old 2-5 second pause between package pages); raise these three to fetch
+# pages of a host concurrently
+MAX_CONNECTIONS_PER_HOST = 1  # Concurrent page fetches (and keep-alive connections) per host
+RATE_LIMIT_PER_HOST = 0.3  # Requests per second sent to any one host
+RATE_LIMIT_BURST = 1  # Requests a host may get back to back after idling
+RATE_LIMIT_MIN_RATE = 0.05  # Slowest rate a host that answers 429/503 backs off to
+RATE_LIMIT_MAX_WAIT = 300  # Longest Retry-After honoured, in seconds
+MAX_PACKAGES_PER_WEBSITE = 20  # Best ranked package pages scraped per website
+SITEMAP_MAX_FILES = 10  # Sitemaps (including nested ones) read per website
+SITEMAP_MAX_URLS = 50000  # URLs scanned across a website's sitemaps
+
+# HTTP response cache (stored under CACHE_DIR)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_TTL = 6 * 3600  # Seconds a cached page is reused without revalidating
+HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Least recently used pages are evicted above this
+
+# NLP result cache (stored under CACHE_DIR)
+NLP_CACHE_ENABLED = True
+NLP_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Least recently used results are evicted above this
+NLP_CACHE_MEMORY_ENTRIES = 4096  # Results also kept in memory for repeats within a run
+
+# Browser pool settings
+BROWSER_POOL_SIZE = 3  # Chrome instances kept warm for rendering pages in parallel
+BROWSER_MAX_PAGES_PER_DRIVER = 50  # Restart a browser after this many page loads
+BROWSER_MAX_MEMORY_MB = 512  # Restart a browser once its JS heap grows past this
 INSTAGRAM_MAX_PROFILES_PER_SESSION = 50
 
+# Near-duplicate package detection (MinHash/LSH)
+DEDUP_NUM_PERM = 128  # Hash functions per MinHash signature
+DEDUP_LSH_BANDS = 16  # Signature bands; 16 bands of 8 rows catch pairs from ~70% similarity
+DEDUP_THRESHOLD = 0.7  # Minimum estimated Jaccard similarity of near-duplicates
+
 # Logging settings
 LOG_LEVEL = 'INFO'
 LOG_FILE = os.path.join(BASE_DIR, 'scraping.log')
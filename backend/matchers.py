@@ -0,0 +1,127 @@
+"""
+Shared text matchers: precompiled extraction patterns and keyword automata
+"""
+
+import re
+
+from backend.config import PACKAGE_KEYWORDS
+
+# Words in a URL that mark it as a package page
+PACKAGE_URL_INDICATORS = ['package', 'tour', 'trip', 'itinerary', 'holiday', 'vacation', 'travel']
+
+# Path segments (matched at their start) that mark a URL as anything but a package page
+NON_PACKAGE_URL_INDICATORS = [
+    '/corporate', '/blog', '/career', '/about', '/contact', '/login', '/signup', '/register',
+    '/privacy', '/terms', '/policy', '/faq', '/review', '/news', '/press', '/gallery',
+    '/cart', '/checkout', '/account', '/wp-', '/tag/', '/author/', '/category/'
+]
+
+# Price and duration text
+PRICE_TEXT_PATTERN = re.compile(r'[₹$€£]\s*\d+|Rs\.?\s*\d+|\d+\s*(?:INR|USD|EUR)', re.IGNORECASE)
+DURATION_TEXT_PATTERN = re.compile(r'\d+\s*(?:days?|nights?|D\s*\d*N)', re.IGNORECASE)
+PRICE_PATTERNS = [
+    re.compile(r'(?:Price|Cost|Fee|Rate|Starting from|From)[:\s]*(?:Rs\.?|INR|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)', re.IGNORECASE),
+    re.compile(r'(?:Rs\.?|INR|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)', re.IGNORECASE),
+    re.compile(r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:Rs\.?|INR|₹)', re.IGNORECASE),
+    re.compile(r'(?:USD?|US\$|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)', re.IGNORECASE)
+]
+DURATION_PATTERNS = [
+    re.compile(r'(\d+)\s*(?:days?|Days?)\s*(?:and|&)?\s*(\d+)?\s*(?:nights?|Nights?)', re.IGNORECASE),
+    re.compile(r'(\d+)\s*(?:nights?|Nights?)\s*(?:and|&)?\s*(\d+)?\s*(?:days?|Days?)', re.IGNORECASE),
+    re.compile(r'(\d+)D\s*(\d+)N', re.IGNORECASE),
+    re.compile(r'(\d+)\s*(?:Day|Night)(?:s)?\s+(?:Tour|Trip|Package)', re.IGNORECASE),
+    re.compile(r'Duration[:\s]*(\d+)\s*(?:days?|nights?)', re.IGNORECASE)
+]
+
+# Destinations in package titles
+DESTINATION_TITLE_PATTERNS = [
+    re.compile(r'(?:in|to|at)\s+([A-Za-z\s&\-\']+?)(?:\s*[-–—]|\s+Tour|\s+Trip|\s+Package|$)', re.IGNORECASE),
+    re.compile(r'^([A-Za-z\s&\-\']+?)\s+(?:Tour|Trip|Package|Vacation|Holiday)', re.IGNORECASE),
+    re.compile(r'(?:Tour|Trip|Package|Holiday)\s+(?:to|in)\s+([A-Za-z\s&\-\']+)', re.IGNORECASE)
+]
+DESTINATION_SUFFIX_PATTERN = re.compile(r'\s*(?:Tour|Trip|Package|Holiday)s?\s*$', re.IGNORECASE)
+
+# Itinerary day headings
+DAY_PATTERNS = [
+    re.compile(r'Day\s*(\d+)', re.IGNORECASE),
+    re.compile(r'(\d+)(?:st|nd|rd|th)\s+Day', re.IGNORECASE),
+    re.compile(r'Day\s*[-–—]\s*(\d+)', re.IGNORECASE)
+]
+DAY_PATTERN = re.compile('|'.join(f'(?:{pattern.pattern})' for pattern in DAY_PATTERNS), re.IGNORECASE)
+
+
+def _trie_pattern(keywords):
+    """Compile keywords into a regex shaped like their prefix trie"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword may end here, so the rest of the branch is optional
+        return f"(?:{body})?" if '' in node else body
+    
+    return emit(trie)
+
+
+class KeywordAutomaton:
+    """
+    A keyword set compiled into one matcher, Aho-Corasick style
+    
+    The keywords are folded into a prefix trie and emitted as a single
+    regex, so a string is scanned once in the regex engine instead of once
+    per keyword. find_all reports overlapping hits like an Aho-Corasick
+    automaton: a lookahead yields the longest keyword starting at each
+    position, and the shorter keywords that are prefixes of it come from a
+    precomputed table. Matching is case-sensitive; callers lowercase text
+    and keywords as they already do.
+    """
+    
+    def __init__(self, keywords):
+        """
+        Build the automaton
+        
+        Args:
+            keywords (iterable): Keywords (substrings) to look for
+        """
+        self.keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+        pattern = _trie_pattern(self.keywords) if self.keywords else '(?!)'
+        
+        self._search = re.compile(pattern).search
+        self._finditer = re.compile(f"(?=({pattern}))").finditer
+        self._prefixes = {
+            keyword: tuple(other for other in self.keywords if keyword.startswith(other))
+            for keyword in self.keywords
+        }
+    
+    def search_any(self, text):
+        """Whether text contains any keyword (stops at the first hit)"""
+        return bool(text) and self._search(text) is not None
+    
+    def find_all(self, text):
+        """
+        Find every keyword contained in text
+        
+        Args:
+            text (str): Text to scan
+        
+        Returns:
+            set: Keywords that occur in text
+        """
+        found = set()
+        if text:
+            for match in self._finditer(text):
+                found.update(self._prefixes[match.group(1)])
+        return found
+
+
+# Automata for package link classification
+PACKAGE_KEYWORD_MATCHER = KeywordAutomaton(PACKAGE_KEYWORDS)
+PACKAGE_URL_MATCHER = KeywordAutomaton(PACKAGE_URL_INDICATORS)
+NON_PACKAGE_URL_MATCHER = KeywordAutomaton(NON_PACKAGE_URL_INDICATORS)
@@ -1,15 +1,51 @@
+import threading
+
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from backend.config import Config
+from sqlalchemy.orm import declarative_base, sessionmaker
+from backend.config import DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+
+def make_engine(url=DATABASE_URL):
+    """Create an engine with a connection pool (SQLite keeps its own pooling)"""
+    if url.startswith('sqlite'):
+        return create_engine(url)
+    return create_engine(url, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_pre_ping=True)
 
-engine = create_engine(Config.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Sessions are bound to the engine when it is first created, so importing the
+# models never loads a database driver or opens a pool
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """Return the process-wide engine, creating it (and binding SessionLocal) on first use"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = make_engine()
+            SessionLocal.configure(bind=_engine)
+        return _engine
+
+
+def __getattr__(name):
+    # `from backend.models import engine` still works, but creates the engine lazily
+    if name == 'engine':
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def init_db(bind=None):
+    """Create the tables of all models that do not exist yet"""
+    from backend.models import organiser, package  # noqa: F401 (registers the models)
+    Base.metadata.create_all(bind=bind or get_engine())
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Integer, String, func
+from sqlalchemy.orm import relationship
+
+from backend.models import Base
+
+
+class Organiser(Base):
+    """A travel company whose website is scraped"""
+    
+    __tablename__ = 'organisers'
+    
+    id = Column(Integer, primary_key=True)
+    key = Column(String(255), nullable=False, unique=True)  # Site key (company name or domain)
+    name = Column(String(255))
+    domain = Column(String(255), index=True)
+    url = Column(String(2048))
+    category = Column(String(100))
+    popularity = Column(String(100))
+    site_type = Column(String(100))
+    last_scraped_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    packages = relationship('Package', back_populates='organiser')
+    
+    def __repr__(self):
+        return f"<Organiser {self.key}>"
@@ -0,0 +1,45 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, JSON, SmallInteger, String, Text, func
+from sqlalchemy.orm import relationship
+
+from backend.models import Base
+
+
+class Package(Base):
+    """A scraped travel package with its normalized price and duration"""
+    
+    __tablename__ = 'packages'
+    
+    id = Column(Integer, primary_key=True)
+    package_id = Column(String(16), nullable=False, unique=True)  # Stable id from the URL (see processors.dedup)
+    canonical_id = Column(String(16), index=True)  # package_id of the package this duplicates
+    organiser_id = Column(Integer, ForeignKey('organisers.id'), index=True)
+    
+    url = Column(String(2048))
+    title = Column(Text)
+    description = Column(Text)
+    destination = Column(Text, index=True)  # Canonical destination
+    
+    # Normalized fields (see processors.normalize); prices are whole paise
+    price_paise = Column(BigInteger, index=True)
+    currency = Column(String(3))
+    days = Column(SmallInteger)
+    nights = Column(SmallInteger)
+    
+    # As scraped
+    price_text = Column(Text)
+    duration_text = Column(Text)
+    destination_text = Column(Text)
+    inclusions = Column(JSON)
+    exclusions = Column(JSON)
+    highlights = Column(JSON)
+    itinerary = Column(JSON)
+    images = Column(JSON)
+    
+    scraped_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    organiser = relationship('Organiser', back_populates='packages')
+    
+    def __repr__(self):
+        return f"<Package {self.package_id} {self.title!r}>"
@@ -0,0 +1,165 @@
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Package table columns the analysis reads
+ANALYSIS_COLUMNS = ['site', 'category', 'destination', 'price_paise', 'currency', 'days']
+
+# Price histogram bin edges in rupees (the last bin is open ended)
+PRICE_BINS = [0, 5000, 10000, 20000, 35000, 50000, 75000, 100000, 150000, 250000]
+
+PRICE_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _rupees(amount: float) -> str:
+    """Short rupee label such as ₹5k or ₹1.5L"""
+    if amount >= 100000:
+        return f"₹{amount / 100000:g}L"
+    if amount >= 1000:
+        return f"₹{amount / 1000:g}k"
+    return f"₹{amount:g}"
+
+
+def _categories(column: pd.Series) -> pd.Series:
+    """A category column as a categorical with missing values as 'Unknown'"""
+    categories = column.astype('category')
+    if 'Unknown' not in categories.cat.categories:
+        categories = categories.cat.add_categories('Unknown')
+    return categories.fillna('Unknown')
+
+
+def rupee_prices(packages: pd.DataFrame) -> np.ndarray:
+    """Positive INR prices of the packages in whole rupees"""
+    prices = packages.loc[packages['currency'] == 'INR', 'price_paise'].dropna()
+    prices = prices.to_numpy(dtype=np.int64) // 100
+    return prices[prices > 0]
+
+
+def category_counts(packages: pd.DataFrame, sites: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Websites and packages per category
+    
+    Args:
+        packages: Package table
+        sites: One row per website (site, category), so websites without
+            packages are counted too; taken from the packages if not given
+    
+    Returns:
+        dict: {category: {'count': websites, 'packages': packages}}
+    """
+    if sites is None:
+        sites = packages[['site', 'category']].drop_duplicates('site')
+    
+    site_counts = _categories(sites['category']).value_counts(sort=False)
+    package_counts = _categories(packages['category']).value_counts(sort=False)
+    counts = pd.DataFrame({'count': site_counts, 'packages': package_counts}).fillna(0).astype(int)
+    counts = counts[(counts['count'] > 0) | (counts['packages'] > 0)]
+    return {str(category): row for category, row in counts.to_dict('index').items()}
+
+
+def top_destinations(packages: pd.DataFrame, top_n: int = 10) -> List[Tuple[str, int]]:
+    """The top_n destinations by number of packages"""
+    counts = packages['destination'].value_counts().head(top_n)
+    return [(destination, int(count)) for destination, count in counts.items()]
+
+
+def price_summary(prices: np.ndarray, percentiles: Sequence[int] = PRICE_PERCENTILES) -> Dict:
+    """
+    Min, max, mean and percentiles of rupee prices
+    
+    Returns:
+        dict: min, max, avg and p<N> for each percentile (all 0 without prices)
+    """
+    if not len(prices):
+        return {'min': 0, 'max': 0, 'avg': 0, **{f"p{p}": 0 for p in percentiles}}
+    
+    values = np.percentile(prices, percentiles)
+    return {
+        'min': int(prices.min()),
+        'max': int(prices.max()),
+        'avg': int(prices.sum() // len(prices)),
+        **{f"p{p}": int(value) for p, value in zip(percentiles, values)}
+    }
+
+
+def price_histogram(prices: np.ndarray, bins: Sequence[int] = PRICE_BINS) -> List[Tuple[str, int]]:
+    """
+    Number of packages per price band
+    
+    Args:
+        prices: Rupee prices
+        bins: Band edges; prices above the last edge share an open-ended band
+    
+    Returns:
+        list: (band label, packages) for each band
+    """
+    edges = np.asarray(bins)
+    counts = np.bincount(np.searchsorted(edges, prices, side='right') - 1, minlength=len(edges))
+    labels = [f"{_rupees(low)}–{_rupees(high)}" for low, high in zip(edges[:-1], edges[1:])]
+    labels.append(f"{_rupees(edges[-1])}+")
+    return list(zip(labels, (int(count) for count in counts)))
+
+
+def duration_distribution(packages: pd.DataFrame) -> Dict:
+    """
+    Distribution of trip lengths in days
+    
+    Returns:
+        dict: 'days' as [(days, packages)] in ascending order, plus the mean
+            and median length (0 without durations)
+    """
+    days = packages['days'].dropna()
+    if days.empty:
+        return {'days': [], 'mean': 0, 'median': 0}
+    
+    counts = days.value_counts().sort_index()
+    return {
+        'days': [(int(length), int(count)) for length, count in counts.items()],
+        'mean': round(float(days.mean()), 1),
+        'median': float(days.median())
+    }
+
+
+def median_price_by_category(packages: pd.DataFrame) -> Dict[str, int]:
+    """Median positive INR price of each category's packages"""
+    priced = packages[(packages['currency'] == 'INR') & (packages['price_paise'] > 0)]
+    medians = (priced['price_paise'] // 100).groupby(_categories(priced['category']), observed=True).median()
+    return {str(category): int(value) for category, value in medians.items()}
+
+
+def analyze(packages: pd.DataFrame, sites: Optional[pd.DataFrame] = None, top_n: int = 10) -> Dict:
+    """
+    Summarize a package table
+    
+    Every statistic is a grouped or whole-column operation on the table,
+    so the cost grows with the number of columns read rather than with
+    Python work per package, and archives of millions of rows are fine.
+    
+    Args:
+        packages: Package table (see backend.storage.columnar); only
+            ANALYSIS_COLUMNS are used
+        sites: One row per website (site, category); see category_counts
+        top_n: Number of destinations to list
+    
+    Returns:
+        dict: total_websites, total_packages, by_category,
+            popular_destinations, price_range (with percentiles),
+            price_histogram, price_by_category and durations
+    """
+    prices = rupee_prices(packages)
+    by_category = category_counts(packages, sites)
+    
+    return {
+        'total_websites': sum(counts['count'] for counts in by_category.values()),
+        'total_packages': len(packages),
+        'by_category': by_category,
+        'popular_destinations': top_destinations(packages, top_n),
+        'price_range': price_summary(prices),
+        'price_histogram': price_histogram(prices),
+        'price_by_category': median_price_by_category(packages),
+        'durations': duration_distribution(packages)
+    }
@@ -0,0 +1,203 @@
+import re
+import zlib
+import hashlib
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import DEDUP_NUM_PERM, DEDUP_LSH_BANDS, DEDUP_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+# Hash family modulus (Mersenne prime 2^31 - 1, so products fit in uint64)
+_PRIME = (1 << 31) - 1
+
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def package_id(package: Dict) -> str:
+    """Stable id of a scraped package (from its URL, or its text without one)"""
+    key = package.get('url') or f"{package.get('title')}|{package.get('description')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def dedup_text(package: Dict) -> str:
+    """Title, description and itinerary of a package, the text compared for duplicates"""
+    parts = [package.get('title') or '', package.get('description') or '']
+    for day in package.get('itinerary') or []:
+        if isinstance(day, dict):
+            parts.extend([day.get('day') or '', day.get('description') or ''])
+        else:
+            parts.append(str(day))
+    return ' '.join(parts)
+
+
+class DuplicateDetector:
+    """
+    Near-duplicate detection with MinHash signatures and LSH banding
+    
+    Texts are normalized and cut into word shingles. Each shingle set gets
+    a MinHash signature (num_perm hash minima, computed in one NumPy
+    operation per text), whose agreement rate estimates the Jaccard
+    similarity of two texts. Signatures are split into bands; texts that
+    share a band bucket become candidates, so only likely duplicates are
+    compared instead of all n^2 pairs. Candidates whose estimated
+    similarity reaches the threshold are clustered with union-find.
+    """
+    
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, bands: int = DEDUP_LSH_BANDS,
+                 threshold: float = DEDUP_THRESHOLD, shingle_size: int = 3, seed: int = 1):
+        """
+        Set up the hash family
+        
+        Args:
+            num_perm: Hash functions per signature
+            bands: LSH bands (num_perm must be a multiple); more bands catch
+                less similar pairs as candidates
+            threshold: Minimum estimated Jaccard similarity of duplicates
+            shingle_size: Words per shingle
+            seed: Seed of the hash family, fixed so signatures are stable across runs
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+    
+    def shingles(self, text: str) -> set:
+        """Word shingles of the normalized text"""
+        words = _NON_WORD.sub(' ', text.lower()).split()
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None if it has no words"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles)) % _PRIME
+        return ((hashes[:, None] * self._a + self._b) % _PRIME).min(axis=0).astype(np.uint32)
+    
+    def cluster(self, items: Iterable[Tuple[str, str]]) -> List[List[str]]:
+        """
+        Group near-duplicate texts
+        
+        Args:
+            items: (id, text) pairs
+        
+        Returns:
+            list: Clusters of ids, each with at least two members
+        """
+        ids = []
+        signatures = []
+        for item_id, text in items:
+            signature = self.signature(text)
+            if signature is not None:
+                ids.append(item_id)
+                signatures.append(signature)
+        
+        if not signatures:
+            return []
+        signatures = np.vstack(signatures)
+        
+        parent = list(range(len(ids)))
+        
+        def find(row):
+            while parent[row] != row:
+                parent[row] = parent[parent[row]]
+                row = parent[row]
+            return row
+        
+        # Bucket every signature band; only items sharing a bucket are compared.
+        # Each item is compared with one representative per group already
+        # found in its bucket (not with every member), so a bucket of k
+        # boilerplate copies costs O(k) comparisons rather than O(k^2)
+        for band in range(self.bands):
+            buckets = {}
+            band_values = signatures[:, band * self.rows:(band + 1) * self.rows]
+            for row, key in enumerate(map(bytes, band_values)):
+                buckets.setdefault(key, []).append(row)
+            
+            for rows in buckets.values():
+                representatives = rows[:1]
+                for row in rows[1:]:
+                    similarity = (signatures[representatives] == signatures[row]).mean(axis=1)
+                    matches = [rep for rep, value in zip(representatives, similarity) if value >= self.threshold]
+                    for rep in matches:
+                        parent[find(rep)] = find(row)
+                    if not matches:
+                        representatives.append(row)
+        
+        clusters = {}
+        for row, item_id in enumerate(ids):
+            clusters.setdefault(find(row), []).append(item_id)
+        return [members for members in clusters.values() if len(members) > 1]
+
+
+def _completeness(package: Dict) -> Tuple:
+    """Sort key preferring the package with the most extracted details"""
+    filled = sum(1 for value in package.values() if value)
+    return (filled, len(package.get('description') or ''), len(package.get('itinerary') or []))
+
+
+def annotate_duplicates(results: Dict, detector: Optional[DuplicateDetector] = None) -> int:
+    """
+    Mark near-duplicate packages across all sites
+    
+    Every package gets a "package_id" and a "canonical_id". Packages in a
+    cluster of near-duplicates share the canonical_id of the member with
+    the most complete details; other packages are their own canonical.
+    
+    Args:
+        results (dict): Website data keyed by site (website_packages.json layout)
+        detector (DuplicateDetector): Detector to use (default settings if not given)
+    
+    Returns:
+        int: Number of packages marked as duplicates of another package
+    """
+    detector = detector or DuplicateDetector()
+    
+    packages = {}
+    for website in results.values():
+        for package in website.get('packages') or []:
+            package['package_id'] = package_id(package)
+            package['canonical_id'] = package['package_id']
+            packages.setdefault(package['package_id'], []).append(package)
+    
+    duplicates = 0
+    clusters = detector.cluster((pid, dedup_text(copies[0])) for pid, copies in packages.items())
+    for members in clusters:
+        canonical = max(members, key=lambda pid: (_completeness(packages[pid][0]), pid))
+        for pid in members:
+            for package in packages[pid]:
+                package['canonical_id'] = canonical
+            if pid != canonical:
+                duplicates += len(packages[pid])
+    
+    # The same URL listed on several pages is a duplicate too
+    duplicates += sum(len(copies) - 1 for copies in packages.values())
+    
+    logger.info(f"Marked {duplicates} duplicate packages in {len(clusters)} clusters")
+    return duplicates
+
+
+def unique_packages(results: Dict) -> Iterator[Tuple[str, Dict]]:
+    """Yield (site, package) for canonical packages only (after annotate_duplicates)"""
+    seen = set()
+    for site, website in results.items():
+        for package in website.get('packages') or []:
+            pid = package.get('package_id')
+            if pid is None or (package.get('canonical_id') == pid and pid not in seen):
+                seen.add(pid)
+                yield site, package
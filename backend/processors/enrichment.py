@@ -0,0 +1,171 @@
+import os
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# Package fields analyzed by the NLP processor
+PACKAGE_NLP_FIELDS = ('title', 'destination', 'duration', 'description', 'highlights', 'inclusions')
+
+# Native thread pools that would oversubscribe the cores when every worker
+# process runs its own
+_THREAD_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+# NLPProcessor of the current worker process, loaded once by _init_worker
+_worker_processor = None
+
+
+def package_nlp_text(package: Dict) -> str:
+    """Text of a package that the NLP processor analyzes"""
+    parts = []
+    for field in PACKAGE_NLP_FIELDS:
+        value = package.get(field)
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value if item)
+        elif value:
+            parts.append(str(value))
+    return '\n'.join(parts)
+
+
+def itinerary_text(package: Dict) -> str:
+    """A package's itinerary as "Day N: ..." text for NLPProcessor.extract_itineraries"""
+    lines = []
+    for day in package.get('itinerary') or []:
+        if isinstance(day, dict):
+            lines.append(f"{day.get('day') or ''}: {day.get('description') or ''}")
+        else:
+            lines.append(str(day))
+    return '\n'.join(lines)
+
+
+@contextmanager
+def _worker_thread_limits():
+    """
+    Limit native thread pools to one thread in worker processes started in the block
+    
+    Spawned workers copy the environment when they start and import numpy
+    (through the parent's main module) before any initializer runs, so the
+    limits are set here for the lifetime of the pool and removed afterwards,
+    leaving the rest of the app's environment as it was.
+    """
+    added = [name for name in _THREAD_ENV_VARS if name not in os.environ]
+    for name in added:
+        os.environ[name] = '1'
+    try:
+        yield
+    finally:
+        for name in added:
+            os.environ.pop(name, None)
+
+
+def _init_worker(model_name: str, profile: str):
+    """Load the spaCy model once per worker process"""
+    global _worker_processor
+    from backend.processors.nlp import NLPProcessor
+    _worker_processor = NLPProcessor(model_name, profile=profile)
+
+
+def _enrich_chunk(texts: List[Tuple[str, str]]) -> List[Dict]:
+    """Analyze a chunk of (package text, itinerary text) pairs in a worker"""
+    return _analyze(_worker_processor, texts)
+
+
+def _analyze(processor, texts: List[Tuple[str, str]]) -> List[Dict]:
+    """NLP results of (package text, itinerary text) pairs, batched through spaCy"""
+    results = processor.process_packages([text for text, _ in texts])
+    
+    # Only packages with an itinerary are parsed for one
+    with_itinerary = [i for i, (_, itinerary) in enumerate(texts) if itinerary]
+    itineraries = processor.extract_itineraries([texts[i][1] for i in with_itinerary])
+    for i, itinerary in zip(with_itinerary, itineraries):
+        # Packages with the same text get the same memoized result object,
+        # so each one with an itinerary gets its own copy
+        results[i] = {**results[i], 'itinerary': itinerary}
+    
+    return results
+
+
+class EnrichmentRunner:
+    """
+    Adds NLP results to a stream of packages using a pool of processes
+    
+    Packages are sent to the workers in chunks, and each worker loads the
+    spaCy model once when it starts. Results are yielded in input order.
+    At most max_pending chunks are in flight, so memory stays bounded
+    however long the stream is. With one worker everything runs in this
+    process.
+    """
+    
+    def __init__(self, workers: int = 1, model_name: str = 'en_core_web_sm', profile: str = 'full',
+                 chunk_size: int = 32, max_pending: int = None):
+        """
+        Configure the runner
+        
+        Args:
+            workers: Worker processes (1 runs in this process)
+            model_name: spaCy model each worker loads
+            profile: NLPProcessor profile
+            chunk_size: Packages sent to a worker at a time
+            max_pending: Chunks in flight at once (default: 2 per worker)
+        """
+        self.workers = max(1, workers)
+        self.model_name = model_name
+        self.profile = profile
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or 2 * self.workers
+    
+    def _chunks(self, items: Iterable[Tuple[Any, Dict]]) -> Iterator[List[Tuple[Any, Dict]]]:
+        chunk = []
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    @staticmethod
+    def _texts(chunk: List[Tuple[Any, Dict]]) -> List[Tuple[str, str]]:
+        return [(package_nlp_text(package), itinerary_text(package)) for _, package in chunk]
+    
+    @staticmethod
+    def _merge(chunk: List[Tuple[Any, Dict]], results: List[Dict]) -> Iterator[Tuple[Any, Dict]]:
+        for (tag, package), result in zip(chunk, results):
+            package['nlp'] = result
+            yield tag, package
+    
+    def enrich(self, items: Iterable[Tuple[Any, Dict]]) -> Iterator[Tuple[Any, Dict]]:
+        """
+        Add an "nlp" field to each package
+        
+        Args:
+            items: (tag, package) pairs; the tag (e.g. the site) is passed
+                through untouched
+        
+        Yields:
+            tuple: (tag, package) in input order, the package updated in place
+        """
+        if self.workers == 1:
+            from backend.processors.nlp import NLPProcessor
+            processor = NLPProcessor(self.model_name, profile=self.profile)
+            for chunk in self._chunks(items):
+                yield from self._merge(chunk, _analyze(processor, self._texts(chunk)))
+            return
+        
+        with _worker_thread_limits(), ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(self.model_name, self.profile)
+        ) as executor:
+            pending = deque()
+            for chunk in self._chunks(items):
+                pending.append((chunk, executor.submit(_enrich_chunk, self._texts(chunk))))
+                if len(pending) >= self.max_pending:
+                    done_chunk, future = pending.popleft()
+                    yield from self._merge(done_chunk, future.result())
+            
+            while pending:
+                done_chunk, future = pending.popleft()
+                yield from self._merge(done_chunk, future.result())
@@ -1,22 +1,161 @@
 import spacy
 import re
-from typing import List, Dict, Optional, Tuple
+import json
+import hashlib
+from typing import Any, Callable, Iterable, List, Dict, Optional, Tuple
 from collections import Counter
+from functools import cached_property
 import logging
+import numpy as np
+
+from backend.processors.keyword_scorer import KeywordScorer
+from backend.processors.nlp_cache import get_nlp_cache, normalize_text
+
+# Patterns for day-wise activities
+ITINERARY_DAY_PATTERNS = [
+    re.compile(r'Day\s*(\d+)[:\-\s]*(.+?)(?=Day\s*\d+|$)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'(\d+)(?:st|nd|rd|th)\s*Day[:\-\s]*(.+?)(?=\d+(?:st|nd|rd|th)\s*Day|$)', re.IGNORECASE | re.DOTALL),
+    re.compile(r'D(\d+)[:\-\s]*(.+?)(?=D\d+|$)', re.IGNORECASE | re.DOTALL)
+]
+
+# spaCy components by what they provide (names used by the en_core_web_* pipelines)
+TAGGING_COMPONENTS = ('transformer', 'tok2vec', 'tagger', 'morphologizer', 'attribute_ruler', 'lemmatizer')
+ENTITY_COMPONENTS = ('ner', 'entity_ruler')
+SENTENCE_COMPONENTS = ('parser', 'senter', 'sentencizer')
+KNOWN_COMPONENTS = TAGGING_COMPONENTS + ENTITY_COMPONENTS + SENTENCE_COMPONENTS
+
+# Fields returned by process_package_text, in output order
+PACKAGE_FIELDS = ('entities', 'keywords', 'trip_type', 'locations', 'activities', 'amenities', 'tags')
+
+# Task profiles: the spaCy components to load (None loads the whole pipeline)
+# and the fields process_package_text returns. Without the NER, tags only
+# carry locations found by the text patterns.
+PROFILES = {
+    'tags-only': {
+        'components': TAGGING_COMPONENTS + ('senter', 'sentencizer'),
+        'fields': ('keywords', 'trip_type', 'activities', 'amenities', 'tags')
+    },
+    'entities': {
+        'components': TAGGING_COMPONENTS + ENTITY_COMPONENTS + ('senter', 'sentencizer'),
+        'fields': PACKAGE_FIELDS
+    },
+    'full': {
+        'components': None,
+        'fields': PACKAGE_FIELDS
+    }
+}
+
+# Entity labels and the entities key they are collected under
+ENTITY_LABEL_KEYS = {
+    'GPE': 'locations',
+    'LOC': 'locations',
+    'ORG': 'organizations',
+    'DATE': 'dates',
+    'MONEY': 'money',
+    'PERSON': 'persons'
+}
+LOCATION_LABELS = ('GPE', 'LOC')
+
+# Parts of speech kept as keywords
+KEYWORD_POS = ('NOUN', 'PROPN', 'VERB')
+
+# Common location patterns
+LOCATION_PATTERNS = [
+    re.compile(r'(?:visit|explore|trip to|tour of)\s+([A-Z][a-zA-Z ]+)'),  # Names stop at a line break
+    re.compile(r'([A-Z][a-zA-Z]+)\s+(?:trip|tour|package|getaway)'),
+]
+
+# Activity keywords and the activity each one stands for
+ACTIVITY_VERBS = [
+    (verb, verb + 'ing' if not verb.endswith('e') else verb[:-1] + 'ing')
+    for verb in [
+        'trek', 'hike', 'climb', 'swim', 'dive', 'surf', 'ski',
+        'raft', 'kayak', 'camp', 'explore', 'visit', 'tour',
+        'ride', 'sail', 'fish', 'snorkel', 'paraglide'
+    ]
+]
+
+# Activity patterns
+ACTIVITY_PATTERNS = [
+    re.compile(r'(?:go|will|can)\s+(\w+ing)'),  # go trekking, will camping
+    re.compile(r'(\w+ing)\s+(?:in|at|on)'),      # trekking in mountains
+]
+
+AMENITY_KEYWORDS = [
+    'accommodation', 'hotel', 'resort', 'homestay', 'camping',
+    'meals', 'breakfast', 'lunch', 'dinner', 'food',
+    'transport', 'transfer', 'pickup', 'drop',
+    'guide', 'instructor', 'equipment', 'gear',
+    'wifi', 'internet', 'parking', 'pool', 'spa'
+]
+
+# Special tags and the phrases that earn them
+SPECIAL_TAGS = [
+    ('women-only', ['women only', 'ladies only', 'girls only']),
+    ('budget-friendly', ['budget', 'backpack', 'cheap']),
+    ('luxury', ['luxury', 'premium', '5 star']),
+    ('weekend-getaway', ['weekend', '2 days', '3 days']),
+    ('family-friendly', ['family', 'kids', 'children'])
+]
+
+
+class DocAnalysis:
+    """Per-document context so every intermediate result is computed once"""
+    
+    def __init__(self, text: str, doc):
+        self.text = text
+        self.doc = doc
+        self._results = {}
+    
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+    
+    @cached_property
+    def ents(self) -> List[Tuple[str, str]]:
+        """(label, text) of the doc's entities, read from the doc once"""
+        return [(ent.label_, ent.text) for ent in self.doc.ents]
+    
+    def get(self, name: str, compute: Callable[['DocAnalysis'], Any]) -> Any:
+        """Return a named result, computing it from this context the first time"""
+        if name not in self._results:
+            self._results[name] = compute(self)
+        return self._results[name]
 
 class NLPProcessor:
-    def __init__(self, model_name: str = 'en_core_web_sm'):
-        """Initialize NLP processor with spaCy model"""
+    def __init__(self, model_name: str = 'en_core_web_sm', profile: str = 'full', use_cache: bool = True):
+        """Initialize NLP processor with the spaCy components the profile needs"""
         self.logger = logging.getLogger(__name__)
         
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown NLP profile {profile!r}, expected one of {', '.join(PROFILES)}")
+        self.profile = profile
+        self.fields = PROFILES[profile]['fields']
+        
+        # Leave out the components the profile never runs
+        components = PROFILES[profile]['components']
+        exclude = [] if components is None else [name for name in KNOWN_COMPONENTS if name not in components]
+        
         try:
-            self.nlp = spacy.load(model_name)
+            self.nlp = spacy.load(model_name, exclude=exclude)
         except OSError:
             self.logger.warning(f"Model {model_name} not found. Downloading...")
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", model_name])
-            self.nlp = spacy.load(model_name)
-            
+            self.nlp = spacy.load(model_name, exclude=exclude)
+        
+        # Sentences come from the parser when it is loaded, otherwise from the
+        # much cheaper senter (shipped disabled) or a rule-based sentencizer,
+        # added when the model has none of them
+        self.sentence_component = next(
+            (name for name in SENTENCE_COMPONENTS if name in self.nlp.component_names), None
+        )
+        if self.sentence_component is None:
+            self.nlp.add_pipe('sentencizer')
+            self.sentence_component = 'sentencizer'
+        elif self.sentence_component in self.nlp.disabled:
+            self.nlp.enable_pipe(self.sentence_component)
+        
         # Trip-related keywords for classification
         self.trip_keywords = {
             'adventure': ['trek', 'hike', 'climb', 'adventure', 'camping', 'rafting', 'expedition'],
@@ -27,22 +166,86 @@ class NLPProcessor:
             'spiritual': ['spiritual', 'pilgrimage', 'ashram', 'monastery'],
             'workation': ['workation', 'remote work', 'digital nomad', 'coworking']
         }
+        self.keyword_scorer = self.build_keyword_scorer()
         
+        # Results of unchanged texts are reused across runs
+        self.cache = get_nlp_cache() if use_cache else None
+    
+    def build_keyword_scorer(self) -> KeywordScorer:
+        """Compile every keyword list into one scorer (rebuild after changing trip_keywords)"""
+        groups = {f'trip:{trip_type}': keywords for trip_type, keywords in self.trip_keywords.items()}
+        groups['activity'] = [verb for verb, _ in ACTIVITY_VERBS]
+        groups['amenity'] = AMENITY_KEYWORDS
+        for tag, words in SPECIAL_TAGS:
+            groups[f'tag:{tag}'] = words
+        return KeywordScorer(groups)
+    
     def process_package_text(self, text: str) -> Dict:
         """Process package text and extract structured information"""
-        doc = self.nlp(text)
-        
-        return {
-            'entities': self._extract_entities(doc),
-            'keywords': self._extract_keywords(doc),
-            'trip_type': self._classify_trip_type(text),
-            'locations': self._extract_locations(doc),
-            'activities': self._extract_activities(text),
-            'amenities': self._extract_amenities(text),
-            'tags': self._generate_tags(text, doc)
+        return self.process_packages([text])[0]
+    
+    def process_packages(self, texts: Iterable[str], batch_size: int = 64,
+                         n_process: int = 1) -> List[Dict]:
+        """Process many package texts at once (same output as process_package_text per text)"""
+        def process(texts):
+            with self._select_pipes(TAGGING_COMPONENTS + ENTITY_COMPONENTS):
+                docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+                return [self._analyze(text, doc) for text, doc in zip(texts, docs)]
+        
+        return self._memoized('package', texts, process)
+    
+    def _cache_namespace(self, task: str) -> str:
+        """What a cached result depends on besides the text: task, model and settings"""
+        meta = self.nlp.meta
+        settings = json.dumps([self.profile, self.trip_keywords], sort_keys=True)
+        return (f"{task}|{meta.get('lang')}_{meta.get('name')}-{meta.get('version')}"
+                f"|{hashlib.sha1(settings.encode('utf-8')).hexdigest()}")
+    
+    def _memoized(self, task: str, texts: Iterable[str], compute: Callable[[List[str]], List]) -> List:
+        """Results of a task for many texts, computing only those not in the cache"""
+        # Whitespace is normalized whether or not results are cached, so the
+        # cache key (which ignores it) covers everything a result depends on
+        texts = [normalize_text(text) for text in texts]
+        if self.cache is None:
+            return compute(texts)
+        
+        namespace = self._cache_namespace(task)
+        keys = [self.cache.key(namespace, text) for text in texts]
+        results = self.cache.get_many(keys)
+        
+        # Texts that normalize the same are computed once
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in results:
+                pending.setdefault(key, text)
+        if pending:
+            computed = dict(zip(pending, compute(list(pending.values()))))
+            self.cache.put_many(computed)
+            results.update(computed)
+        
+        self.logger.debug(f"NLP cache: {len(texts) - len(pending)} of {len(texts)} {task} results reused")
+        return [results[key] for key in keys]
+    
+    def _select_pipes(self, components: Tuple[str, ...]):
+        """Run only the given components (those loaded) inside the with block"""
+        return self.nlp.select_pipes(enable=[name for name in self.nlp.pipe_names if name in components])
+    
+    def _analyze(self, text: str, doc) -> Dict:
+        """Build the structured information for a text and its parsed doc"""
+        analysis = DocAnalysis(text, doc)
+        extractors = {
+            'entities': self._extract_entities,
+            'keywords': self._extract_keywords,
+            'trip_type': self._classify_trip_type,
+            'locations': self._extract_locations,
+            'activities': self._extract_activities,
+            'amenities': self._extract_amenities,
+            'tags': self._generate_tags
         }
+        
+        return {field: analysis.get(field, extractors[field]) for field in self.fields}
     
-    def _extract_entities(self, doc) -> Dict[str, List[str]]:
+    def _extract_entities(self, analysis: 'DocAnalysis') -> Dict[str, List[str]]:
         """Extract named entities from text"""
         entities = {
             'locations': [],
@@ -52,17 +255,10 @@ class NLPProcessor:
             'persons': []
         }
         
-        for ent in doc.ents:
-            if ent.label_ in ['GPE', 'LOC']:
-                entities['locations'].append(ent.text)
-            elif ent.label_ == 'ORG':
-                entities['organizations'].append(ent.text)
-            elif ent.label_ == 'DATE':
-                entities['dates'].append(ent.text)
-            elif ent.label_ == 'MONEY':
-                entities['money'].append(ent.text)
-            elif ent.label_ == 'PERSON':
-                entities['persons'].append(ent.text)
+        for label, ent_text in analysis.ents:
+            key = ENTITY_LABEL_KEYS.get(label)
+            if key:
+                entities[key].append(ent_text)
         
         # Deduplicate
         for key in entities:
@@ -70,15 +266,15 @@ class NLPProcessor:
         
         return entities
     
-    def _extract_keywords(self, doc, top_n: int = 10) -> List[str]:
+    def _extract_keywords(self, analysis: 'DocAnalysis', top_n: int = 10) -> List[str]:
         """Extract important keywords from text"""
         # Filter tokens
         keywords = []
-        for token in doc:
+        for token in analysis.doc:
             if (not token.is_stop and 
                 not token.is_punct and 
                 not token.is_space and
-                token.pos_ in ['NOUN', 'PROPN', 'VERB'] and
+                token.pos_ in KEYWORD_POS and
                 len(token.text) > 2):
                 keywords.append(token.lemma_.lower())
         
@@ -86,13 +282,17 @@ class NLPProcessor:
         keyword_freq = Counter(keywords)
         return [word for word, _ in keyword_freq.most_common(top_n)]
     
-    def _classify_trip_type(self, text: str) -> str:
+    def _keyword_hits(self, analysis: 'DocAnalysis') -> set:
+        """Keywords of every list present in the text, from a single scan"""
+        return analysis.get('keyword_hits', lambda a: self.keyword_scorer.find(a.text_lower))
+    
+    def _classify_trip_type(self, analysis: 'DocAnalysis') -> str:
         """Classify the type of trip based on content"""
-        text_lower = text.lower()
+        hits = self._keyword_hits(analysis)
         scores = {}
         
         for trip_type, keywords in self.trip_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
+            score = sum(1 for keyword in keywords if keyword in hits)
             if score > 0:
                 scores[trip_type] = score
         
@@ -101,25 +301,25 @@ class NLPProcessor:
         
         return 'general'
     
-    def _extract_locations(self, doc) -> List[str]:
+    def classify_trip_types(self, texts: Iterable[str]) -> List[str]:
+        """Classify many texts at once from a keyword count matrix (uses the current trip_keywords)"""
+        scorer = KeywordScorer(self.trip_keywords)
+        trip_types = scorer.group_names
+        scores = scorer.score_matrix(text.lower() for text in texts)
+        
+        # argmax picks the first of tied types, like max() over the dict did
+        best = scores.argmax(axis=1)
+        has_score = scores.max(axis=1, initial=0) > 0
+        return [trip_types[column] if scored else 'general' for column, scored in zip(best, has_score)]
+    
+    def _extract_locations(self, analysis: 'DocAnalysis') -> List[str]:
         """Extract location names from text"""
-        locations = []
-        
         # From named entities
-        for ent in doc.ents:
-            if ent.label_ in ['GPE', 'LOC']:
-                locations.append(ent.text)
+        locations = [ent_text for label, ent_text in analysis.ents if label in LOCATION_LABELS]
         
         # Common location patterns
-        location_patterns = [
-            r'(?:visit|explore|trip to|tour of)\s+([A-Z][a-zA-Z\s]+)',
-            r'([A-Z][a-zA-Z]+)\s+(?:trip|tour|package|getaway)',
-        ]
-        
-        text = doc.text
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
-            locations.extend(matches)
+        for pattern in LOCATION_PATTERNS:
+            locations.extend(pattern.findall(analysis.text))
         
         # Clean and deduplicate
         cleaned_locations = []
@@ -130,91 +330,43 @@ class NLPProcessor:
         
         return cleaned_locations
     
-    def _extract_activities(self, text: str) -> List[str]:
+    def _extract_activities(self, analysis: 'DocAnalysis') -> List[str]:
         """Extract activities mentioned in the text"""
-        activities = []
-        
-        # Activity keywords
-        activity_verbs = [
-            'trek', 'hike', 'climb', 'swim', 'dive', 'surf', 'ski',
-            'raft', 'kayak', 'camp', 'explore', 'visit', 'tour',
-            'ride', 'sail', 'fish', 'snorkel', 'paraglide'
-        ]
-        
-        # Activity patterns
-        patterns = [
-            r'(?:go|will|can)\s+(\w+ing)',  # go trekking, will camping
-            r'(\w+ing)\s+(?:in|at|on)',      # trekking in mountains
-        ]
-        
-        text_lower = text.lower()
+        hits = self._keyword_hits(analysis)
         
         # Find verb-based activities
-        for verb in activity_verbs:
-            if verb in text_lower:
-                activities.append(verb + 'ing' if not verb.endswith('e') else verb[:-1] + 'ing')
+        activities = [activity for verb, activity in ACTIVITY_VERBS if verb in hits]
         
         # Find pattern-based activities
-        for pattern in patterns:
-            matches = re.findall(pattern, text_lower)
-            activities.extend(matches)
+        for pattern in ACTIVITY_PATTERNS:
+            activities.extend(pattern.findall(analysis.text_lower))
         
         # Clean and deduplicate
         return list(set(activity for activity in activities if len(activity) > 3))
     
-    def _extract_amenities(self, text: str) -> List[str]:
+    def _extract_amenities(self, analysis: 'DocAnalysis') -> List[str]:
         """Extract amenities and inclusions"""
-        amenities = []
-        
-        amenity_keywords = [
-            'accommodation', 'hotel', 'resort', 'homestay', 'camping',
-            'meals', 'breakfast', 'lunch', 'dinner', 'food',
-            'transport', 'transfer', 'pickup', 'drop',
-            'guide', 'instructor', 'equipment', 'gear',
-            'wifi', 'internet', 'parking', 'pool', 'spa'
-        ]
-        
-        text_lower = text.lower()
-        
-        for amenity in amenity_keywords:
-            if amenity in text_lower:
-                amenities.append(amenity)
-        
-        return amenities
+        hits = self._keyword_hits(analysis)
+        return [amenity for amenity in AMENITY_KEYWORDS if amenity in hits]
     
-    def _generate_tags(self, text: str, doc) -> List[str]:
+    def _generate_tags(self, analysis: 'DocAnalysis') -> List[str]:
         """Generate relevant tags for the package"""
         tags = []
         
         # Add trip type
-        trip_type = self._classify_trip_type(text)
-        tags.append(trip_type)
+        tags.append(analysis.get('trip_type', self._classify_trip_type))
         
         # Add locations
-        locations = self._extract_locations(doc)
-        tags.extend(locations[:3])  # Top 3 locations
+        tags.extend(analysis.get('locations', self._extract_locations)[:3])  # Top 3 locations
         
         # Add activities
-        activities = self._extract_activities(text)
-        tags.extend(activities[:5])  # Top 5 activities
+        tags.extend(analysis.get('activities', self._extract_activities)[:5])  # Top 5 activities
         
         # Add special tags
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in ['women only', 'ladies only', 'girls only']):
-            tags.append('women-only')
-        
-        if any(word in text_lower for word in ['budget', 'backpack', 'cheap']):
-            tags.append('budget-friendly')
-        
-        if any(word in text_lower for word in ['luxury', 'premium', '5 star']):
-            tags.append('luxury')
-        
-        if any(word in text_lower for word in ['weekend', '2 days', '3 days']):
-            tags.append('weekend-getaway')
-        
-        if any(word in text_lower for word in ['family', 'kids', 'children']):
-            tags.append('family-friendly')
+        hits = self._keyword_hits(analysis)
+        for tag, words in SPECIAL_TAGS:
+            if any(word in hits for word in words):
+                tags.append(tag)
         
         # Clean and deduplicate
         cleaned_tags = []
@@ -227,18 +379,55 @@ class NLPProcessor:
     
     def extract_itinerary(self, text: str) -> List[Dict]:
         """Extract structured itinerary from text"""
-        itinerary = []
-        
-        # Patterns for day-wise activities
-        day_patterns = [
-            r'Day\s*(\d+)[:\-\s]*(.+?)(?=Day\s*\d+|$)',
-            r'(\d+)(?:st|nd|rd|th)\s*Day[:\-\s]*(.+?)(?=\d+(?:st|nd|rd|th)\s*Day|$)',
-            r'D(\d+)[:\-\s]*(.+?)(?=D\d+|$)'
-        ]
-        
-        for pattern in day_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE | re.DOTALL)
-            for match in matches:
+        return self.extract_itineraries([text])[0]
+    
+    def extract_itineraries(self, texts: Iterable[str], batch_size: int = 256,
+                            n_process: int = 1) -> List[List[Dict]]:
+        """Extract itineraries from many texts, parsing all their day blocks in one batch"""
+        return self._memoized(
+            'itinerary', texts, lambda texts: self._extract_itineraries(texts, batch_size, n_process)
+        )
+    
+    def _extract_itineraries(self, texts: List[str], batch_size: int, n_process: int) -> List[List[Dict]]:
+        """Extract itineraries without the cache"""
+        blocks = [self._itinerary_blocks(text) for text in texts]
+        
+        itineraries = []
+        
+        # Parse the day blocks of every text together, only splitting sentences
+        with self._select_pipes(('transformer', 'tok2vec', self.sentence_component)):
+            docs = self.nlp.pipe(
+                (activities for text_blocks in blocks for _, activities in text_blocks),
+                batch_size=batch_size,
+                n_process=n_process
+            )
+            
+            for text_blocks in blocks:
+                itinerary = []
+                for (day_num, activities), doc in zip(text_blocks, docs):
+                    # Extract key points from activities
+                    key_activities = []
+                    
+                    for sent in doc.sents:
+                        if len(sent.text.strip()) > 10:
+                            key_activities.append(sent.text.strip())
+                    
+                    itinerary.append({
+                        'day': day_num,
+                        'title': f"Day {day_num}",
+                        'activities': activities[:200],  # Limit length
+                        'key_points': key_activities[:3]  # Top 3 points
+                    })
+                itineraries.append(sorted(itinerary, key=lambda x: x['day']))
+        
+        return itineraries
+    
+    def _itinerary_blocks(self, text: str) -> List[Tuple[int, str]]:
+        """Find the (day number, activities) blocks of an itinerary text"""
+        blocks = []
+        
+        for pattern in ITINERARY_DAY_PATTERNS:
+            for match in pattern.finditer(text):
                 day_num = int(match.group(1))
                 activities = match.group(2).strip()
                 
@@ -246,22 +435,24 @@ class NLPProcessor:
                 activities = re.sub(r'\s+', ' ', activities)
                 activities = activities.replace('\n', '. ')
                 
-                # Extract key points from activities
-                doc = self.nlp(activities)
-                key_activities = []
-                
-                for sent in doc.sents:
-                    if len(sent.text.strip()) > 10:
-                        key_activities.append(sent.text.strip())
-                
-                itinerary.append({
-                    'day': day_num,
-                    'title': f"Day {day_num}",
-                    'activities': activities[:200],  # Limit length
-                    'key_points': key_activities[:3]  # Top 3 points
-                })
-        
-        return sorted(itinerary, key=lambda x: x['day'])
+                blocks.append((day_num, activities))
+        
+        return blocks
+    
+    def embed_texts(self, texts: Iterable[str], batch_size: int = 64) -> np.ndarray:
+        """Unit-length doc vectors of many texts (dot products are calculate_similarity scores)"""
+        texts = list(texts)
+        
+        with self._select_pipes(TAGGING_COMPONENTS):
+            vectors = np.array(
+                [doc.vector for doc in self.nlp.pipe(texts, batch_size=batch_size)], dtype=np.float32
+            )
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        
+        # Texts without a vector stay all zero, so they are similar to nothing
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
     
     def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate similarity between two package descriptions"""
@@ -0,0 +1,188 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from backend.config import CACHE_DIR, NLP_CACHE_ENABLED, NLP_CACHE_MAX_BYTES, NLP_CACHE_MEMORY_ENTRIES
+
+_LINE_BREAKS = re.compile(r'\s*\n\s*')
+_SPACES = re.compile(r'[^\S\n]+')
+
+
+def normalize_text(text: str) -> str:
+    """Text as analyzed and cached: NFC, single spaces, no blank lines (line breaks separate fields)"""
+    text = _LINE_BREAKS.sub('\n', unicodedata.normalize('NFC', text))
+    return _SPACES.sub(' ', text).strip()
+
+
+class NLPCache:
+    """
+    Persistent, size-bounded memo of NLP results
+    
+    Results are stored as JSON in a SQLite table keyed by a SHA-256 of the
+    namespace (task, model name and version, processor settings) and the
+    normalized text (see normalize_text), so unchanged package texts are
+    not parsed again on the next run even if their whitespace changed.
+    NLPProcessor analyzes the normalized text too, so no result depends on
+    whitespace the key leaves out. The least recently used results are
+    evicted above max_bytes. A small in-memory LRU in front of the table
+    serves repeats within a run.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None,
+                 memory_entries: Optional[int] = None):
+        """
+        Open (or create) the cache
+        
+        Args:
+            path: SQLite file holding the results
+            max_bytes: Total result size above which LRU results are evicted
+            memory_entries: Results kept in the in-memory LRU
+        """
+        self.path = path or os.path.join(CACHE_DIR, 'nlp', 'results.sqlite3')
+        self.max_bytes = max_bytes or NLP_CACHE_MAX_BYTES
+        self.memory_entries = NLP_CACHE_MEMORY_ENTRIES if memory_entries is None else memory_entries
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        # Worker processes share the file, so wait for their writes rather than fail
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+        self._db.commit()
+    
+    @staticmethod
+    def key(namespace: str, text: str) -> str:
+        """Cache key of a text's result within a namespace (pass text through normalize_text first)"""
+        return hashlib.sha256(f"{namespace}\0{text}".encode('utf-8')).hexdigest()
+    
+    def _remember(self, key: str, value: str):
+        """Add a result to the in-memory LRU (lock must be held)"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Look up results
+        
+        Args:
+            keys: Cache keys (see key())
+        
+        Returns:
+            dict: Decoded results of the keys that were found
+        """
+        found = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+            
+            # SQLite limits the number of bound parameters per statement
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, value in rows:
+                    found[key] = value
+                    self._remember(key, value)
+            
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE results SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+                )
+                self._db.commit()
+        
+        return {key: json.loads(value) for key, value in found.items()}
+    
+    def put_many(self, results: Dict[str, Any]):
+        """
+        Store results
+        
+        Args:
+            results: Results keyed by cache key; must be JSON serializable
+        """
+        if not results:
+            return
+        
+        now = time.time()
+        rows = []
+        for key, result in results.items():
+            value = json.dumps(result, ensure_ascii=False)
+            rows.append((key, value, len(value.encode('utf-8')), now))
+        
+        with self._lock:
+            for key, value, _, _ in rows:
+                self._remember(key, value)
+            self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows)
+            self._db.commit()
+            self._evict()
+    
+    def _evict(self):
+        """Drop least recently used results until under max_bytes (lock must be held)"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        # Oldest results whose sizes, added up in access order, are needed to
+        # get under the limit; the in-memory LRU bounds itself, so results
+        # evicted here may still be served from it for the rest of the run
+        evicted = self._db.execute(
+            """
+            DELETE FROM results WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, size,
+                           SUM(size) OVER (ORDER BY accessed_at, key ROWS UNBOUNDED PRECEDING) AS freed
+                    FROM results
+                )
+                WHERE freed - size < ?
+            )
+            """,
+            (total - self.max_bytes,)
+        ).rowcount
+        self._db.commit()
+        self.logger.debug(f"Evicted {evicted} cached NLP results")
+    
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._db.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_nlp_cache() -> Optional[NLPCache]:
+    """Return the process-wide NLP cache, or None if caching is disabled"""
+    global _default_cache
+    if not NLP_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = NLPCache()
+        return _default_cache
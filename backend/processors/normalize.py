@@ -0,0 +1,169 @@
+import re
+from typing import Dict, Optional, Tuple
+
+# An amount such as 12,999 / 1,20,000 / 1299.50 / 1.2 lakh / 12k
+_AMOUNT = r'(\d{1,3}(?:,\d{2,3})+|\d+)(?:\.(\d{1,2}))?(?:\s*(lakhs?|lacs?|k)\b)?'
+AMOUNT_PATTERN = re.compile(_AMOUNT, re.IGNORECASE)
+AMOUNT_MULTIPLIERS = {'lakh': 100000, 'lakhs': 100000, 'lac': 100000, 'lacs': 100000, 'k': 1000}
+
+# Currency markers and their ISO codes; a marker only counts when it is
+# attached to the amount ("₹ 999", "Rs.999", "999 INR", "999/-")
+CURRENCY_PREFIXES = [
+    (r'₹|\bRs\.?|\bINR\b', 'INR'),
+    (r'US\$|\bUSD\b|\$', 'USD'),
+    (r'€|\bEUR\b', 'EUR'),
+    (r'£|\bGBP\b', 'GBP')
+]
+CURRENCY_SUFFIXES = [
+    (r'INR\b|/-', 'INR'),
+    (r'USD\b', 'USD'),
+    (r'EUR\b', 'EUR'),
+    (r'GBP\b', 'GBP')
+]
+# (pattern, currency code) of an amount with a marker before or after it
+PRICE_PATTERNS = [
+    (re.compile(rf'(?:{marker})\s*{_AMOUNT}', re.IGNORECASE), code)
+    for marker, code in CURRENCY_PREFIXES
+] + [
+    (re.compile(rf'{_AMOUNT}\s*(?:{marker})', re.IGNORECASE), code)
+    for marker, code in CURRENCY_SUFFIXES
+]
+
+DAYS_PATTERN = re.compile(r'(\d+)\s*(?:days?|d)(?![a-z])', re.IGNORECASE)
+NIGHTS_PATTERN = re.compile(r'(\d+)\s*(?:nights?|n)(?![a-z])', re.IGNORECASE)
+
+# Words around a destination that are not part of its name
+DESTINATION_NOISE = re.compile(
+    r'\b(?:tour|trip|package|holiday|vacation|getaway)s?\b|,?\s*india$', re.IGNORECASE
+)
+_WHITESPACE = re.compile(r'\s+')
+
+# Old and alternative names of destinations, by lowercase name
+DESTINATION_ALIASES = {
+    'bombay': 'Mumbai',
+    'bangalore': 'Bengaluru',
+    'calcutta': 'Kolkata',
+    'madras': 'Chennai',
+    'pondicherry': 'Puducherry',
+    'gurgaon': 'Gurugram',
+    'simla': 'Shimla',
+    'cochin': 'Kochi',
+    'trivandrum': 'Thiruvananthapuram',
+    'leh ladakh': 'Ladakh',
+    'leh': 'Ladakh',
+    'andaman and nicobar': 'Andaman',
+    'andaman & nicobar': 'Andaman',
+    'andamans': 'Andaman'
+}
+
+
+def parse_price(text: Optional[str]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Parse scraped price text
+    
+    The first amount with a currency marker attached to it ("₹ 999",
+    "999 INR", "999/-") is used, or else the first amount in the text.
+    Prices without a currency marker are taken to be in rupees.
+    
+    Args:
+        text: Price text such as "₹12,999", "Rs. 1.2 Lakh" or "$1,299.50"
+    
+    Returns:
+        tuple: (price in the currency's hundredth units, e.g. paise; ISO
+            currency code), or (None, None) if the text has no amount
+    """
+    if not text:
+        return None, None
+    
+    # The earliest amount with an attached currency marker
+    match, currency = None, 'INR'
+    for pattern, code in PRICE_PATTERNS:
+        candidate = pattern.search(text)
+        if candidate and (match is None or candidate.start() < match.start()):
+            match, currency = candidate, code
+    
+    if match is None:
+        match = AMOUNT_PATTERN.search(text)
+        if match is None:
+            return None, None
+    
+    whole, fraction, unit = match.groups()
+    amount = int(whole.replace(',', '')) * 100 + int((fraction or '0').ljust(2, '0'))
+    if unit:
+        amount *= AMOUNT_MULTIPLIERS[unit.lower()]
+    
+    return amount, currency
+
+
+def parse_duration(text: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Parse scraped duration text
+    
+    Packages quoting only days or only nights get the other one derived
+    (a 5 day trip has 4 nights).
+    
+    Args:
+        text: Duration text such as "5 Days 4 Nights", "4N/5D" or "6 days"
+    
+    Returns:
+        tuple: (days, nights), None for what the text does not give
+    """
+    if not text:
+        return None, None
+    
+    days = DAYS_PATTERN.search(text)
+    nights = NIGHTS_PATTERN.search(text)
+    days = int(days.group(1)) if days else None
+    nights = int(nights.group(1)) if nights else None
+    
+    if days is None and nights is not None:
+        days = nights + 1
+    elif nights is None and days is not None:
+        nights = max(days - 1, 0)
+    
+    return days, nights
+
+
+def canonical_destination(text: Optional[str]) -> Optional[str]:
+    """
+    Canonical name of a scraped destination
+    
+    Package words ("Tour", "Packages"), a trailing ", India" and extra
+    whitespace are dropped, known aliases are mapped to one name, and the
+    result is title-cased, so "goa tour" and "Goa  Packages" both give "Goa".
+    
+    Args:
+        text: Destination text
+    
+    Returns:
+        str: Canonical destination, or None if nothing is left
+    """
+    if not text:
+        return None
+    
+    name = _WHITESPACE.sub(' ', DESTINATION_NOISE.sub(' ', text)).strip(' -–—,|:')
+    if not name:
+        return None
+    
+    return DESTINATION_ALIASES.get(name.lower(), name.title())
+
+
+def normalize_package(package: Dict) -> Dict:
+    """
+    Typed fields of a scraped package
+    
+    Args:
+        package: Package as extracted by the scrapers
+    
+    Returns:
+        dict: price_paise, currency, days, nights and destination (canonical)
+    """
+    price, currency = parse_price(package.get('price'))
+    days, nights = parse_duration(package.get('duration'))
+    return {
+        'price_paise': price,
+        'currency': currency,
+        'days': days,
+        'nights': nights,
+        'destination': canonical_destination(package.get('destination'))
+    }
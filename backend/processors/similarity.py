@@ -0,0 +1,182 @@
+import os
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from backend.config import PROCESSED_DIR
+
+# Default location of the package embedding matrix
+EMBEDDINGS_FILE = os.path.join(PROCESSED_DIR, 'package_embeddings.npy')
+
+# Package fields that make up the text that is embedded
+PACKAGE_TEXT_FIELDS = ('title', 'destination', 'description', 'highlights', 'inclusions')
+
+
+def package_text(package: Dict) -> str:
+    """Text of a scraped package used for similarity"""
+    parts = []
+    for field in PACKAGE_TEXT_FIELDS:
+        value = package.get(field)
+        if isinstance(value, list):
+            parts.extend(str(item) for item in value if item)
+        elif value:
+            parts.append(str(value))
+    return '. '.join(parts)
+
+
+class EmbeddingIndex:
+    """
+    Unit-length package vectors in a memory-mapped NumPy matrix
+    
+    Each package is parsed and embedded once (see NLPProcessor.embed_texts),
+    so a similarity is just a dot product: most_similar is one
+    matrix-vector product and all_pairs_above multiplies the matrix with
+    itself block by block. The matrix is stored as a .npy file with the
+    package ids next to it in <path>.ids.json.
+    """
+    
+    def __init__(self, vectors: np.ndarray, ids: Sequence[str], path: Optional[str] = None):
+        """
+        Wrap an embedding matrix
+        
+        Args:
+            vectors: packages x dimensions matrix of unit-length rows
+            ids: Package id of each row
+            path: .npy file the matrix is stored in, if any
+        """
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+        
+        self.vectors = vectors
+        self.ids = list(ids)
+        self.path = path
+        self._rows = {package_id: row for row, package_id in enumerate(self.ids)}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @classmethod
+    def build(cls, processor, texts: Iterable[str], ids: Sequence[str],
+              path: str = EMBEDDINGS_FILE, batch_size: int = 256) -> 'EmbeddingIndex':
+        """
+        Embed texts and write them to a memory-mapped matrix
+        
+        Args:
+            processor: NLPProcessor used to embed the texts
+            texts: Package texts (see package_text)
+            ids: Package id of each text
+            path: .npy file to (over)write
+            batch_size: Texts embedded per batch
+        
+        Returns:
+            EmbeddingIndex: The index, backed by the new file
+        """
+        texts = list(texts)
+        ids = list(ids)
+        if len(ids) != len(texts):
+            raise ValueError(f"Got {len(ids)} ids for {len(texts)} texts")
+        
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp.npy"
+        
+        # Embed batch by batch straight into the file
+        vectors = None
+        for start in range(0, len(texts), batch_size):
+            batch = processor.embed_texts(texts[start:start + batch_size], batch_size=batch_size)
+            if vectors is None:
+                vectors = np.lib.format.open_memmap(
+                    tmp_path, mode='w+', dtype=np.float32, shape=(len(texts), batch.shape[1])
+                )
+            vectors[start:start + len(batch)] = batch
+        
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32, shape=(0, 0))
+        vectors.flush()
+        del vectors
+        
+        with open(f"{path}.ids.json.tmp", 'w', encoding='utf-8') as f:
+            json.dump(ids, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        os.replace(f"{path}.ids.json.tmp", f"{path}.ids.json")
+        
+        return cls.load(path)
+    
+    @classmethod
+    def load(cls, path: str = EMBEDDINGS_FILE) -> 'EmbeddingIndex':
+        """Open a stored index without reading the matrix into memory"""
+        vectors = np.load(path, mmap_mode='r')
+        with open(f"{path}.ids.json", 'r', encoding='utf-8') as f:
+            ids = json.load(f)
+        return cls(vectors, ids, path)
+    
+    def vector(self, package_id: str) -> np.ndarray:
+        """Stored vector of a package"""
+        return np.asarray(self.vectors[self._rows[package_id]])
+    
+    def most_similar(self, package: Union[str, np.ndarray], k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the packages most similar to a package
+        
+        Args:
+            package: Id of an indexed package, or a unit-length query vector
+            k: Number of results
+        
+        Returns:
+            list: (package id, similarity) pairs, most similar first. An
+                indexed package is left out of its own results.
+        """
+        own_row = None
+        if isinstance(package, str):
+            own_row = self._rows[package]
+            query = self.vector(package)
+        else:
+            query = np.asarray(package, dtype=np.float32)
+        
+        if not len(self.ids) or k <= 0:
+            return []
+        
+        scores = np.asarray(self.vectors @ query, dtype=np.float32)
+        if own_row is not None:
+            scores[own_row] = -np.inf
+        
+        # Partial sort: only the top k are ordered
+        k = min(k, len(scores) - (own_row is not None))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.ids[row], float(scores[row])) for row in top]
+    
+    def all_pairs_above(self, threshold: float, block_size: int = 1024) -> Iterator[Tuple[str, str, float]]:
+        """
+        Yield every pair of packages at least threshold similar
+        
+        The similarity matrix is computed one block_size x block_size tile
+        at a time (only tiles on or above the diagonal), so memory stays at
+        two blocks of vectors and one tile of scores however many packages
+        there are.
+        
+        Args:
+            threshold: Minimum similarity (cosine, -1..1)
+            block_size: Rows and columns per tile
+        
+        Yields:
+            tuple: (id a, id b, similarity) with a indexed before b
+        """
+        count = len(self.ids)
+        for row_start in range(0, count, block_size):
+            rows_block = np.asarray(self.vectors[row_start:row_start + block_size])
+            
+            for column_start in range(row_start, count, block_size):
+                columns_block = np.asarray(self.vectors[column_start:column_start + block_size])
+                scores = rows_block @ columns_block.T
+                
+                matches = scores >= threshold
+                if column_start == row_start:
+                    # Keep each pair once (b after a) and drop self-similarity
+                    matches &= np.triu(np.ones(scores.shape, dtype=bool), k=1)
+                
+                rows, columns = np.nonzero(matches)
+                for row, column in zip(rows, columns):
+                    yield self.ids[row_start + row], self.ids[column_start + column], float(scores[row, column])
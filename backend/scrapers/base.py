@@ -1,5 +1,6 @@
 import time
 import random
+import asyncio
 import json
 import os
 import logging
@@ -7,8 +8,13 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 
+from backend.scrapers.ratelimit import get_rate_limiter, THROTTLE_STATUS_CODES
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,23 +35,41 @@ class BaseScraper(ABC):
         self.session = self._create_session()
         self.logger = logging.getLogger(self.__class__.__name__)
         
+        # Shared on-disk cache of fetched pages (None if disabled)
+        from backend.scrapers.cache import get_response_cache
+        self.response_cache = get_response_cache()
+        
+        # Per-host politeness budget shared by all scrapers
+        self.rate_limiter = get_rate_limiter()
+        
+        # Thread pool pages are fetched ahead on (created on first use)
+        self._fetch_executor = None
+        
         # Ensure output directory exists
         os.makedirs(output_dir, exist_ok=True)
     
     def _create_session(self):
         """Create a requests session with retry capability"""
+        from backend.config import MAX_CONNECTIONS_PER_HOST
+        
         session = requests.Session()
         
-        # Set up retry strategy
+        # Set up retry strategy; 429 and 503 are left to fetch_url so the
+        # rate limiter sees them and slows down for the whole host
         retries = Retry(
             total=5,
             backoff_factor=0.5,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 504],
             allowed_methods=["GET", "POST"]
         )
         
-        # Add adapter with retry strategy to session
-        adapter = HTTPAdapter(max_retries=retries)
+        # Add adapter with retry strategy to session; keep enough pooled
+        # keep-alive connections per host for concurrent fetches
+        adapter = HTTPAdapter(
+            max_retries=retries,
+            pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+            pool_block=True
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -64,7 +88,7 @@ class BaseScraper(ABC):
         """Rotate user agent to avoid detection"""
         if self.session is None:
             return None
-            
+        
         from backend.config import USER_AGENTS
         user_agent = random.choice(USER_AGENTS)
         self.session.headers.update({
@@ -73,7 +97,7 @@ class BaseScraper(ABC):
         return user_agent
     
     def random_delay(self, min_seconds=None, max_seconds=None):
-        """Add a random delay between requests"""
+        """Add a random delay (prefer rate_limiter, which only waits per host)"""
         from backend.config import SCRAPER_DELAY_MIN, SCRAPER_DELAY_MAX
         
         min_seconds = min_seconds or SCRAPER_DELAY_MIN
@@ -84,35 +108,152 @@ class BaseScraper(ABC):
         time.sleep(delay)
         return delay
     
-    def fetch_url(self, url, timeout=30):
+    def _fresh_cached(self, url):
+        """Cached response of a URL that can be used without a request, if any"""
+        cached = self.response_cache.get(url) if self.response_cache else None
+        if cached and self.response_cache.is_fresh(cached):
+            return cached
+        return None
+    
+    def fetch_url(self, url, timeout=30, rate_limited=False):
         """
         Fetch content from a URL with error handling
         
+        Responses are served from the response cache while fresh; stale
+        entries are revalidated with If-None-Match / If-Modified-Since.
+        Requests wait for the host's rate limiter, and 429/503 responses are
+        retried after the wait the limiter backs off to.
+        
         Args:
             url (str): URL to fetch
             timeout (int): Request timeout in seconds
-            
+            rate_limited (bool): The caller already waited for the rate limiter
+        
         Returns:
             str: HTML content if successful, None otherwise
         """
+        fresh = self._fresh_cached(url)
+        if fresh:
+            self.logger.debug(f"Serving {url} from cache")
+            return fresh.body
+        
+        # A stale entry is revalidated with its validators
+        cached = self.response_cache.get(url) if self.response_cache else None
+        
         try:
             # Rotate user agent occasionally
             if random.random() < 0.3:  # 30% chance to rotate
                 self._rotate_user_agent()
-                
+            
             self.logger.info(f"Fetching URL: {url}")
-            response = self.session.get(url, timeout=timeout)
+            headers = cached.conditional_headers() if cached else None
+            response = self._rate_limited_get(url, timeout, headers, rate_limited)
             
-            if response.status_code == 200:
+            if response.status_code == 304 and cached:
+                self.logger.debug(f"Not modified: {url}")
+                self.response_cache.revalidated(url, response.headers)
+                return cached.body
+            elif response.status_code == 200:
+                if self.response_cache:
+                    self.response_cache.put(url, response.text, response.headers)
                 return response.text
             else:
                 self.logger.warning(f"Failed to fetch URL {url}: Status code {response.status_code}")
                 return None
-                
+        
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching URL {url}: {e}")
             return None
     
+    def _rate_limited_get(self, url, timeout, headers=None, rate_limited=False):
+        """GET a URL within the host's rate limit, retrying 429/503 responses"""
+        from backend.config import MAX_RETRIES
+        
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt or not rate_limited:
+                self.rate_limiter.acquire(url)
+            
+            response = self.session.get(url, timeout=timeout, headers=headers)
+            self.rate_limiter.update(url, response.status_code, response.headers.get('Retry-After'))
+            if response.status_code not in THROTTLE_STATUS_CODES:
+                break
+        
+        return response
+    
+    async def fetch_many(self, urls, timeout=30, max_per_host=None):
+        """
+        Fetch several URLs concurrently
+        
+        Requests go through the same session as fetch_url, so they share its
+        retry strategy, User-Agent rotation and keep-alive connection pool.
+        At most max_per_host requests are in flight per host at any time, and
+        each host is paced by the rate limiter.
+        
+        Args:
+            urls (list): URLs to fetch
+            timeout (int): Request timeout in seconds
+            max_per_host (int): Concurrent requests allowed per host
+        
+        Returns:
+            list: HTML content (or None on failure) for each URL, in order
+        """
+        tasks = self._start_fetches(
+            urls, lambda url: self.fetch_url(url, timeout, rate_limited=True), max_per_host
+        )
+        return await asyncio.gather(*tasks)
+    
+    def _start_fetches(self, urls, fetch, max_per_host=None, use_cache=True):
+        """
+        Start one asyncio task per URL that fetches it on a worker thread
+        
+        A task waits for one of its host's max_per_host connections and then
+        for the host's rate limiter on the event loop, so no thread is tied
+        up while a host makes it wait and other hosts keep going.
+        
+        Args:
+            urls (list): URLs to fetch
+            fetch (callable): Blocking fetch(url), called once the rate
+                limiter slot is taken
+            max_per_host (int): Concurrent fetches allowed per host
+                (MAX_CONNECTIONS_PER_HOST by default)
+            use_cache (bool): Serve fresh cached responses without a request
+        
+        Returns:
+            list: One task per URL, resolving to its HTML content or None
+        """
+        from backend.config import MAX_CONNECTIONS_PER_HOST
+        
+        max_per_host = max_per_host or MAX_CONNECTIONS_PER_HOST
+        host_limits = defaultdict(lambda: asyncio.Semaphore(max_per_host))
+        loop = asyncio.get_running_loop()
+        
+        async def fetch_one(url):
+            async with host_limits[urlparse(url).netloc]:
+                cached = self._fresh_cached(url) if use_cache else None
+                if cached:
+                    return cached.body
+                await self.rate_limiter.acquire_async(url)
+                return await loop.run_in_executor(None, fetch, url)
+        
+        return [asyncio.ensure_future(fetch_one(url)) for url in urls]
+    
+    def _get_fetch_executor(self):
+        """Return the thread pool pages are fetched ahead on (MAX_CONNECTIONS_PER_HOST threads)"""
+        from backend.config import MAX_CONNECTIONS_PER_HOST
+        
+        if self._fetch_executor is None:
+            self._fetch_executor = ThreadPoolExecutor(
+                max_workers=MAX_CONNECTIONS_PER_HOST,
+                thread_name_prefix=f"{self.__class__.__name__}-fetch"
+            )
+        return self._fetch_executor
+    
+    def _shutdown_fetch_executor(self):
+        """Shut down the fetch thread pool, dropping queued fetches and waiting for running ones"""
+        if self._fetch_executor is not None:
+            self._fetch_executor.shutdown(wait=True, cancel_futures=True)
+            self._fetch_executor = None
+    
     def save_to_json(self, data, filename):
         """Save data to a JSON file"""
         filepath = os.path.join(self.output_dir, filename)
@@ -136,7 +277,7 @@ class BaseScraper(ABC):
         
         Args:
             target: The target to scrape (URL, username, etc.)
-            
+        
         Returns:
             dict: Extracted data
         """
@@ -0,0 +1,195 @@
+import random
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.config import (
+    HEADLESS_BROWSER, USER_AGENTS, BROWSER_POOL_SIZE,
+    BROWSER_MAX_PAGES_PER_DRIVER, BROWSER_MAX_MEMORY_MB
+)
+
+
+class _PooledDriver:
+    """A Chrome driver together with its usage statistics"""
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+
+
+class BrowserPool:
+    """Thread-safe pool of warm Chrome drivers leased out one page at a time"""
+    
+    def __init__(self, size=None, headless=None, max_pages=None, max_memory_mb=None):
+        """
+        Initialize the browser pool
+        
+        Args:
+            size (int): Maximum number of Chrome instances alive at once
+            headless (bool): Whether to run Chrome in headless mode
+            max_pages (int): Pages a driver may load before it is recycled
+            max_memory_mb (int): JS heap size (MB) above which a driver is recycled
+        """
+        self.size = size or BROWSER_POOL_SIZE
+        self.headless = HEADLESS_BROWSER if headless is None else headless
+        self.max_pages = max_pages or BROWSER_MAX_PAGES_PER_DRIVER
+        self.max_memory_mb = max_memory_mb or BROWSER_MAX_MEMORY_MB
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self._idle = []
+        self._alive = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    def _create_driver(self):
+        """Start a new Chrome WebDriver"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
+        self.logger.info("Starting Chrome WebDriver for website scraping")
+        
+        # Set up Chrome options
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_argument("--disable-infobars")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        
+        # Set a random user agent
+        user_agent = random.choice(USER_AGENTS)
+        chrome_options.add_argument(f"--user-agent={user_agent}")
+        
+        # Initialize driver
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.implicitly_wait(5)
+        
+        # Execute script to hide webdriver
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        return _PooledDriver(driver)
+    
+    @contextmanager
+    def lease(self):
+        """
+        Lease a warm driver for the duration of a with-block
+        
+        Blocks while all drivers are busy. A driver that raises a
+        WebDriverException inside the block is treated as crashed and
+        replaced on the next lease.
+        
+        Yields:
+            WebDriver: A ready-to-use Chrome driver
+        """
+        from selenium.common.exceptions import WebDriverException
+        
+        pooled = self._acquire()
+        healthy = True
+        try:
+            yield pooled.driver
+        except WebDriverException:
+            healthy = self._is_alive(pooled)
+            raise
+        finally:
+            pooled.pages += 1
+            self._release(pooled, healthy)
+    
+    def _acquire(self):
+        """Take an idle driver, start a new one, or wait for one to free up"""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    pooled = self._idle.pop()
+                    break
+                if self._alive < self.size:
+                    self._alive += 1
+                    pooled = None
+                    break
+                self._condition.wait()
+        
+        if pooled is not None:
+            if self._is_alive(pooled):
+                return pooled
+            self.logger.warning("Discarding crashed Chrome WebDriver")
+            self._quit(pooled)
+        
+        try:
+            return self._create_driver()
+        except Exception:
+            with self._condition:
+                self._alive -= 1
+                self._condition.notify()
+            raise
+    
+    def _release(self, pooled, healthy):
+        """Return a driver to the pool, recycling it if it is worn out"""
+        if not healthy:
+            self.logger.warning("Chrome WebDriver crashed, it will be restarted")
+            recycle = True
+        elif pooled.pages >= self.max_pages:
+            self.logger.info(f"Recycling Chrome WebDriver after {pooled.pages} pages")
+            recycle = True
+        elif self._memory_mb(pooled) > self.max_memory_mb:
+            self.logger.info(f"Recycling Chrome WebDriver above {self.max_memory_mb} MB")
+            recycle = True
+        else:
+            recycle = False
+        
+        with self._condition:
+            if recycle or self._closed:
+                self._alive -= 1
+            else:
+                self._idle.append(pooled)
+            self._condition.notify()
+        
+        if recycle or self._closed:
+            self._quit(pooled)
+    
+    def _is_alive(self, pooled):
+        """Check that the browser behind a driver still responds"""
+        from selenium.common.exceptions import WebDriverException
+        
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+    
+    def _memory_mb(self, pooled):
+        """Return the JS heap size of the driver's current page in MB"""
+        from selenium.common.exceptions import WebDriverException
+        
+        try:
+            used = pooled.driver.execute_script(
+                "return window.performance && performance.memory ? performance.memory.usedJSHeapSize : 0"
+            )
+            return (used or 0) / (1024 * 1024)
+        except WebDriverException:
+            return 0
+    
+    def _quit(self, pooled):
+        """Quit a driver, ignoring errors from an already dead browser"""
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            self.logger.debug(f"Error quitting Chrome WebDriver: {e}")
+    
+    def close(self):
+        """Quit all idle drivers; busy ones are quit when they are returned"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._alive -= len(idle)
+            self._condition.notify_all()
+        
+        if idle:
+            self.logger.info(f"Closing {len(idle)} Chrome WebDriver(s)")
+        for pooled in idle:
+            self._quit(pooled)
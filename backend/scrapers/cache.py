@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+from requests.structures import CaseInsensitiveDict
+
+from backend.config import CACHE_DIR, HTTP_CACHE_ENABLED, HTTP_CACHE_TTL, HTTP_CACHE_MAX_BYTES
+
+
+class CacheEntry:
+    """A cached response body with the validators needed to revalidate it"""
+    
+    def __init__(self, url, body, headers, etag, last_modified, stored_at):
+        self.url = url
+        self.body = body
+        self.headers = headers
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+    
+    def conditional_headers(self):
+        """Request headers that ask the server to reply 304 if unchanged"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Persistent, size-bounded cache of fetched pages
+    
+    Bodies are stored content-addressed (by SHA-256) under the cache
+    directory, so identical pages are kept once. A SQLite index maps each
+    URL and variant ("raw" HTTP responses, "rendered" browser pages) to its
+    body, headers, ETag and Last-Modified, and tracks access time for LRU
+    eviction.
+    """
+    
+    def __init__(self, cache_dir=None, ttl=None, max_bytes=None):
+        """
+        Initialize the response cache
+        
+        Args:
+            cache_dir (str): Directory holding the index and bodies
+            ttl (int): Seconds an entry is served without revalidation
+            max_bytes (int): Total body size above which LRU entries are evicted
+        """
+        self.cache_dir = cache_dir or os.path.join(CACHE_DIR, 'http')
+        self.ttl = HTTP_CACHE_TTL if ttl is None else ttl
+        self.max_bytes = max_bytes or HTTP_CACHE_MAX_BYTES
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self.bodies_dir = os.path.join(self.cache_dir, 'bodies')
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.cache_dir, 'index.sqlite3'),
+            check_same_thread=False
+        )
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                headers TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+        self._db.commit()
+    
+    @staticmethod
+    def _key(url, variant):
+        return hashlib.sha256(f"{variant}:{url}".encode('utf-8')).hexdigest()
+    
+    def _body_path(self, body_hash):
+        return os.path.join(self.bodies_dir, body_hash[:2], body_hash)
+    
+    def get(self, url, variant='raw'):
+        """
+        Look up a cached response
+        
+        Args:
+            url (str): Requested URL
+            variant (str): "raw" for HTTP responses, "rendered" for browser pages
+        
+        Returns:
+            CacheEntry: The cached entry, or None if missing
+        """
+        key = self._key(url, variant)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body_hash, headers, etag, last_modified, stored_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        
+        body_hash, headers, etag, last_modified, stored_at = row
+        try:
+            with open(self._body_path(body_hash), 'r', encoding='utf-8') as f:
+                body = f.read()
+        except OSError:
+            # Body was removed behind our back; treat as a miss
+            self._delete(key)
+            return None
+        
+        return CacheEntry(url, body, json.loads(headers or '{}'), etag, last_modified, stored_at)
+    
+    def is_fresh(self, entry):
+        """Whether an entry may be served without contacting the server"""
+        return time.time() - entry.stored_at < self.ttl
+    
+    def put(self, url, body, headers=None, variant='raw'):
+        """
+        Store a response body and its validators
+        
+        Args:
+            url (str): Requested URL
+            body (str): Response body
+            headers (Mapping): Response headers
+            variant (str): "raw" for HTTP responses, "rendered" for browser pages
+        """
+        headers = CaseInsensitiveDict(headers or {})
+        data = body.encode('utf-8')
+        body_hash = hashlib.sha256(data).hexdigest()
+        body_path = self._body_path(body_hash)
+        
+        try:
+            if not os.path.exists(body_path):
+                os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, body_path)
+        except OSError as e:
+            self.logger.error(f"Error caching response for {url}: {e}")
+            return
+        
+        now = time.time()
+        with self._lock:
+            old = self._db.execute(
+                "SELECT body_hash FROM entries WHERE key = ?", (self._key(url, variant),)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(url, variant), url, variant, body_hash, len(data),
+                 json.dumps(dict(headers)), headers.get('ETag'), headers.get('Last-Modified'), now, now)
+            )
+            self._db.commit()
+            if old and old[0] != body_hash:
+                self._remove_unreferenced_body(old[0])
+            self._evict()
+    
+    def revalidated(self, url, headers=None, variant='raw'):
+        """
+        Mark an entry as fresh again after a 304 Not Modified
+        
+        Args:
+            url (str): Requested URL
+            headers (Mapping): Headers of the 304 response, which may carry
+                updated validators
+            variant (str): Cache variant of the entry
+        """
+        headers = CaseInsensitiveDict(headers or {})
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """UPDATE entries
+                   SET stored_at = ?, accessed_at = ?,
+                       etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                   WHERE key = ?""",
+                (now, now, headers.get('ETag'), headers.get('Last-Modified'), self._key(url, variant))
+            )
+            self._db.commit()
+    
+    def _delete(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT body_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            if row:
+                self._remove_unreferenced_body(row[0])
+    
+    def _remove_unreferenced_body(self, body_hash):
+        """Delete a body file once no entry points at it (lock must be held)"""
+        in_use = self._db.execute(
+            "SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)
+        ).fetchone()
+        if not in_use:
+            try:
+                os.remove(self._body_path(body_hash))
+            except OSError:
+                pass
+    
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes (lock must be held)"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        evicted = 0
+        rows = self._db.execute("SELECT key, body_hash, size FROM entries ORDER BY accessed_at").fetchall()
+        for key, body_hash, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._remove_unreferenced_body(body_hash)
+            total -= size
+            evicted += 1
+        self._db.commit()
+        self.logger.debug(f"Evicted {evicted} cached responses")
+    
+    def close(self):
+        """Close the index database"""
+        with self._lock:
+            self._db.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide response cache, or None if caching is disabled"""
+    global _default_cache
+    if not HTTP_CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
@@ -0,0 +1,286 @@
+import io
+import re
+import gzip
+import heapq
+import logging
+from urllib.parse import urlparse, urljoin
+from urllib.robotparser import RobotFileParser
+
+import lxml.html
+from lxml import etree
+
+from backend.config import TIMEOUT, MAX_PACKAGES_PER_WEBSITE, SITEMAP_MAX_FILES, SITEMAP_MAX_URLS
+from backend.matchers import PACKAGE_URL_MATCHER, NON_PACKAGE_URL_MATCHER
+from backend.scrapers.structured_data import package_urls as json_ld_package_urls
+
+# Sitemaps tried when robots.txt lists none
+DEFAULT_SITEMAP_PATHS = ['/sitemap.xml', '/sitemap_index.xml']
+
+# Links that point at files rather than pages
+NON_PAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.pdf', '.xml', '.gz', '.zip', '.css', '.js')
+
+# Score added for the source a candidate came from
+JSON_LD_SCORE = 5
+SITEMAP_SCORE = 0
+LINK_SCORE = 0
+
+# Durations in a slug, e.g. kerala-5-days, 4n5d, 3-nights
+SLUG_DURATION_PATTERN = re.compile(r'\d+\s*-?\s*(?:d|n|days?|nights?)(?![a-z])')
+
+_SITEMAP_ENTRY_TAGS = ('{*}url', '{*}sitemap')
+
+
+def _site_host(url):
+    """Host of a URL without a leading www."""
+    host = urlparse(url).netloc.lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class PackageDiscovery:
+    """
+    Finds a website's package pages from its sitemaps and structured data
+    
+    Candidates come from, in order of trust, the JSON-LD on the homepage
+    (TouristTrip/Product/Offer objects and ItemLists), the sitemaps listed
+    in robots.txt (sitemap indexes are followed, package sitemaps first)
+    and, if those come up short, the homepage links. Sitemaps are parsed
+    as a stream with lxml's iterparse, keeping only the best max_urls
+    candidates, so a catalogue of any size is covered in a few requests.
+    
+    Each URL is scored on its path: package words and detail-page slugs
+    (several words, a duration) raise it, while listing pages, files and
+    pages like /blog or /corporate-tours are dropped. Pages robots.txt
+    disallows are skipped.
+    """
+    
+    def __init__(self, scraper, max_urls=None, max_sitemaps=None, max_sitemap_urls=None):
+        """
+        Set up discovery for a scraper
+        
+        Args:
+            scraper (BaseScraper): Scraper whose session, cache and rate limiter are used
+            max_urls (int): Package pages returned per website
+            max_sitemaps (int): Sitemaps read per website
+            max_sitemap_urls (int): Sitemap URLs scanned per website
+        """
+        self.scraper = scraper
+        self.max_urls = max_urls or MAX_PACKAGES_PER_WEBSITE
+        self.max_sitemaps = max_sitemaps or SITEMAP_MAX_FILES
+        self.max_sitemap_urls = max_sitemap_urls or SITEMAP_MAX_URLS
+        self.logger = logging.getLogger(self.__class__.__name__)
+    
+    def discover(self, base_url, html_content, find_links=None):
+        """
+        Find and rank the package pages of a website
+        
+        Args:
+            base_url (str): Homepage URL
+            html_content (str): HTML content of the homepage
+            find_links (callable): Returns homepage link URLs; only called if
+                JSON-LD and sitemaps yield fewer than max_urls pages
+        
+        Returns:
+            list: Package page URLs, best first
+        """
+        candidates = _Candidates(self.max_urls)
+        robots = self._read_robots(base_url)
+        
+        def add(urls, source_score, lastmod='', priority=0.0, package_words_only=False):
+            for url in urls:
+                url = urljoin(base_url, url.strip()).split('#')[0]
+                if package_words_only and not PACKAGE_URL_MATCHER.search_any(urlparse(url).path.lower()):
+                    continue
+                if robots.can_fetch('*', url):
+                    score = self.score_url(url, base_url, source_score + priority)
+                    if score is not None:
+                        candidates.add(url, score, lastmod)
+        
+        root = self._parse(html_content)
+        if root is not None:
+            add(json_ld_package_urls(root), JSON_LD_SCORE)
+        found_in_json_ld = len(candidates)
+        
+        # Sitemaps list every page of the site, so only URLs that look like
+        # packages are kept
+        scanned = 0
+        for entry_url, lastmod, priority in self._iter_sitemap_urls(base_url, robots):
+            add([entry_url], SITEMAP_SCORE, lastmod, priority, package_words_only=True)
+            scanned += 1
+        found_in_sitemaps = len(candidates) - found_in_json_ld
+        
+        if len(candidates) < self.max_urls and find_links is not None:
+            add(find_links(), LINK_SCORE)
+        
+        self.logger.info(
+            f"Discovered {len(candidates)} package pages ({found_in_json_ld} from JSON-LD, "
+            f"{found_in_sitemaps} from {scanned} sitemap URLs)"
+        )
+        return candidates.best()
+    
+    def score_url(self, url, base_url, score=0.0):
+        """
+        Score how likely a URL is a package page
+        
+        Args:
+            url (str): Candidate URL
+            base_url (str): Homepage URL (candidates must be on the same site)
+            score (float): Starting score (from the candidate's source)
+        
+        Returns:
+            float: Score (higher is better), or None if the URL is not a package page
+        """
+        parsed = urlparse(url)
+        path = parsed.path.lower()
+        if parsed.scheme not in ('http', 'https') or _site_host(url) != _site_host(base_url):
+            return None
+        if not path.strip('/') or path.endswith(NON_PAGE_EXTENSIONS):
+            return None
+        if NON_PACKAGE_URL_MATCHER.search_any(path):
+            return None
+        
+        if PACKAGE_URL_MATCHER.search_any(path):
+            score += 2
+        
+        slug = path.rstrip('/').rsplit('/', 1)[-1]
+        if PACKAGE_URL_MATCHER.search_any(slug) and '-' not in slug:
+            # A bare /tours or /packages is a listing, not a package
+            score -= 1
+        elif slug.count('-') >= 2:
+            score += 1
+        if SLUG_DURATION_PATTERN.search(slug):
+            score += 1
+        
+        return score
+    
+    def _parse(self, html_content):
+        """Parse a page with lxml, returning None if it cannot be parsed"""
+        if not html_content:
+            return None
+        try:
+            return lxml.html.document_fromstring(html_content.encode('utf-8'))
+        except (ValueError, etree.ParserError):
+            return None
+    
+    def _read_robots(self, base_url):
+        """Fetch and parse the website's robots.txt (allowing everything if missing)"""
+        robots = RobotFileParser(urljoin(base_url, '/robots.txt'))
+        content = self.scraper.fetch_url(robots.url)
+        robots.parse((content or '').splitlines())
+        return robots
+    
+    def _iter_sitemap_urls(self, base_url, robots):
+        """
+        Stream the page entries of a website's sitemaps
+        
+        Yields:
+            tuple: (URL, lastmod, priority) of each page entry
+        """
+        sitemaps = list(robots.site_maps() or [])
+        if not sitemaps:
+            sitemaps = [urljoin(base_url, path) for path in DEFAULT_SITEMAP_PATHS]
+        
+        pending = list(dict.fromkeys(sitemaps))
+        seen = set(pending)
+        read = 0
+        scanned = 0
+        
+        while pending and read < self.max_sitemaps and scanned < self.max_sitemap_urls:
+            sitemap_url = pending.pop(0)
+            read += 1
+            
+            nested = []
+            for tag, url, lastmod, priority in self._iter_sitemap(sitemap_url):
+                if tag == 'sitemap':
+                    if url not in seen and not NON_PACKAGE_URL_MATCHER.search_any(urlparse(url).path.lower()):
+                        seen.add(url)
+                        nested.append(url)
+                else:
+                    yield url, lastmod, priority
+                    scanned += 1
+                    if scanned >= self.max_sitemap_urls:
+                        break
+            
+            # Sitemaps named after packages or tours are read first
+            nested.sort(key=lambda url: not PACKAGE_URL_MATCHER.search_any(url.lower()))
+            pending = nested + pending
+    
+    def _iter_sitemap(self, sitemap_url):
+        """
+        Stream the entries of one sitemap (or sitemap index)
+        
+        Yields:
+            tuple: ('url' or 'sitemap', location, lastmod, priority)
+        """
+        self.scraper.rate_limiter.acquire(sitemap_url)
+        try:
+            response = self.scraper.session.get(sitemap_url, timeout=TIMEOUT, stream=True)
+        except Exception as e:
+            self.logger.debug(f"Could not fetch sitemap {sitemap_url}: {e}")
+            return
+        
+        with response:
+            self.scraper.rate_limiter.update(sitemap_url, response.status_code, response.headers.get('Retry-After'))
+            if response.status_code != 200:
+                self.logger.debug(f"No sitemap at {sitemap_url} (status {response.status_code})")
+                return
+            
+            # Keep the stream readable at EOF for the buffered readers on top
+            response.raw.decode_content = True
+            response.raw.auto_close = False
+            source = io.BufferedReader(response.raw)
+            if source.peek(2)[:2] == b'\x1f\x8b':
+                # .xml.gz files served as they are rather than gzip-encoded
+                source = io.BufferedReader(gzip.GzipFile(fileobj=source))
+            if source.peek(64)[:64].lstrip().lower().startswith((b'<!doctype html', b'<html')):
+                # Many sites answer a missing sitemap with an HTML page
+                self.logger.debug(f"No sitemap at {sitemap_url} (got an HTML page)")
+                return
+            
+            try:
+                for _, element in etree.iterparse(source, events=('end',), tag=_SITEMAP_ENTRY_TAGS,
+                                                  resolve_entities=False, no_network=True):
+                    location = (element.findtext('{*}loc') or '').strip()
+                    lastmod = (element.findtext('{*}lastmod') or '').strip()
+                    try:
+                        priority = float(element.findtext('{*}priority') or 0)
+                    except ValueError:
+                        priority = 0.0
+                    
+                    # Free parsed entries as we go
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+                    
+                    if location:
+                        yield etree.QName(element).localname, location, lastmod, priority
+            except (etree.XMLSyntaxError, OSError) as e:
+                self.logger.warning(f"Stopped reading sitemap {sitemap_url}: {e}")
+
+
+class _Candidates:
+    """The best scored URLs seen so far, bounded to a fixed number"""
+    
+    def __init__(self, limit):
+        self.limit = limit
+        self._heap = []
+        self._urls = set()
+    
+    def __len__(self):
+        return len(self._heap)
+    
+    def add(self, url, score, lastmod=''):
+        if url in self._urls:
+            return
+        entry = (score, lastmod, url)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, entry)
+            self._urls.add(url)
+        elif entry > self._heap[0]:
+            self._urls.discard(heapq.heapreplace(self._heap, entry)[2])
+            self._urls.add(url)
+    
+    def best(self):
+        """URLs best first (highest score, then most recently modified, then by URL)"""
+        ranked = sorted(self._heap, key=lambda entry: entry[2])
+        ranked.sort(key=lambda entry: entry[:2], reverse=True)
+        return [url for _, _, url in ranked]
@@ -0,0 +1,86 @@
+import os
+import json
+import time
+import logging
+import threading
+
+from backend.config import CACHE_DIR, FETCH_MODE_TTL_DAYS
+
+# Fetch modes a domain can be assigned
+MODE_HTTP = "http"
+MODE_BROWSER = "browser"
+
+
+class FetchModeStore:
+    """Per-domain record of whether pages need a browser to render"""
+    
+    def __init__(self, path=None, ttl_days=None):
+        """
+        Initialize the fetch mode store
+        
+        Args:
+            path (str): JSON file the decisions are persisted to
+            ttl_days (int): Days after which a domain is probed again
+        """
+        self.path = path or os.path.join(CACHE_DIR, 'fetch_modes.json')
+        self.ttl = (FETCH_MODE_TTL_DAYS if ttl_days is None else ttl_days) * 24 * 3600
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._modes = self._load()
+    
+    def _load(self):
+        """Load saved decisions, ignoring a missing or corrupt file"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable fetch mode file {self.path}: {e}")
+            return {}
+    
+    def get(self, domain):
+        """
+        Get the fetch mode decided for a domain
+        
+        Args:
+            domain (str): Website domain
+        
+        Returns:
+            str: MODE_HTTP or MODE_BROWSER, or None if the domain needs probing
+        """
+        with self._lock:
+            entry = self._modes.get(domain)
+        if not entry or time.time() - entry.get('probed_at', 0) > self.ttl:
+            return None
+        return entry.get('mode')
+    
+    def set(self, domain, mode):
+        """Record the fetch mode for a domain and persist it"""
+        with self._lock:
+            self._modes[domain] = {"mode": mode, "probed_at": time.time()}
+            snapshot = dict(self._modes)
+            
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, indent=4)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                self.logger.error(f"Error saving fetch modes to {self.path}: {e}")
+        
+        self.logger.info(f"Fetch mode for {domain}: {mode}")
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_fetch_mode_store():
+    """Return the process-wide fetch mode store shared by all scrapers"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = FetchModeStore()
+        return _default_store
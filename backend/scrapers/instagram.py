@@ -3,16 +3,7 @@ import json
 import os
 import random
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
-import undetected_chromedriver as uc
 
 from backend.scrapers.base import BaseScraper
 from backend.config import HEADLESS_BROWSER, USER_AGENTS
@@ -29,6 +20,9 @@ class InstagramScraper(BaseScraper):
     
     def start_driver(self):
         """Start undetected Chrome driver"""
+        # Browser libraries are only imported once a driver is needed
+        import undetected_chromedriver as uc
+        
         if self.driver is None:
             self.logger.info("Starting undetected Chrome WebDriver")
             
@@ -46,7 +40,7 @@ class InstagramScraper(BaseScraper):
             
             # Set realistic window size
             self.driver.set_window_size(1366, 768)
-            
+    
     def human_type(self, element, text):
         """Type like a human with random delays"""
         element.clear()
@@ -56,6 +50,8 @@ class InstagramScraper(BaseScraper):
     
     def random_mouse_movement(self):
         """Simulate random mouse movements"""
+        from selenium.webdriver.common.by import By
+        
         try:
             # Move to random element
             elements = self.driver.find_elements(By.TAG_NAME, "div")
@@ -68,9 +64,13 @@ class InstagramScraper(BaseScraper):
     
     def login(self, username, password):
         """Improved login with better anti-detection"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         if self.logged_in:
             return True
-            
+        
         try:
             self.start_driver()
             
@@ -137,17 +137,21 @@ class InstagramScraper(BaseScraper):
                 else:
                     self.logger.error("Login failed - could not verify success")
                     return False
-                    
+            
             except Exception as e:
                 self.logger.error(f"Login error: {e}")
                 return False
-                
+        
         except Exception as e:
             self.logger.error(f"Error during login: {e}")
             return False
     
     def scrape_profile(self, username):
         """Scrape profile with better website extraction"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             if not self.logged_in:
                 self.logger.warning("Not logged in. Attempting to scrape without login...")
@@ -250,7 +254,7 @@ class InstagramScraper(BaseScraper):
             self._save_results()
             
             return profile_data
-            
+        
         except Exception as e:
             self.logger.error(f"Error scraping profile {username}: {e}")
             return None
@@ -279,7 +283,7 @@ class InstagramScraper(BaseScraper):
         
         Args:
             username (str): Instagram username to scrape
-            
+        
         Returns:
             dict: Extracted profile data
         """
@@ -0,0 +1,559 @@
+import re
+import logging
+from urllib.parse import urlparse, urljoin
+
+import lxml.html
+from lxml import etree
+
+from backend.scrapers.structured_data import package_details
+from backend.matchers import (
+    KeywordAutomaton, PRICE_TEXT_PATTERN, DURATION_TEXT_PATTERN, PRICE_PATTERNS, DURATION_PATTERNS,
+    DESTINATION_TITLE_PATTERNS, DESTINATION_SUFFIX_PATTERN, DAY_PATTERN
+)
+
+# Selectors for each package field, tried in order
+TITLE_SELECTORS = ['h1', 'h2.title', 'h2.package-title', '.page-title', '.tour-title', '.package-name']
+HEADING_SELECTOR = 'h1, h2, h3'
+DESCRIPTION_META_SELECTOR = 'meta[name="description"]'
+DESCRIPTION_SELECTORS = [
+    '.description', '.package-description', '.tour-description',
+    '.content > p:first-of-type', 'article > p:first-of-type',
+    '.overview', '.summary', '.intro', '.about-tour'
+]
+PRICE_SELECTORS = [
+    '.price', '.package-price', '.tour-price', '.cost',
+    '.rate', '.amount', '[class*="price"]', '[class*="cost"]',
+    '.pricing', '.tour-cost', '.package-cost'
+]
+DURATION_SELECTORS = [
+    '.duration', '.days', '.nights', '.package-duration',
+    '.tour-duration', '[class*="duration"]', '[class*="days"]'
+]
+DESTINATION_SELECTORS = [
+    '.destination', '.location', '.place', '[class*="destination"]',
+    '[class*="location"]', '.tour-location', '.package-destination'
+]
+ITINERARY_SELECTORS = [
+    '.itinerary', '.day-by-day', '.schedule', '.tour-plan',
+    '.trip-plan', '.daily-plan', '.day-wise', '[class*="itinerary"]'
+]
+IMAGE_SELECTORS = [
+    '.gallery img', '.slider img', '.carousel img',
+    '.package-image img', '.tour-image img', '.photos img',
+    'article img', '.content img', '[class*="gallery"] img'
+]
+
+# Keywords that locate list sections (inclusions, exclusions, highlights)
+LIST_KEYWORDS = {
+    "inclusions": ['inclusion', 'included', 'include'],
+    "exclusions": ['exclusion', 'excluded', 'exclude', 'not included'],
+    "highlights": ['highlight', 'feature', 'attraction']
+}
+
+# URL path segments that are never a destination
+NON_DESTINATION_SEGMENTS = {'tour', 'tours', 'package', 'packages', 'trip', 'trips', 'destination', 'destinations'}
+
+ITINERARY_DAY_TAGS = ('h3', 'h4', 'h5', 'strong', 'b')
+ITINERARY_DESCRIPTION_TAGS = ('p', 'div', 'span')
+
+# Visible text of an element, leaving out script and style contents
+_visible_text = etree.XPath('.//text()[not(parent::script) and not(parent::style)]')
+
+
+def element_text(element):
+    """Return the visible text of an element (like BeautifulSoup's .text)"""
+    return ''.join(_visible_text(element))
+
+
+def list_selectors(keywords):
+    """Build the selectors that locate a list section from its keywords"""
+    selectors = []
+    for keyword in keywords:
+        selectors.extend([
+            f'.{keyword}', f'#{keyword}', f'[class*="{keyword}"]',
+            f'h3:contains("{keyword.title()}")', f'h4:contains("{keyword.title()}")'
+        ])
+    return selectors
+
+
+class _Compound:
+    """One compound selector such as h2.title, [class*="price"] or p:first-of-type"""
+    
+    _TOKEN = re.compile(
+        r'\.(?P<cls>[\w-]+)'
+        r'|#(?P<id>[\w-]+)'
+        r'|\[class\*="(?P<contains_cls>[^"]+)"\]'
+        r'|\[(?P<attr>[\w-]+)="(?P<value>[^"]*)"\]'
+        r'|:first-of-type(?P<first>)'
+        r'|:contains\("(?P<text>[^"]*)"\)'
+    )
+    
+    def __init__(self, source):
+        self.source = source
+        self.tag = None
+        self.classes = []
+        self.id = None
+        self.class_contains = []
+        self.attrs = []
+        self.first_of_type = False
+        self.contains = None
+        
+        match = re.match(r'[a-zA-Z][a-zA-Z0-9]*', source)
+        pos = 0
+        if match:
+            self.tag = match.group(0).lower()
+            pos = match.end()
+        
+        while pos < len(source):
+            token = self._TOKEN.match(source, pos)
+            if not token:
+                raise ValueError(f"Unsupported selector: {source!r}")
+            if token.group('cls') is not None:
+                self.classes.append(token.group('cls'))
+            elif token.group('id') is not None:
+                self.id = token.group('id')
+            elif token.group('contains_cls') is not None:
+                self.class_contains.append(token.group('contains_cls'))
+            elif token.group('attr') is not None:
+                self.attrs.append((token.group('attr'), token.group('value')))
+            elif token.group('first') is not None:
+                self.first_of_type = True
+            else:
+                self.contains = token.group('text')
+            pos = token.end()
+    
+    def matches(self, element, class_tokens, class_value):
+        """Check everything except the index key the element was found by"""
+        if self.tag is not None and element.tag != self.tag:
+            return False
+        for cls in self.classes:
+            if cls not in class_tokens:
+                return False
+        if self.id is not None and element.get('id') != self.id:
+            return False
+        for substring in self.class_contains:
+            if substring not in class_value:
+                return False
+        for attr, value in self.attrs:
+            if element.get(attr) != value:
+                return False
+        if self.first_of_type:
+            sibling = element.getprevious()
+            while sibling is not None:
+                if sibling.tag == element.tag:
+                    return False
+                sibling = sibling.getprevious()
+        if self.contains is not None and self.contains not in element_text(element):
+            return False
+        return True
+
+
+class SelectorMatcher:
+    """
+    A set of CSS selectors compiled into one matcher
+    
+    All selectors are matched in a single depth-first walk of the tree.
+    Compounds are indexed by tag, class, id or class substring, so each
+    element is only tested against the few selectors that could apply to
+    it. Supported syntax is the subset the extractors use: compounds of
+    tag, .class, #id, [class*="..."], [attr="..."], :first-of-type and
+    :contains("..."), optionally preceded by one ancestor (descendant or
+    ">" child) compound, and comma-separated selector lists.
+    """
+    
+    _PARTS = re.compile(r'(?:"[^"]*"|[^\s>"])+|>')
+    
+    def __init__(self, selectors):
+        """
+        Compile the selectors
+        
+        Args:
+            selectors (iterable): Selector strings; each becomes a result key
+        """
+        self.keys = []
+        self._compounds = {}
+        self._rules = []  # (key, subject compound id, context compound id, child_only)
+        
+        for key in dict.fromkeys(selectors):
+            self.keys.append(key)
+            for alternative in key.split(','):
+                # Split on combinators, keeping quoted strings intact
+                parts = self._PARTS.findall(alternative)
+                if len(parts) == 1:
+                    self._rules.append((key, self._compound(parts[0]), None, False))
+                elif len(parts) == 2:
+                    self._rules.append((key, self._compound(parts[1]), self._compound(parts[0]), False))
+                elif len(parts) == 3 and parts[1] == '>':
+                    self._rules.append((key, self._compound(parts[2]), self._compound(parts[0]), True))
+                else:
+                    raise ValueError(f"Unsupported selector: {alternative!r}")
+        
+        self._compound_list = [_Compound(source) for source in self._compounds]
+        
+        # Index compounds by the cheapest key that must be present
+        self._by_tag = {}
+        self._by_class = {}
+        self._by_id = {}
+        self._by_class_contains = {}
+        self._unindexed = []
+        for compound_id, compound in enumerate(self._compound_list):
+            if compound.tag is not None:
+                self._by_tag.setdefault(compound.tag, []).append(compound_id)
+            elif compound.classes:
+                self._by_class.setdefault(compound.classes[0], []).append(compound_id)
+            elif compound.id is not None:
+                self._by_id.setdefault(compound.id, []).append(compound_id)
+            elif compound.class_contains:
+                self._by_class_contains.setdefault(compound.class_contains[0], []).append(compound_id)
+            else:
+                self._unindexed.append(compound_id)
+        
+        # Rules grouped by the compound that must match the element itself
+        self._rules_by_subject = {}
+        for rule in self._rules:
+            self._rules_by_subject.setdefault(rule[1], []).append(rule)
+        self._context_ids = {rule[2] for rule in self._rules if rule[2] is not None}
+        
+        # One scan of the class attribute finds every [class*="..."] candidate
+        self._class_substrings = KeywordAutomaton(self._by_class_contains)
+    
+    def _compound(self, source):
+        if source not in self._compounds:
+            self._compounds[source] = len(self._compounds)
+        return self._compounds[source]
+    
+    def _candidates(self, element, class_tokens, class_value):
+        candidates = list(self._by_tag.get(element.tag, ()))
+        for token in class_tokens:
+            candidates.extend(self._by_class.get(token, ()))
+        element_id = element.get('id')
+        if element_id is not None:
+            candidates.extend(self._by_id.get(element_id, ()))
+        if class_value:
+            for substring in self._class_substrings.find_all(class_value):
+                candidates.extend(self._by_class_contains[substring])
+        candidates.extend(self._unindexed)
+        return candidates
+    
+    def match(self, root):
+        """
+        Match every selector against a tree in one walk
+        
+        Args:
+            root: lxml element to walk
+        
+        Returns:
+            dict: Selector -> list of matching elements in document order
+        """
+        compounds = self._compound_list
+        matches = {key: [] for key in self.keys}
+        open_contexts = {}  # context compound id -> number of open ancestors matching it
+        stack = []  # context compound ids matched by each open element
+        
+        for event, element in etree.iterwalk(root, events=('start', 'end')):
+            if event == 'end':
+                for compound_id in stack.pop():
+                    open_contexts[compound_id] -= 1
+                continue
+            
+            if not isinstance(element.tag, str):
+                stack.append(())
+                continue
+            
+            class_value = element.get('class') or ''
+            if class_value:
+                class_tokens = class_value.split()
+                class_value = ' '.join(class_tokens)
+            else:
+                class_tokens = ()
+            
+            matched = [
+                compound_id for compound_id in self._candidates(element, class_tokens, class_value)
+                if compounds[compound_id].matches(element, class_tokens, class_value)
+            ]
+            
+            parent_contexts = stack[-1] if stack else ()
+            for compound_id in matched:
+                for key, _, context_id, child_only in self._rules_by_subject.get(compound_id, ()):
+                    if context_id is not None:
+                        if child_only and context_id not in parent_contexts:
+                            continue
+                        if not child_only and not open_contexts.get(context_id):
+                            continue
+                    found = matches[key]
+                    if not found or found[-1] is not element:
+                        found.append(element)
+            
+            contexts = tuple(compound_id for compound_id in matched if compound_id in self._context_ids)
+            for compound_id in contexts:
+                open_contexts[compound_id] = open_contexts.get(compound_id, 0) + 1
+            stack.append(contexts)
+        
+        return matches
+
+
+class PackageExtractor:
+    """Extracts travel package details from a page with a single parse and tree walk"""
+    
+    def __init__(self):
+        """Compile every field's selectors into one matcher"""
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self.list_selectors = {field: list_selectors(keywords) for field, keywords in LIST_KEYWORDS.items()}
+        
+        selectors = (
+            TITLE_SELECTORS + [HEADING_SELECTOR, DESCRIPTION_META_SELECTOR] + DESCRIPTION_SELECTORS +
+            PRICE_SELECTORS + DURATION_SELECTORS + DESTINATION_SELECTORS + ITINERARY_SELECTORS +
+            IMAGE_SELECTORS + [selector for field in self.list_selectors.values() for selector in field]
+        )
+        self.matcher = SelectorMatcher(selectors)
+    
+    def _parse(self, html_content):
+        """Parse HTML with lxml, returning None for empty documents"""
+        try:
+            return lxml.html.document_fromstring(html_content)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be parsed as bytes
+            return lxml.html.document_fromstring(html_content.encode('utf-8'))
+        except etree.ParserError:
+            return None
+    
+    def extract(self, html_content, url):
+        """
+        Extract details of a travel package from its page
+        
+        Args:
+            html_content (str): HTML content of the package page
+            url (str): URL of the package page
+        
+        Returns:
+            dict: Extracted package details
+        """
+        # Initialize package data structure
+        package_data = {
+            "url": url,
+            "title": None,
+            "description": None,
+            "destination": None,
+            "duration": None,
+            "price": None,
+            "inclusions": [],
+            "exclusions": [],
+            "itinerary": [],
+            "images": [],
+            "highlights": []
+        }
+        
+        root = self._parse(html_content)
+        if root is None:
+            return package_data
+        matches = self.matcher.match(root)
+        
+        package_data["title"] = self._extract_title(matches)
+        package_data["description"] = self._extract_description(matches)
+        package_data["price"] = self._extract_price(matches, html_content)
+        package_data["duration"] = self._extract_duration(matches, html_content)
+        package_data["destination"] = self._extract_destination(matches, package_data["title"], url)
+        package_data["itinerary"] = self._extract_itinerary(matches)
+        for field, selectors in self.list_selectors.items():
+            package_data[field] = self._extract_list_items(matches, selectors)
+        package_data["images"] = self._extract_images(matches, url)
+        
+        # Fill what the selectors missed from the page's JSON-LD, if any
+        for field, value in package_details(root).items():
+            if not package_data[field]:
+                package_data[field] = value
+        
+        return package_data
+    
+    def has_package_signals(self, html_content):
+        """
+        Check whether HTML already contains package data without rendering
+        
+        A page counts as usable when it has a title plus a price or a
+        duration, either in the usual package selectors or in its text.
+        
+        Args:
+            html_content (str): HTML content of a page
+        
+        Returns:
+            bool: True if the page can be scraped without a browser
+        """
+        root = self._parse(html_content)
+        if root is None:
+            return False
+        matches = self.matcher.match(root)
+        
+        if not any(matches[selector] for selector in TITLE_SELECTORS):
+            return False
+        if self._first_text_matching(matches, PRICE_SELECTORS, PRICE_TEXT_PATTERN):
+            return True
+        if self._first_text_matching(matches, DURATION_SELECTORS, DURATION_TEXT_PATTERN):
+            return True
+        
+        text = element_text(root)
+        return bool(PRICE_TEXT_PATTERN.search(text) or DURATION_TEXT_PATTERN.search(text))
+    
+    def _first_text_matching(self, matches, selectors, pattern):
+        """Return the text of the first selected element whose text matches pattern"""
+        for selector in selectors:
+            for element in matches[selector]:
+                text = element_text(element).strip()
+                if pattern.search(text):
+                    return text
+        return None
+    
+    def _extract_title(self, matches):
+        """Extract the package title"""
+        for selector in TITLE_SELECTORS:
+            if matches[selector]:
+                return element_text(matches[selector][0]).strip()
+        
+        # If no title found, use the most prominent heading
+        if matches[HEADING_SELECTOR]:
+            return element_text(matches[HEADING_SELECTOR][0]).strip()
+        return None
+    
+    def _extract_description(self, matches):
+        """Extract the package description"""
+        description = None
+        if matches[DESCRIPTION_META_SELECTOR]:
+            description = (matches[DESCRIPTION_META_SELECTOR][0].get('content') or '').strip()
+        
+        if not description or len(description) < 50:
+            # Look for description in common selectors
+            for selector in DESCRIPTION_SELECTORS:
+                elements = matches[selector]
+                if elements:
+                    text = ' '.join(element_text(element).strip() for element in elements[:2])
+                    if len(text) > 50:  # Only use if substantial
+                        return text
+        
+        return description
+    
+    def _extract_price(self, matches, html_content):
+        """Extract price information"""
+        price = self._first_text_matching(matches, PRICE_SELECTORS, PRICE_TEXT_PATTERN)
+        if price:
+            return price
+        
+        # Use regex on full content
+        for pattern in PRICE_PATTERNS:
+            match = pattern.search(html_content)
+            if match:
+                return f"₹{match.group(1)}"
+        
+        return None
+    
+    def _extract_duration(self, matches, html_content):
+        """Extract duration information"""
+        duration = self._first_text_matching(matches, DURATION_SELECTORS, DURATION_TEXT_PATTERN)
+        if duration:
+            return duration
+        
+        # Use regex patterns
+        for pattern in DURATION_PATTERNS:
+            match = pattern.search(html_content)
+            if match:
+                return match.group(0).strip()
+        
+        return None
+    
+    def _extract_destination(self, matches, title, url):
+        """Extract destination information"""
+        # Try common selectors first
+        for selector in DESTINATION_SELECTORS:
+            if matches[selector]:
+                return element_text(matches[selector][0]).strip()
+        
+        # Try to extract from title
+        if title:
+            for pattern in DESTINATION_TITLE_PATTERNS:
+                match = pattern.search(title)
+                if match:
+                    destination = match.group(1).strip()
+                    # Clean up common suffixes
+                    return DESTINATION_SUFFIX_PATTERN.sub('', destination)
+        
+        # Try from URL
+        for part in urlparse(url).path.strip('/').split('/'):
+            # Skip common non-destination parts
+            if part.lower() in NON_DESTINATION_SEGMENTS:
+                continue
+            # Clean and check if it looks like a destination
+            cleaned = part.replace('-', ' ').replace('_', ' ').title()
+            if len(cleaned) > 3 and cleaned.replace(' ', '').isalpha():
+                return cleaned
+        
+        return None
+    
+    def _extract_itinerary(self, matches):
+        """Extract itinerary information"""
+        itinerary = []
+        
+        for selector in ITINERARY_SELECTORS:
+            for section in matches[selector]:
+                # Try to find structured day elements
+                for element in section.iter(*ITINERARY_DAY_TAGS):
+                    if element is section:
+                        continue
+                    day_text = element_text(element).strip()
+                    if DAY_PATTERN.search(day_text):
+                        # Get description
+                        description = ""
+                        next_element = element.getnext()
+                        while next_element is not None and not isinstance(next_element.tag, str):
+                            next_element = next_element.getnext()
+                        if next_element is not None and next_element.tag in ITINERARY_DESCRIPTION_TAGS:
+                            description = element_text(next_element).strip()
+                        
+                        itinerary.append({
+                            "day": day_text,
+                            "description": description
+                        })
+            
+            if itinerary:
+                break
+        
+        return itinerary
+    
+    def _extract_list_items(self, matches, selectors):
+        """Extract list items from the first section matched by selectors"""
+        items = []
+        
+        for selector in selectors:
+            for section in matches[selector]:
+                # Look for list items nearby
+                parent = section.getparent() if section.tag in ('h3', 'h4', 'h5') else section
+                if parent is None:
+                    parent = section
+                
+                count = 0
+                for item in parent.iter('li', 'p'):
+                    if item is parent:
+                        continue
+                    if count == 10:  # Limit to 10 items
+                        break
+                    count += 1
+                    text = element_text(item).strip()
+                    if text and len(text) > 5 and text not in items:
+                        items.append(text)
+                
+                if items:
+                    return items
+        
+        return items
+    
+    def _extract_images(self, matches, base_url):
+        """Extract image URLs"""
+        images = []
+        
+        for selector in IMAGE_SELECTORS:
+            for img in matches[selector][:10]:  # Limit to 10 images
+                src = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
+                if src and not src.startswith('data:'):
+                    full_url = urljoin(base_url, src)
+                    if full_url not in images:
+                        images.append(full_url)
+        
+        return images
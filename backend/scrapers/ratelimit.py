@@ -0,0 +1,192 @@
+import time
+import asyncio
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from backend.config import RATE_LIMIT_PER_HOST, RATE_LIMIT_BURST, RATE_LIMIT_MIN_RATE, RATE_LIMIT_MAX_WAIT
+
+# Responses that ask us to slow down
+THROTTLE_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header
+    
+    Args:
+        value (str): Header value, either seconds or an HTTP date
+    
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostBucket:
+    """Token bucket of a single host"""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+
+class HostRateLimiter:
+    """
+    Per-host token buckets shared by all scrapers
+    
+    Every host gets a bucket that refills at its current rate (requests per
+    second) up to burst tokens. A request reserves a token and is told how
+    long to wait for it (tokens go negative while requests queue up), so a
+    thread sleeps or a coroutine awaits only for its own host while
+    requests to other hosts go ahead.
+    
+    The rate adapts to the server: a 429/503 response halves the host's
+    rate (down to min_rate) and blocks it for the Retry-After period, and
+    every successful response wins back a tenth of the base rate.
+    """
+    
+    def __init__(self, rate=None, burst=None, min_rate=None, max_wait=None):
+        """
+        Configure the limiter
+        
+        Args:
+            rate (float): Requests per second allowed per host
+            burst (int): Requests a host may receive back to back after idling
+            min_rate (float): Lowest rate a throttled host backs off to
+            max_wait (float): Longest Retry-After honoured, in seconds
+        """
+        self.rate = rate or RATE_LIMIT_PER_HOST
+        self.burst = burst or RATE_LIMIT_BURST
+        self.min_rate = min_rate or RATE_LIMIT_MIN_RATE
+        self.max_wait = max_wait or RATE_LIMIT_MAX_WAIT
+        self.logger = logging.getLogger(self.__class__.__name__)
+        
+        self._buckets = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _host(url):
+        """Host of a URL (a bare host name is returned as is)"""
+        return urlparse(url).netloc or url
+    
+    def _bucket(self, host):
+        """Bucket of a host, refilled up to now (lock must be held)"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _HostBucket(self.rate, self.burst)
+        
+        now = time.monotonic()
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated_at) * bucket.rate)
+        bucket.updated_at = now
+        return bucket
+    
+    def reserve(self, url):
+        """
+        Reserve a request slot for the URL's host without waiting
+        
+        Args:
+            url (str): URL (or host) about to be requested
+        
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        with self._lock:
+            bucket = self._bucket(self._host(url))
+            bucket.tokens -= 1
+            delay = max(0.0, -bucket.tokens / bucket.rate)
+        
+        if delay:
+            self.logger.debug(f"Waiting {delay:.2f} seconds for {self._host(url)}")
+        return delay
+    
+    def try_acquire(self, url):
+        """
+        Take a request slot for the URL's host only if one is free right now
+        
+        Unlike reserve, nothing is taken when the host has to wait, so the
+        caller can do other work and try again later.
+        
+        Args:
+            url (str): URL (or host) about to be requested
+        
+        Returns:
+            float: 0 if the slot was taken, else seconds until one frees up
+        """
+        with self._lock:
+            bucket = self._bucket(self._host(url))
+            if bucket.tokens >= 1:
+                bucket.tokens -= 1
+                return 0.0
+            return (1 - bucket.tokens) / bucket.rate
+    
+    def acquire(self, url):
+        """Block the calling thread until a request to the URL's host is allowed"""
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+        return delay
+    
+    async def acquire_async(self, url):
+        """Wait, without blocking the event loop, until a request to the URL's host is allowed"""
+        delay = self.reserve(url)
+        if delay:
+            await asyncio.sleep(delay)
+        return delay
+    
+    def update(self, url, status_code, retry_after=None):
+        """
+        Adapt a host's rate to a response
+        
+        Args:
+            url (str): URL that was requested
+            status_code (int): HTTP status code of the response
+            retry_after (str): Retry-After header of the response, if any
+        """
+        host = self._host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            
+            if status_code not in THROTTLE_STATUS_CODES:
+                bucket.rate = min(self.rate, bucket.rate + self.rate / 10)
+                return
+            
+            bucket.rate = max(self.min_rate, bucket.rate / 2)
+            wait = parse_retry_after(retry_after)
+            if wait is None:
+                wait = 1 / bucket.rate
+            wait = min(wait, self.max_wait)
+            
+            # Drop the saved-up burst and go into debt until Retry-After, so
+            # the next request to the host waits that long
+            bucket.tokens = min(bucket.tokens, 1 - wait * bucket.rate)
+        
+        self.logger.warning(
+            f"{host} answered {status_code}; slowing to {bucket.rate:.2f} requests/s "
+            f"and waiting {wait:.1f} seconds"
+        )
+
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide host rate limiter"""
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = HostRateLimiter()
+        return _default_limiter
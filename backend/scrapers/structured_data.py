@@ -0,0 +1,128 @@
+"""
+Schema.org JSON-LD blocks embedded in travel pages
+"""
+
+import json
+import logging
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+# Schema.org types that describe a bookable package
+PACKAGE_TYPES = {'TouristTrip', 'Trip', 'Product'}
+OFFER_TYPES = {'Offer', 'AggregateOffer'}
+
+CURRENCY_SYMBOLS = {'INR': '₹', 'USD': '$', 'EUR': '€', 'GBP': '£'}
+
+_json_ld_scripts = etree.XPath('//script[@type="application/ld+json"]/text()')
+
+
+def _types(item):
+    """Set of @type values of a JSON-LD object"""
+    types = item.get('@type') or []
+    return set(types) if isinstance(types, list) else {types}
+
+
+def iter_json_ld(root):
+    """
+    Yield every JSON-LD object in a parsed page
+    
+    @graph containers, top-level lists and ItemList entries are flattened,
+    so nested packages come out as objects of their own.
+    
+    Args:
+        root: lxml root element of the page
+    
+    Yields:
+        dict: JSON-LD objects
+    """
+    for script in _json_ld_scripts(root):
+        try:
+            data = json.loads(script, strict=False)
+        except ValueError:
+            logger.debug("Skipping invalid JSON-LD block")
+            continue
+        
+        pending = [data]
+        while pending:
+            item = pending.pop(0)
+            if isinstance(item, list):
+                pending.extend(item)
+            elif isinstance(item, dict):
+                yield item
+                pending.extend(item.get('@graph') or [])
+                # Breadcrumbs list the page's parents, not its packages
+                if 'BreadcrumbList' not in _types(item):
+                    pending.extend(item.get('itemListElement') or [])
+                if isinstance(item.get('item'), dict):
+                    pending.append(item['item'])
+
+
+def package_urls(root):
+    """
+    URLs of packages listed in a page's JSON-LD
+    
+    Args:
+        root: lxml root element of the page
+    
+    Returns:
+        list: URLs of TouristTrip/Product/Offer objects and ItemList entries
+    """
+    urls = []
+    for item in iter_json_ld(root):
+        types = _types(item)
+        if types & (PACKAGE_TYPES | OFFER_TYPES | {'ListItem'}) and isinstance(item.get('url'), str):
+            urls.append(item['url'])
+    return list(dict.fromkeys(urls))
+
+
+def _offer_price(offers):
+    """Price of the first offer with one, formatted like the scraped prices"""
+    for offer in offers if isinstance(offers, list) else [offers]:
+        if not isinstance(offer, dict):
+            continue
+        price = offer.get('price') or offer.get('lowPrice')
+        if price:
+            currency = offer.get('priceCurrency') or 'INR'
+            symbol = CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+            return f"{symbol}{price}"
+    return None
+
+
+def _image_urls(images):
+    """Image URLs of a JSON-LD image property (string, ImageObject or a list)"""
+    urls = []
+    for image in images if isinstance(images, list) else [images]:
+        if isinstance(image, dict):
+            image = image.get('url') or image.get('contentUrl')
+        if isinstance(image, str) and image:
+            urls.append(image)
+    return urls
+
+
+def package_details(root):
+    """
+    Package fields declared in a page's JSON-LD
+    
+    Args:
+        root: lxml root element of the package page
+    
+    Returns:
+        dict: title, description, price and images of the first
+            TouristTrip/Product object (only the fields it has), or an
+            empty dict if the page declares none
+    """
+    for item in iter_json_ld(root):
+        if not _types(item) & PACKAGE_TYPES:
+            continue
+        
+        details = {
+            "title": item.get('name'),
+            "description": item.get('description'),
+            "price": _offer_price(item.get('offers')),
+            "images": _image_urls(item.get('image'))
+        }
+        return {field: value for field, value in details.items() if value and not isinstance(value, dict)}
+    
+    return {}
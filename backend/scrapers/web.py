@@ -1,28 +1,25 @@
 import os
-import json
-import re
 import time
-import random
-import logging
+import asyncio
+from concurrent.futures import wait, FIRST_COMPLETED
 from urllib.parse import urlparse, urljoin
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from backend.scrapers.base import BaseScraper
-from backend.config import HEADLESS_BROWSER, USER_AGENTS, PACKAGE_KEYWORDS, USE_SELENIUM_FOR_WEBSITES
+from backend.scrapers.browser_pool import BrowserPool
+from backend.scrapers.fetch_strategy import get_fetch_mode_store, MODE_HTTP, MODE_BROWSER
+from backend.storage.results import ResultWriter, compact_results
+from backend.config import HEADLESS_BROWSER, USE_SELENIUM_FOR_WEBSITES, MAX_CONNECTIONS_PER_HOST
+from backend.matchers import PACKAGE_KEYWORD_MATCHER, PACKAGE_URL_MATCHER
 
 from backend.scrapers.package_extractor import PackageExtractor
-
+from backend.scrapers.discovery import PackageDiscovery
 
 class WebsiteScraper(BaseScraper):
     """Scraper for travel agency websites"""
     
-    def __init__(self, output_dir='data/raw', use_selenium=None, headless=None):
+    def __init__(self, output_dir='data/raw', use_selenium=None, headless=None,
+                 browser_pool=None, result_writer=None, checkpoint=None):
         """
         Initialize the website scraper
         
@@ -30,6 +27,12 @@ class WebsiteScraper(BaseScraper):
             output_dir (str): Directory to save scraped data
             use_selenium (bool): Whether to use Selenium for JavaScript-heavy sites
             headless (bool): Whether to run Chrome in headless mode
+            browser_pool (BrowserPool): Shared pool of Chrome drivers; a private
+                pool is created on first use if not given
+            result_writer (ResultWriter): Shared JSON Lines writer that packages
+                are streamed to; a private one in output_dir is used if not given
+            checkpoint (CrawlCheckpoint): Journal of extracted package pages, used
+                to skip pages finished by an interrupted earlier run
         """
         super().__init__(output_dir)
         
@@ -38,162 +41,472 @@ class WebsiteScraper(BaseScraper):
         self.headless = HEADLESS_BROWSER if headless is None else headless
         
         # Selenium setup
-        self.driver = None
+        self.browser_pool = browser_pool
+        self._owns_browser_pool = browser_pool is None
+        
+        # Per-domain choice between plain HTTP and browser rendering
+        self.fetch_modes = get_fetch_mode_store()
+        
+        # Compiled single-pass package extractor
+        self.extractor = PackageExtractor()
+        self.discovery = PackageDiscovery(self)
         
         # Data storage
         self.results = {}
+        self.result_writer = result_writer
+        self._owns_result_writer = result_writer is None
+        self.checkpoint = checkpoint
     
-    def _start_driver(self):
-        """Start the Selenium WebDriver if not already running"""
-        if self.driver is None and self.use_selenium:
-            self.logger.info("Starting Chrome WebDriver for website scraping")
-            
-            # Set up Chrome options
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument("--disable-infobars")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Set a random user agent
-            user_agent = random.choice(USER_AGENTS)
-            chrome_options.add_argument(f"--user-agent={user_agent}")
-            
-            # Initialize driver
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(5)
-            
-            # Execute script to hide webdriver
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    def _get_browser_pool(self):
+        """Return the browser pool, creating a private one if needed"""
+        if self.browser_pool is None:
+            self.browser_pool = BrowserPool(headless=self.headless)
+        return self.browser_pool
+    
+    def _get_result_writer(self):
+        """Return the results writer, creating a private one if needed"""
+        if self.result_writer is None:
+            self.result_writer = ResultWriter(os.path.join(self.output_dir, "website_packages.jsonl"))
+        return self.result_writer
     
-    def scrape(self, url):
+    def scrape(self, url, metadata=None, keep_packages=True):
         """
         Scrape a travel agency website to extract package information
         
+        Packages are written to the results writer as soon as they are
+        extracted, and the site's own record once it is done.
+        
         Args:
             url (str): Website URL to scrape
-            
+            metadata (dict): Extra fields for the website record, e.g. company_name,
+                category and popularity; company_name also keys the site in results
+            keep_packages (bool): Collect the packages in the returned data; when
+                False they only go to the results writer (package_count still counts them)
+        
         Returns:
             dict: Extracted website data
         """
+        website_data = self._start_site(url)
+        if website_data is None:
+            return None
+        
+        for package_data in self._iter_site(website_data, metadata):
+            if keep_packages:
+                website_data["packages"].append(package_data)
+        
+        return website_data
+    
+    def iter_packages(self, url, metadata=None):
+        """
+        Scrape a website, yielding each package as soon as it is extracted
+        
+        Package pages are fetched ahead concurrently while earlier ones are
+        parsed, so downstream stages overlap with fetching and nothing is
+        accumulated here. Packages also go to the results writer as usual.
+        Once the generator is exhausted the site's record (without its
+        packages) is written and kept in self.results.
+        
+        Args:
+            url (str): Website URL to scrape
+            metadata (dict): Extra fields for the website record (see scrape)
+        
+        Yields:
+            dict: Extracted package details
+        """
+        website_data = self._start_site(url)
+        if website_data is not None:
+            yield from self._iter_site(website_data, metadata)
+    
+    async def aiter_packages(self, url, metadata=None):
+        """
+        Async iterator version of iter_packages for asyncio pipelines
+        
+        The main page and page discovery run on a worker thread. Package
+        pages are then fetched concurrently as in fetch_many, waiting for the
+        host's connections and rate limiter on the event loop, and each
+        package is yielded once its page (and every earlier one) is parsed.
+        """
+        website_data = self._start_site(url)
+        if website_data is None:
+            return
+        
+        metadata = metadata or {}
+        site_key = self._site_key(website_data, metadata)
+        loop = asyncio.get_running_loop()
+        tasks = []
+        
+        try:
+            site = await loop.run_in_executor(None, self._discover_site, website_data)
+            if site is not None:
+                site_type, package_urls, main_html = site
+                if main_html is not None:
+                    package_data = await loop.run_in_executor(
+                        None, self._extract_package, website_data, site_key, main_html, website_data["url"], site_type
+                    )
+                    if package_data is not None:
+                        yield package_data
+                
+                if package_urls:
+                    mode, workers = self._page_fetch_limits(package_urls)
+                    tasks = self._start_fetches(
+                        package_urls, lambda page_url: self._fetch_page(page_url, rate_limited=True),
+                        max_per_host=workers, use_cache=mode == MODE_HTTP
+                    )
+                
+                for i, (package_url, task) in enumerate(zip(package_urls, tasks)):
+                    package_html = await task
+                    self.logger.info(f"Extracting package {i+1}/{len(package_urls)} from: {package_url}")
+                    package_data = await loop.run_in_executor(
+                        None, self._extract_package, website_data, site_key, package_html, package_url, site_type
+                    )
+                    if package_data is not None:
+                        yield package_data
+        except Exception as e:
+            self.logger.error(f"Error scraping website {website_data['url']}: {e}")
+            website_data["error"] = str(e)
+        finally:
+            # Pages not reached yet (the consumer stopped early) are not fetched
+            for task in tasks:
+                task.cancel()
+        
+        self._finish_site(website_data, metadata, site_key)
+    
+    def _start_site(self, url):
+        """Normalize a website URL and create its (empty) website record"""
         # Basic URL validation and normalization
         if not url:
             self.logger.warning("Empty URL provided")
             return None
-            
+        
         # Add protocol if missing
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         
+        # Create structure for results
+        return {
+            "url": url,
+            "domain": urlparse(url).netloc,
+            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "site_type": None,
+            "packages": [],
+            "package_count": 0,
+            "error": None
+        }
+    
+    def _iter_site(self, website_data, metadata):
+        """Yield a site's packages, then store and write its record"""
+        metadata = metadata or {}
+        site_key = self._site_key(website_data, metadata)
+        
         try:
-            # Parse domain for identification
-            domain = urlparse(url).netloc
-            
-            # Create structure for results
-            website_data = {
-                "url": url,
-                "domain": domain,
-                "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "site_type": None,
-                "packages": [],
-                "error": None
-            }
-            
-            # Fetch the main page
-            self.logger.info(f"Fetching main page: {url}")
-            html_content = self._fetch_page(url)
-            if not html_content:
-                website_data["error"] = "Could not fetch website content"
-                self.logger.warning(f"Could not fetch content from {url}")
-                return website_data
-            
-            # Identify site type
-            site_type = self._identify_site_type(html_content, domain)
-            website_data["site_type"] = site_type
-            self.logger.info(f"Identified site type: {site_type}")
-            
-            # Find package pages
-            package_urls = self._find_package_pages(html_content, url)
-            self.logger.info(f"Found {len(package_urls)} potential package pages")
-            
-            # If no package URLs found, try to extract packages from the main page
-            if not package_urls:
-                self.logger.info("No package URLs found, checking main page for packages")
-                package_data = self._extract_package_details(html_content, url, site_type)
-                if package_data and (package_data.get("title") or package_data.get("description")):
-                    website_data["packages"].append(package_data)
-            else:
-                # Extract packages from found URLs
-                for i, package_url in enumerate(package_urls[:10]):  # Limit to 10 packages
-                    self.logger.info(f"Extracting package {i+1}/{min(len(package_urls), 10)} from: {package_url}")
-                    package_html = self._fetch_page(package_url)
-                    if package_html:
-                        package_data = self._extract_package_details(package_html, package_url, site_type)
-                        if package_data and (package_data.get("title") or package_data.get("description")):
-                            website_data["packages"].append(package_data)
-                    
-                    # Add random delay between requests
-                    if i < min(len(package_urls), 10) - 1:
-                        self.random_delay(2, 5)
-            
-            # Store results
-            self.results[domain] = website_data
-            
-            # Save to file
-            self._save_results()
-            
-            return website_data
-            
+            yield from self._iter_site_packages(website_data, site_key)
         except Exception as e:
-            self.logger.error(f"Error scraping website {url}: {e}")
-            return {
-                "url": url,
-                "domain": urlparse(url).netloc if url else None,
-                "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-                "error": str(e),
-                "packages": []
-            }
+            self.logger.error(f"Error scraping website {website_data['url']}: {e}")
+            website_data["error"] = str(e)
+        
+        self._finish_site(website_data, metadata, site_key)
+    
+    @staticmethod
+    def _site_key(website_data, metadata):
+        """Key of a site in the results file: its company name, else its domain"""
+        return metadata.get('company_name') or website_data["domain"]
+    
+    def _finish_site(self, website_data, metadata, site_key):
+        """Store a finished site's record and write it to the results file"""
+        website_data.update(metadata)
+        self.results[website_data["domain"]] = website_data
+        self._get_result_writer().write_site(site_key, website_data)
+    
+    def _iter_site_packages(self, website_data, site_key):
+        """
+        Find and extract the packages of a website, yielding each one
+        
+        Args:
+            website_data (dict): Website record being filled in
+            site_key (str): Key of the site in the results file
+        
+        Yields:
+            dict: Each package kept (it has a title or description)
+        """
+        site = self._discover_site(website_data)
+        if site is None:
+            return
+        
+        site_type, package_urls, main_html = site
+        if main_html is not None:
+            package_data = self._extract_package(website_data, site_key, main_html, website_data["url"], site_type)
+            if package_data is not None:
+                yield package_data
+        
+        for i, (package_url, package_html) in enumerate(self._iter_pages(package_urls)):
+            self.logger.info(f"Extracting package {i+1}/{len(package_urls)} from: {package_url}")
+            package_data = self._extract_package(website_data, site_key, package_html, package_url, site_type)
+            if package_data is not None:
+                yield package_data
+    
+    def _discover_site(self, website_data):
+        """
+        Fetch a website's main page, identify its type and find its package pages
+        
+        Args:
+            website_data (dict): Website record being filled in
+        
+        Returns:
+            tuple: (site type, package page URLs not extracted yet, main page
+                HTML if the main page itself is to be extracted, else None),
+                or None if the main page could not be fetched
+        """
+        url = website_data["url"]
+        domain = website_data["domain"]
+        
+        # Fetch the main page
+        self.logger.info(f"Fetching main page: {url}")
+        html_content = self._fetch_page(url)
+        if not html_content:
+            website_data["error"] = "Could not fetch website content"
+            self.logger.warning(f"Could not fetch content from {url}")
+            return None
+        
+        # Identify site type
+        site_type = self._identify_site_type(html_content, domain)
+        website_data["site_type"] = site_type
+        self.logger.info(f"Identified site type: {site_type}")
+        
+        # Find package pages: JSON-LD and sitemaps first, homepage links if
+        # those come up short; best ranked first, MAX_PACKAGES_PER_WEBSITE at most
+        package_urls = self.discovery.discover(
+            url, html_content, find_links=lambda: self._find_package_pages(html_content, url)
+        )
+        self.logger.info(f"Found {len(package_urls)} potential package pages")
+        
+        # If no package URLs found, try to extract packages from the main page
+        if not package_urls:
+            self.logger.info("No package URLs found, checking main page for packages")
+            main_html = html_content if url not in self._done_package_urls(domain) else None
+            return site_type, [], main_html
+        
+        # Skip pages already extracted by an interrupted earlier run
+        done_urls = self._done_package_urls(domain)
+        if done_urls:
+            pending_urls = [package_url for package_url in package_urls if package_url not in done_urls]
+            self.logger.info(f"Skipping {len(package_urls) - len(pending_urls)} already extracted packages")
+            package_urls = pending_urls
+        
+        return site_type, package_urls, None
+    
+    def _extract_package(self, website_data, site_key, html_content, page_url, site_type):
+        """
+        Extract the package of a fetched page and stream it to the results file
+        
+        Returns:
+            dict: The package if it was kept, else None
+        """
+        if not html_content:
+            return None
+        package_data = self._extract_package_details(html_content, page_url, site_type)
+        if self._add_package(website_data, site_key, package_data, page_url):
+            return package_data
+        return None
+    
+    def _add_package(self, website_data, site_key, package_data, page_url):
+        """
+        Stream a package that has a title or description to the results file
+        
+        Returns:
+            bool: Whether the package was kept
+        """
+        kept = bool(package_data and (package_data.get("title") or package_data.get("description")))
+        if kept:
+            website_data["package_count"] += 1
+            self._get_result_writer().write_package(site_key, website_data["domain"], package_data)
+        
+        # The page is done either way, so a resumed run does not fetch it again
+        if self.checkpoint is not None:
+            self.checkpoint.mark_package(website_data["domain"], page_url)
+        
+        return kept
     
-    def _fetch_page(self, url):
+    def _done_package_urls(self, domain):
+        """Package page URLs of a domain extracted by an earlier run"""
+        if self.checkpoint is None:
+            return set()
+        return self.checkpoint.done_packages(domain)
+    
+    def _fetch_page(self, url, rate_limited=False):
         """
         Fetch the HTML content of a page, using Selenium if necessary
         
+        When Selenium is enabled, a domain is first probed with a plain HTTP
+        fetch. If the server-rendered HTML already carries package signals
+        the domain is remembered as HTTP-only; otherwise it is rendered in a
+        browser from then on.
+        
         Args:
             url (str): URL to fetch
-            
+            rate_limited (bool): The caller already took the host's rate limiter slot
+        
+        Returns:
+            str: HTML content if successful, None otherwise
+        """
+        if not self.use_selenium:
+            return self.fetch_url(url, rate_limited=rate_limited)
+        
+        domain = urlparse(url).netloc
+        mode = self.fetch_modes.get(domain)
+        
+        if mode == MODE_HTTP:
+            html_content = self.fetch_url(url, rate_limited=rate_limited)
+            if html_content:
+                return html_content
+            rate_limited = False
+        elif mode is None:
+            html_content = self.fetch_url(url, rate_limited=rate_limited)
+            if html_content and self._has_package_signals(html_content):
+                self.fetch_modes.set(domain, MODE_HTTP)
+                return html_content
+            if html_content:
+                self.fetch_modes.set(domain, MODE_BROWSER)
+            rate_limited = False
+        
+        # A render after a plain fetch is another request and waits for its own slot
+        return self._render_page(url, rate_limited=rate_limited)
+    
+    def _render_page(self, url, rate_limited=False):
+        """
+        Fetch the HTML content of a page by rendering it in Chrome
+        
+        Rendered pages are cached too; since a browser cannot revalidate
+        them, they are reused until the cache TTL expires.
+        
+        Args:
+            url (str): URL to fetch
+            rate_limited (bool): The caller already took the host's rate limiter slot
+        
         Returns:
             str: HTML content if successful, None otherwise
         """
-        if self.use_selenium:
-            try:
-                self._start_driver()
-                self.driver.get(url)
+        cached = self.response_cache.get(url, variant='rendered') if self.response_cache else None
+        if cached and self.response_cache.is_fresh(cached):
+            self.logger.debug(f"Serving rendered {url} from cache")
+            return cached.body
+        
+        # Selenium is only imported once a page actually needs a browser
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        try:
+            # Wait for the host's turn before taking a browser from the pool
+            if not rate_limited:
+                self.rate_limiter.acquire(url)
+            with self._get_browser_pool().lease() as driver:
+                driver.get(url)
                 
                 # Wait for page to load
-                WebDriverWait(self.driver, 10).until(
+                WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.TAG_NAME, "body"))
                 )
                 
                 # Scroll to load lazy-loaded content
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
                 time.sleep(1)
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 time.sleep(1)
                 
                 # Get page source
-                return self.driver.page_source
-            except Exception as e:
-                self.logger.error(f"Error fetching page with Selenium: {e}")
-                # Fallback to requests
-                return self.fetch_url(url)
-        else:
+                page_source = driver.page_source
+            
+            if self.response_cache:
+                self.response_cache.put(url, page_source, variant='rendered')
+            return page_source
+        except Exception as e:
+            self.logger.error(f"Error fetching page with Selenium: {e}")
+            # Fallback to requests
             return self.fetch_url(url)
     
+    def _has_package_signals(self, html_content):
+        """
+        Check whether server-rendered HTML already contains package data
+        
+        Args:
+            html_content (str): HTML content of a page
+        
+        Returns:
+            bool: True if the page can be scraped without a browser
+        """
+        return self.extractor.has_package_signals(html_content)
+    
+    def _page_fetch_limits(self, urls):
+        """
+        How the pages of one site are fetched
+        
+        Args:
+            urls (list): Page URLs of the site
+        
+        Returns:
+            tuple: (fetch mode of the site's domain, pages fetched at once)
+        """
+        mode = self.fetch_modes.get(urlparse(urls[0]).netloc) if self.use_selenium else MODE_HTTP
+        if mode == MODE_HTTP:
+            return mode, MAX_CONNECTIONS_PER_HOST
+        # Render at most one page per pooled browser
+        return mode, min(self._get_browser_pool().size, MAX_CONNECTIONS_PER_HOST)
+    
+    def _iter_pages(self, urls):
+        """
+        Fetch several pages of the same site, yielding each as it is ready
+        
+        Pages are fetched ahead on the fetch thread pool, at most
+        MAX_CONNECTIONS_PER_HOST at once (and, for rendered pages, no more
+        than the browser pool has drivers), so later pages download while
+        earlier ones are being parsed. A page is only handed to a worker once
+        the host's rate limiter has a slot for it; until then this generator
+        waits itself, so no worker thread sits asleep on a slow host.
+        
+        Args:
+            urls (list): URLs to fetch
+        
+        Yields:
+            tuple: (url, HTML content or None on failure), in input order
+        """
+        if not urls:
+            return
+        
+        mode, workers = self._page_fetch_limits(urls)
+        workers = min(workers, len(urls))
+        if workers <= 1:
+            for url in urls:
+                yield url, self._fetch_page(url)
+            return
+        
+        executor = self._get_fetch_executor()
+        futures = []  # Futures of urls[:len(futures)]; None once yielded
+        
+        for i, url in enumerate(urls):
+            while True:
+                running = [future for future in futures[i:] if not future.done()]
+                
+                # Hand out pages while workers are free and the host has slots
+                delay = None
+                while len(futures) < len(urls) and len(running) < workers:
+                    next_url = urls[len(futures)]
+                    fresh = mode == MODE_HTTP and self._fresh_cached(next_url) is not None
+                    delay = 0.0 if fresh else self.rate_limiter.try_acquire(next_url)
+                    if delay:
+                        break
+                    future = executor.submit(self._fetch_page, next_url, rate_limited=True)
+                    futures.append(future)
+                    running.append(future)
+                
+                if i < len(futures) and futures[i].done():
+                    break
+                
+                # Until a fetch finishes or the next slot frees up
+                wait(running, timeout=delay, return_when=FIRST_COMPLETED)
+            
+            html_content, futures[i] = futures[i].result(), None
+            yield url, html_content
+    
     def _identify_site_type(self, html_content, domain):
         """
         Identify the type of website
@@ -201,7 +514,7 @@ class WebsiteScraper(BaseScraper):
         Args:
             html_content (str): HTML content of the main page
             domain (str): Website domain
-            
+        
         Returns:
             str: Site type (wordpress, wix, custom, etc.)
         """
@@ -243,7 +556,7 @@ class WebsiteScraper(BaseScraper):
         Args:
             html_content (str): HTML content of the main page
             base_url (str): Base URL of the website
-            
+        
         Returns:
             list: List of package page URLs
         """
@@ -276,13 +589,12 @@ class WebsiteScraper(BaseScraper):
             href_lower = href.lower()
             
             # Direct package indicators in URL
-            package_url_indicators = ['package', 'tour', 'trip', 'itinerary', 'holiday', 'vacation', 'travel']
-            if any(indicator in url_lower or indicator in href_lower for indicator in package_url_indicators):
+            if PACKAGE_URL_MATCHER.search_any(url_lower) or PACKAGE_URL_MATCHER.search_any(href_lower):
                 package_urls.add(full_url)
                 continue
             
             # Check if link text contains package keywords
-            if any(keyword in link_text for keyword in PACKAGE_KEYWORDS):
+            if PACKAGE_KEYWORD_MATCHER.search_any(link_text):
                 package_urls.add(full_url)
         
         # If few package links found, look for common navigation patterns
@@ -299,7 +611,7 @@ class WebsiteScraper(BaseScraper):
                     href = link.get('href', '')
                     link_text = link.text.strip().lower() if link.text else ""
                     
-                    if href and any(keyword in link_text for keyword in PACKAGE_KEYWORDS):
+                    if href and PACKAGE_KEYWORD_MATCHER.search_any(link_text):
                         full_url = urljoin(base_url, href)
                         if urlparse(full_url).netloc == base_domain:
                             package_urls.add(full_url)
@@ -315,307 +627,24 @@ class WebsiteScraper(BaseScraper):
             html_content (str): HTML content of the package page
             url (str): URL of the package page
             site_type (str): Type of website
-            
+        
         Returns:
             dict: Extracted package details
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Initialize package data structure
-        package_data = {
-            "url": url,
-            "title": None,
-            "description": None,
-            "destination": None,
-            "duration": None,
-            "price": None,
-            "inclusions": [],
-            "exclusions": [],
-            "itinerary": [],
-            "images": [],
-            "highlights": []
-        }
-        
-        # Extract title - improved logic
-        title_selectors = ['h1', 'h2.title', 'h2.package-title', '.page-title', '.tour-title', '.package-name']
-        for selector in title_selectors:
-            title_elements = soup.select(selector)
-            if title_elements:
-                package_data["title"] = title_elements[0].text.strip()
-                break
-        
-        # If no title found, use the most prominent heading
-        if not package_data["title"]:
-            headings = soup.find_all(['h1', 'h2', 'h3'])
-            if headings:
-                package_data["title"] = headings[0].text.strip()
-        
-        # Extract description - improved logic
-        description_meta = soup.find('meta', attrs={'name': 'description'})
-        if description_meta:
-            package_data["description"] = description_meta.get('content', '').strip()
-        
-        if not package_data["description"] or len(package_data["description"]) < 50:
-            # Look for description in common selectors
-            description_selectors = [
-                '.description', '.package-description', '.tour-description',
-                '.content > p:first-of-type', 'article > p:first-of-type',
-                '.overview', '.summary', '.intro', '.about-tour'
-            ]
-            
-            for selector in description_selectors:
-                desc_elements = soup.select(selector)
-                if desc_elements:
-                    text = ' '.join([elem.text.strip() for elem in desc_elements[:2]])
-                    if len(text) > 50:  # Only use if substantial
-                        package_data["description"] = text
-                        break
-        
-        # Extract price with improved patterns
-        price_text = self._extract_price(soup, html_content)
-        if price_text:
-            package_data["price"] = price_text
-        
-        # Extract duration with improved patterns
-        duration_text = self._extract_duration(soup, html_content)
-        if duration_text:
-            package_data["duration"] = duration_text
-        
-        # Extract destination
-        destination_text = self._extract_destination(soup, html_content, package_data["title"], url)
-        if destination_text:
-            package_data["destination"] = destination_text
-        
-        # Extract itinerary
-        package_data["itinerary"] = self._extract_itinerary(soup)
-        
-        # Extract inclusions/exclusions
-        package_data["inclusions"] = self._extract_list_items(soup, ['inclusion', 'included', 'include'])
-        package_data["exclusions"] = self._extract_list_items(soup, ['exclusion', 'excluded', 'exclude', 'not included'])
-        
-        # Extract highlights
-        package_data["highlights"] = self._extract_list_items(soup, ['highlight', 'feature', 'attraction'])
-        
-        # Extract images
-        package_data["images"] = self._extract_images(soup, url)
-        
-        return package_data
-    
-    def _extract_price(self, soup, html_content):
-        """Extract price information"""
-        # Look for price in structured data
-        price_selectors = [
-            '.price', '.package-price', '.tour-price', '.cost',
-            '.rate', '.amount', '[class*="price"]', '[class*="cost"]',
-            '.pricing', '.tour-cost', '.package-cost'
-        ]
-        
-        for selector in price_selectors:
-            price_elements = soup.select(selector)
-            for elem in price_elements:
-                text = elem.text.strip()
-                if re.search(r'[₹$€£]\s*\d+|Rs\.?\s*\d+|\d+\s*(?:INR|USD|EUR)', text, re.IGNORECASE):
-                    return text
-        
-        # Use regex on full content
-        price_patterns = [
-            r'(?:Price|Cost|Fee|Rate|Starting from|From)[:\s]*(?:Rs\.?|INR|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)',
-            r'(?:Rs\.?|INR|₹)\s*(\d+(?:,\d+)*(?:\.\d+)?)',
-            r'(\d+(?:,\d+)*(?:\.\d+)?)\s*(?:Rs\.?|INR|₹)',
-            r'(?:USD?|US\$|\$)\s*(\d+(?:,\d+)*(?:\.\d+)?)'
-        ]
-        
-        for pattern in price_patterns:
-            matches = re.findall(pattern, html_content, re.IGNORECASE)
-            if matches:
-                # Return the first match with currency symbol
-                match = matches[0]
-                if isinstance(match, tuple):
-                    match = match[0]
-                return f"₹{match}"
-        
-        return None
-    
-    def _extract_duration(self, soup, html_content):
-        """Extract duration information"""
-        # Look for duration in common selectors
-        duration_selectors = [
-            '.duration', '.days', '.nights', '.package-duration',
-            '.tour-duration', '[class*="duration"]', '[class*="days"]'
-        ]
-        
-        for selector in duration_selectors:
-            duration_elements = soup.select(selector)
-            for elem in duration_elements:
-                text = elem.text.strip()
-                if re.search(r'\d+\s*(?:days?|nights?|D\s*\d*N)', text, re.IGNORECASE):
-                    return text
-        
-        # Use regex patterns
-        duration_patterns = [
-            r'(\d+)\s*(?:days?|Days?)\s*(?:and|&)?\s*(\d+)?\s*(?:nights?|Nights?)',
-            r'(\d+)\s*(?:nights?|Nights?)\s*(?:and|&)?\s*(\d+)?\s*(?:days?|Days?)',
-            r'(\d+)D\s*(\d+)N',
-            r'(\d+)\s*(?:Day|Night)(?:s)?\s+(?:Tour|Trip|Package)',
-            r'Duration[:\s]*(\d+)\s*(?:days?|nights?)'
-        ]
-        
-        for pattern in duration_patterns:
-            match = re.search(pattern, html_content, re.IGNORECASE)
-            if match:
-                return match.group(0).strip()
-        
-        return None
-    
-    def _extract_destination(self, soup, html_content, title, url):
-        """Extract destination information"""
-        # Try common selectors first
-        destination_selectors = [
-            '.destination', '.location', '.place', '[class*="destination"]',
-            '[class*="location"]', '.tour-location', '.package-destination'
-        ]
-        
-        for selector in destination_selectors:
-            dest_elements = soup.select(selector)
-            if dest_elements:
-                return dest_elements[0].text.strip()
-        
-        # Try to extract from title
-        if title:
-            # Common patterns in titles
-            dest_patterns = [
-                r'(?:in|to|at)\s+([A-Za-z\s&\-\']+?)(?:\s*[-–—]|\s+Tour|\s+Trip|\s+Package|$)',
-                r'^([A-Za-z\s&\-\']+?)\s+(?:Tour|Trip|Package|Vacation|Holiday)',
-                r'(?:Tour|Trip|Package|Holiday)\s+(?:to|in)\s+([A-Za-z\s&\-\']+)'
-            ]
-            
-            for pattern in dest_patterns:
-                match = re.search(pattern, title, re.IGNORECASE)
-                if match:
-                    destination = match.group(1).strip()
-                    # Clean up common suffixes
-                    destination = re.sub(r'\s*(?:Tour|Trip|Package|Holiday)s?\s*$', '', destination, flags=re.IGNORECASE)
-                    return destination
-        
-        # Try from URL
-        url_parts = urlparse(url).path.strip('/').split('/')
-        for part in url_parts:
-            # Skip common non-destination parts
-            if part.lower() in ['tour', 'tours', 'package', 'packages', 'trip', 'trips', 'destination', 'destinations']:
-                continue
-            # Clean and check if it looks like a destination
-            cleaned = part.replace('-', ' ').replace('_', ' ').title()
-            if len(cleaned) > 3 and cleaned.replace(' ', '').isalpha():
-                return cleaned
-        
-        return None
-    
-    def _extract_itinerary(self, soup):
-        """Extract itinerary information"""
-        itinerary = []
-        
-        # Common itinerary selectors
-        itinerary_selectors = [
-            '.itinerary', '.day-by-day', '.schedule', '.tour-plan',
-            '.trip-plan', '.daily-plan', '.day-wise', '[class*="itinerary"]'
-        ]
-        
-        for selector in itinerary_selectors:
-            itinerary_sections = soup.select(selector)
-            if itinerary_sections:
-                # Look for day-wise content
-                day_patterns = [
-                    r'Day\s*(\d+)',
-                    r'(\d+)(?:st|nd|rd|th)\s+Day',
-                    r'Day\s*[-–—]\s*(\d+)'
-                ]
-                
-                # Try to find structured day elements
-                for section in itinerary_sections:
-                    day_elements = section.find_all(['h3', 'h4', 'h5', 'strong', 'b'])
-                    
-                    for elem in day_elements:
-                        day_text = elem.text.strip()
-                        for pattern in day_patterns:
-                            if re.search(pattern, day_text, re.IGNORECASE):
-                                # Get description
-                                desc = ""
-                                next_elem = elem.find_next_sibling()
-                                if next_elem and next_elem.name in ['p', 'div', 'span']:
-                                    desc = next_elem.text.strip()
-                                
-                                itinerary.append({
-                                    "day": day_text,
-                                    "description": desc
-                                })
-                                break
-                
-                if itinerary:
-                    break
-        
-        return itinerary
-    
-    def _extract_list_items(self, soup, keywords):
-        """Extract list items based on keywords"""
-        items = []
-        
-        # Build selectors from keywords
-        selectors = []
-        for keyword in keywords:
-            selectors.extend([
-                f'.{keyword}', f'#{keyword}', f'[class*="{keyword}"]',
-                f'h3:contains("{keyword.title()}")', f'h4:contains("{keyword.title()}")'
-            ])
-        
-        for selector in selectors:
-            try:
-                sections = soup.select(selector)
-                for section in sections:
-                    # Look for list items nearby
-                    parent = section.parent if section.name in ['h3', 'h4', 'h5'] else section
-                    list_items = parent.find_all(['li', 'p'])
-                    
-                    for item in list_items[:10]:  # Limit to 10 items
-                        text = item.text.strip()
-                        if text and len(text) > 5 and text not in items:
-                            items.append(text)
-                    
-                    if items:
-                        return items
-            except:
-                continue
-        
-        return items
-    
-    def _extract_images(self, soup, base_url):
-        """Extract image URLs"""
-        images = []
-        
-        # Common image selectors for travel sites
-        image_selectors = [
-            '.gallery img', '.slider img', '.carousel img',
-            '.package-image img', '.tour-image img', '.photos img',
-            'article img', '.content img', '[class*="gallery"] img'
-        ]
-        
-        for selector in image_selectors:
-            img_elements = soup.select(selector)
-            for img in img_elements[:10]:  # Limit to 10 images
-                src = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
-                if src and not src.startswith('data:'):
-                    full_url = urljoin(base_url, src)
-                    if full_url not in images:
-                        images.append(full_url)
-        
-        return images
+        return self.extractor.extract(html_content, url)
     
     def _save_results(self):
-        """Save website scraping results to JSON file"""
-        self.save_to_json(self.results, "website_packages.json")
+        """Compact the streamed results into website_packages.json"""
+        writer = self._get_result_writer()
+        compact_results(writer.path, os.path.join(self.output_dir, "website_packages.json"))
     
     def close(self):
-        """Close the WebDriver if using Selenium"""
-        if self.driver:
-            self.logger.info("Closing Chrome WebDriver")
-            self.driver.quit()
-            self.driver = None
\ No newline at end of file
+        """Close the browser pool and results writer (if owned) and the fetch thread pool"""
+        if self.result_writer is not None and self._owns_result_writer:
+            self.result_writer.close()
+            self._save_results()
+            self.result_writer = None
+        if self.browser_pool is not None and self._owns_browser_pool:
+            self.browser_pool.close()
+            self.browser_pool = None
+        self._shutdown_fetch_executor()
\ No newline at end of file
@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from backend.config import ARCHIVE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Package table columns kept for every archived crawl
+ARCHIVE_COLUMNS = [
+    'url', 'package_id', 'site', 'domain', 'category', 'title', 'destination',
+    'price_paise', 'currency', 'days', 'nights'
+]
+
+
+class CrawlArchive:
+    """
+    History of every crawl's packages in date-partitioned Parquet files
+    
+    Each crawl is appended as one file, <root>/date=YYYY-MM-DD/<crawl id>.parquet,
+    holding the typed package table (see backend.storage.columnar) with the
+    crawl's scraped_at. A SQLite index next to the partitions records the
+    crawls and every package's price per crawl, keyed by package URL, so
+    price history and price movers are index lookups that never open a
+    partition. Crawl ids are timestamps, so they sort in crawl order.
+    """
+    
+    def __init__(self, root=None):
+        """
+        Open (or create) the archive
+        
+        Args:
+            root (str): Directory holding the partitions and index.sqlite3
+        """
+        self.root = root or ARCHIVE_DIR
+        os.makedirs(self.root, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.root, 'index.sqlite3'), timeout=30, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS crawls (
+                crawl_id TEXT PRIMARY KEY,
+                scraped_at TEXT NOT NULL,
+                path TEXT NOT NULL,
+                packages INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS prices (
+                url TEXT NOT NULL,
+                crawl_id TEXT NOT NULL,
+                price_paise INTEGER,
+                currency TEXT,
+                PRIMARY KEY (url, crawl_id)
+            );
+            CREATE INDEX IF NOT EXISTS prices_crawl ON prices (crawl_id);
+        """)
+        self._db.commit()
+    
+    def append(self, packages, scraped_at=None):
+        """
+        Archive one crawl
+        
+        Args:
+            packages (DataFrame): Package table of the crawl
+            scraped_at (datetime): When the crawl ran (default: now)
+        
+        Returns:
+            str: Id of the archived crawl
+        """
+        scraped_at = scraped_at or datetime.now()
+        crawl_id = scraped_at.strftime('%Y%m%dT%H%M%S%f')
+        
+        frame = packages[[column for column in ARCHIVE_COLUMNS if column in packages]].copy()
+        frame['scraped_at'] = pd.Timestamp(scraped_at)
+        
+        partition = os.path.join(self.root, f"date={scraped_at:%Y-%m-%d}")
+        os.makedirs(partition, exist_ok=True)
+        path = os.path.join(partition, f"{crawl_id}.parquet")
+        frame.to_parquet(f"{path}.tmp", engine='pyarrow', index=False)
+        os.replace(f"{path}.tmp", path)
+        
+        prices = frame[frame['url'].notna()].drop_duplicates('url', keep='last')
+        rows = [
+            (url, crawl_id, None if pd.isna(price) else int(price), None if pd.isna(currency) else str(currency))
+            for url, price, currency in zip(prices['url'], prices['price_paise'], prices['currency'])
+        ]
+        with self._lock:
+            with self._db:
+                self._db.execute(
+                    "INSERT INTO crawls VALUES (?, ?, ?, ?)",
+                    (crawl_id, scraped_at.strftime('%Y-%m-%d %H:%M:%S'), os.path.relpath(path, self.root), len(frame))
+                )
+                self._db.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?)", rows)
+        
+        logger.info(f"Archived {len(frame)} packages of crawl {crawl_id} to {path}")
+        return crawl_id
+    
+    def crawls(self):
+        """
+        Archived crawls, oldest first
+        
+        Returns:
+            DataFrame: crawl_id, scraped_at, path and packages of each crawl
+        """
+        with self._lock:
+            return pd.read_sql_query("SELECT * FROM crawls ORDER BY crawl_id", self._db)
+    
+    def load(self, since=None, until=None, columns=None):
+        """
+        Read archived package rows
+        
+        Only the partitions of crawls in the date range are opened.
+        
+        Args:
+            since (str): First date to include (YYYY-MM-DD), if any
+            until (str): Last date to include (YYYY-MM-DD), if any
+            columns (list): Columns to read (default: all)
+        
+        Returns:
+            DataFrame: Package rows of the selected crawls
+        """
+        query = "SELECT path FROM crawls WHERE 1 = 1"
+        params = []
+        if since:
+            query += " AND scraped_at >= ?"
+            params.append(since)
+        if until:
+            query += " AND scraped_at < date(?, '+1 day')"
+            params.append(until)
+        
+        with self._lock:
+            paths = [os.path.join(self.root, path) for path, in self._db.execute(query + " ORDER BY crawl_id", params)]
+        if not paths:
+            return pd.DataFrame(columns=columns or ARCHIVE_COLUMNS + ['scraped_at'])
+        return pd.concat([pd.read_parquet(path, engine='pyarrow', columns=columns) for path in paths],
+                         ignore_index=True)
+    
+    def price_history(self, url):
+        """
+        Price of a package in every crawl that saw it
+        
+        Args:
+            url (str): Package URL
+        
+        Returns:
+            DataFrame: scraped_at, price_paise and currency, oldest first
+        """
+        with self._lock:
+            return pd.read_sql_query(
+                """
+                SELECT crawls.scraped_at, prices.price_paise, prices.currency
+                FROM prices JOIN crawls USING (crawl_id)
+                WHERE prices.url = ?
+                ORDER BY prices.crawl_id
+                """,
+                self._db, params=(url,)
+            )
+    
+    def price_movers(self, threshold_pct, crawl_id=None):
+        """
+        Packages whose price moved by at least threshold_pct since their previous crawl
+        
+        Each package of the crawl is compared with the last earlier crawl
+        that saw it (in the same currency).
+        
+        Args:
+            threshold_pct (float): Minimum change, in percent of the old price
+            crawl_id (str): Crawl to compare (default: the latest)
+        
+        Returns:
+            DataFrame: url, old_price_paise, new_price_paise, currency and
+                change_pct, biggest moves first
+        """
+        with self._lock:
+            if crawl_id is None:
+                crawl_id = self._db.execute("SELECT MAX(crawl_id) FROM crawls").fetchone()[0]
+            movers = pd.read_sql_query(
+                """
+                SELECT cur.url, prev.price_paise AS old_price_paise, cur.price_paise AS new_price_paise,
+                       cur.currency
+                FROM prices AS cur
+                JOIN prices AS prev ON prev.url = cur.url AND prev.crawl_id = (
+                    SELECT MAX(crawl_id) FROM prices
+                    WHERE url = cur.url AND crawl_id < cur.crawl_id AND price_paise IS NOT NULL
+                )
+                WHERE cur.crawl_id = ? AND cur.price_paise IS NOT NULL AND prev.price_paise > 0
+                    AND cur.currency IS prev.currency
+                    AND ABS(cur.price_paise - prev.price_paise) * 100.0 >= ? * prev.price_paise
+                """,
+                self._db, params=(crawl_id, threshold_pct)
+            )
+        
+        movers['change_pct'] = (movers['new_price_paise'] - movers['old_price_paise']) * 100.0 / movers['old_price_paise']
+        order = movers['change_pct'].abs().sort_values(ascending=False, kind='stable').index
+        return movers.loc[order].reset_index(drop=True)
+    
+    def close(self):
+        """Close the index"""
+        with self._lock:
+            self._db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,95 @@
+import os
+import json
+import logging
+import threading
+
+from backend.storage.results import open_jsonl
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlCheckpoint:
+    """
+    Journal of crawl progress used to resume an interrupted run
+    
+    Two kinds of events are appended (and flushed) as the crawl goes:
+        {"event": "package", "domain": ..., "url": ...}  a package page was extracted
+        {"event": "site", "site": ...}                    a site finished without error
+    """
+    
+    def __init__(self, path, resume=False):
+        """
+        Open the checkpoint journal
+        
+        Args:
+            path (str): JSON Lines journal file
+            resume (bool): Load the existing journal and keep appending to it;
+                otherwise start a fresh journal
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._done_sites = set()
+        self._done_packages = {}
+        
+        if resume and os.path.exists(path):
+            self._load()
+        
+        self._file = open_jsonl(path, resume)
+    
+    def _load(self):
+        """Replay the journal written by a previous run"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # The last line may be torn if the process was killed
+                    continue
+                if event.get('event') == 'site':
+                    self._done_sites.add(event.get('site'))
+                elif event.get('event') == 'package':
+                    self._done_packages.setdefault(event.get('domain'), set()).add(event.get('url'))
+        
+        logger.info(
+            f"Resuming from checkpoint: {len(self._done_sites)} sites and "
+            f"{sum(len(urls) for urls in self._done_packages.values())} package pages already done"
+        )
+    
+    def _append(self, event):
+        with self._lock:
+            self._file.write(json.dumps(event, ensure_ascii=False) + '\n')
+            self._file.flush()
+    
+    def mark_package(self, domain, url):
+        """Record that a package page has been extracted"""
+        with self._lock:
+            self._done_packages.setdefault(domain, set()).add(url)
+        self._append({"event": "package", "domain": domain, "url": url})
+    
+    def mark_site_done(self, site):
+        """Record that a site has been fully scraped"""
+        with self._lock:
+            self._done_sites.add(site)
+        self._append({"event": "site", "site": site})
+    
+    def is_site_done(self, site):
+        """Whether a site was fully scraped by a previous run"""
+        with self._lock:
+            return site in self._done_sites
+    
+    def done_packages(self, domain):
+        """Package page URLs of a domain that were already extracted"""
+        with self._lock:
+            return set(self._done_packages.get(domain, ()))
+    
+    def close(self):
+        """Close the journal file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,159 @@
+import os
+import logging
+
+import pandas as pd
+
+from backend.config import PROCESSED_DIR
+from backend.processors.normalize import normalize_package
+
+logger = logging.getLogger(__name__)
+
+# Default location of the package table
+PACKAGES_TABLE = os.path.join(PROCESSED_DIR, 'packages.parquet')
+
+# Columns of the package table and their dtypes; prices are whole paise
+# (hundredths of the currency) so sums and comparisons stay exact
+PACKAGE_COLUMNS = {
+    'site': 'string',
+    'domain': 'string',
+    'category': 'category',
+    'package_id': 'string',
+    'canonical_id': 'string',
+    'url': 'string',
+    'title': 'string',
+    'destination': 'string',
+    'price_paise': 'Int64',
+    'currency': 'category',
+    'days': 'Int16',
+    'nights': 'Int16',
+    'price_text': 'string',
+    'duration_text': 'string',
+    'destination_text': 'string'
+}
+
+
+def package_rows(results):
+    """
+    Yield one typed row per scraped package
+    
+    Args:
+        results (dict): Website data keyed by site (website_packages.json layout)
+    
+    Yields:
+        dict: Row with the PACKAGE_COLUMNS fields
+    """
+    for site, website in results.items():
+        for package in website.get('packages') or []:
+            row = {
+                'site': site,
+                'domain': website.get('domain'),
+                'category': website.get('category'),
+                'package_id': package.get('package_id'),
+                'canonical_id': package.get('canonical_id'),
+                'url': package.get('url'),
+                'title': package.get('title'),
+                'price_text': package.get('price'),
+                'duration_text': package.get('duration'),
+                'destination_text': package.get('destination')
+            }
+            row.update(normalize_package(package))
+            yield row
+
+
+def packages_frame(results):
+    """
+    Normalize scraped results into a typed DataFrame, one row per package
+    
+    Args:
+        results (dict): Website data keyed by site (website_packages.json layout)
+    
+    Returns:
+        DataFrame: Columns and dtypes as in PACKAGE_COLUMNS
+    """
+    frame = pd.DataFrame.from_records(list(package_rows(results)), columns=list(PACKAGE_COLUMNS))
+    return frame.astype(PACKAGE_COLUMNS)
+
+
+def sites_frame(results):
+    """
+    One row per website (site, category), including websites without packages
+    
+    Args:
+        results (dict): Website data keyed by site (website_packages.json layout)
+    
+    Returns:
+        DataFrame: site and category columns
+    """
+    return pd.DataFrame({
+        'site': pd.Series(list(results), dtype='string'),
+        'category': pd.Series([website.get('category', 'Unknown') for website in results.values()], dtype='category')
+    })
+
+
+def sites_table_path(path=PACKAGES_TABLE):
+    """Path of the sites table kept next to a package table (packages.sites.parquet)"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.sites{ext}"
+
+
+def _write_parquet(frame, path):
+    """Write a DataFrame next to its destination and move it into place"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    frame.to_parquet(tmp_path, engine='pyarrow', index=False)
+    os.replace(tmp_path, path)
+
+
+def write_packages_table(results, path=PACKAGES_TABLE):
+    """
+    Write the normalized packages to a Parquet file
+    
+    The websites (including those without packages) go to a sites table
+    next to it (see sites_table_path). Both files are written next to their
+    destination and moved into place, so readers never see a partial table.
+    
+    Args:
+        results (dict): Website data keyed by site (website_packages.json layout)
+        path (str): Parquet file to (over)write
+    
+    Returns:
+        DataFrame: The table that was written
+    """
+    frame = packages_frame(results)
+    _write_parquet(sites_frame(results), sites_table_path(path))
+    _write_parquet(frame, path)
+    
+    logger.info(f"Wrote {len(frame)} packages from {len(results)} websites to {path}")
+    return frame
+
+
+def read_packages_table(path=PACKAGES_TABLE, columns=None):
+    """
+    Read the package table
+    
+    Args:
+        path (str): Parquet file written by write_packages_table
+        columns (list): Only read these columns (Parquet is columnar, so the
+            others are never loaded)
+    
+    Returns:
+        DataFrame: The packages
+    """
+    return pd.read_parquet(path, engine='pyarrow', columns=columns)
+
+
+def read_sites_table(path=PACKAGES_TABLE):
+    """
+    Read the sites table written with a package table
+    
+    Args:
+        path (str): Package table the sites were written with
+    
+    Returns:
+        DataFrame: site and category columns, or None for a package table
+            written without one
+    """
+    sites_path = sites_table_path(path)
+    if not os.path.exists(sites_path):
+        return None
+    return pd.read_parquet(sites_path, engine='pyarrow')
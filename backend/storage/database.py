@@ -0,0 +1,158 @@
+import time
+import logging
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from backend.config import DB_LOAD_BATCH_SIZE
+from backend.processors.dedup import package_id
+from backend.processors.normalize import normalize_package
+
+logger = logging.getLogger(__name__)
+
+# INSERT constructs that support ON CONFLICT, by dialect name
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+# SQLite's limit on bound parameters per statement
+SQLITE_MAX_VARIABLES = 32766
+
+PACKAGE_LIST_FIELDS = ('inclusions', 'exclusions', 'highlights', 'itinerary', 'images')
+
+
+def _parse_time(value):
+    """Parse a scraped_at timestamp ("%Y-%m-%d %H:%M:%S"), or None"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M:%S") if value else None
+    except ValueError:
+        return None
+
+
+class PackageLoader:
+    """
+    Bulk upserts scraped results into the Organiser and Package tables
+    
+    Rows are written in batches of batch_size with one multi-row
+    INSERT ... ON CONFLICT DO UPDATE per batch (PostgreSQL or SQLite), so a
+    crawl costs a few statements rather than an ORM object and a round trip
+    per package. Organisers are keyed by site key and packages by their
+    stable package_id, so loading the same crawl twice updates rows in place.
+    """
+    
+    def __init__(self, engine=None, batch_size=None):
+        """
+        Configure the loader
+        
+        Args:
+            engine: SQLAlchemy engine (default: the pooled engine of backend.models)
+            batch_size (int): Packages per INSERT statement
+        """
+        if engine is None:
+            from backend.models import get_engine
+            engine = get_engine()
+        self.engine = engine
+        self.batch_size = batch_size or DB_LOAD_BATCH_SIZE
+        
+        self._insert = _UPSERT_INSERTS.get(engine.dialect.name)
+        if self._insert is None:
+            raise ValueError(f"Bulk upserts are not supported for {engine.dialect.name} databases")
+    
+    def _upsert(self, connection, table, rows, key):
+        """Upsert rows into table in batches, updating every column but the key and created_at on conflict"""
+        if not rows:
+            return
+        
+        batch_size = self.batch_size
+        if self.engine.dialect.name == 'sqlite':
+            batch_size = max(1, min(batch_size, SQLITE_MAX_VARIABLES // len(rows[0])))
+        
+        # ON CONFLICT DO UPDATE skips the columns' onupdate, so updated_at is
+        # set here; created_at keeps the first load's time
+        columns = [column for column in rows[0] if column not in (key, 'created_at', 'updated_at')]
+        for start in range(0, len(rows), batch_size):
+            statement = self._insert(table).values(rows[start:start + batch_size])
+            updates = {column: statement.excluded[column] for column in columns}
+            if 'updated_at' in table.c:
+                updates['updated_at'] = func.now()
+            statement = statement.on_conflict_do_update(index_elements=[key], set_=updates)
+            connection.execute(statement)
+    
+    def load(self, results):
+        """
+        Upsert a crawl's organisers and packages
+        
+        Args:
+            results (dict): Website data keyed by site (website_packages.json layout)
+        
+        Returns:
+            dict: organisers and packages loaded, seconds taken and packages_per_minute
+        """
+        from backend.models import init_db
+        from backend.models.organiser import Organiser
+        from backend.models.package import Package
+        
+        started = time.perf_counter()
+        init_db(self.engine)
+        
+        organisers = []
+        for site, website in results.items():
+            organisers.append({
+                'key': site,
+                'name': website.get('company_name') or site,
+                'domain': website.get('domain'),
+                'url': website.get('url'),
+                'category': website.get('category'),
+                'popularity': website.get('popularity'),
+                'site_type': website.get('site_type'),
+                'last_scraped_at': _parse_time(website.get('scraped_at'))
+            })
+        
+        with self.engine.begin() as connection:
+            self._upsert(connection, Organiser.__table__, organisers, 'key')
+            organiser_ids = dict(connection.execute(
+                select(Organiser.key, Organiser.id).where(Organiser.key.in_(list(results)))
+            ).all())
+            
+            # One row per package_id; ON CONFLICT cannot touch a row twice in a statement
+            packages = {}
+            for site, website in results.items():
+                scraped_at = _parse_time(website.get('scraped_at'))
+                for package in website.get('packages') or []:
+                    row = self._package_row(package, organiser_ids.get(site), scraped_at)
+                    packages[row['package_id']] = row
+            
+            self._upsert(connection, Package.__table__, list(packages.values()), 'package_id')
+        
+        seconds = time.perf_counter() - started
+        per_minute = len(packages) * 60 / seconds if seconds else 0
+        logger.info(
+            f"Loaded {len(organisers)} organisers and {len(packages)} packages in {seconds:.2f}s "
+            f"({per_minute:,.0f} packages/min)"
+        )
+        return {
+            'organisers': len(organisers),
+            'packages': len(packages),
+            'seconds': seconds,
+            'packages_per_minute': per_minute
+        }
+    
+    @staticmethod
+    def _package_row(package, organiser_id, scraped_at):
+        """Column values of a scraped package"""
+        pid = package.get('package_id') or package_id(package)
+        row = {
+            'package_id': pid,
+            'canonical_id': package.get('canonical_id') or pid,
+            'organiser_id': organiser_id,
+            'url': package.get('url'),
+            'title': package.get('title'),
+            'description': package.get('description'),
+            'price_text': package.get('price'),
+            'duration_text': package.get('duration'),
+            'destination_text': package.get('destination'),
+            'scraped_at': scraped_at
+        }
+        row.update(normalize_package(package))
+        for field in PACKAGE_LIST_FIELDS:
+            row[field] = package.get(field) or []
+        return row
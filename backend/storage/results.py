@@ -0,0 +1,174 @@
+import os
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def open_jsonl(path, append=False):
+    """
+    Open a JSON Lines file for writing
+    
+    When appending to a file whose last line was torn (the process was
+    killed mid-write), the line is ended first so the next record starts on
+    a line of its own instead of being merged into the unreadable one.
+    
+    Args:
+        path (str): JSON Lines file
+        append (bool): Keep existing lines instead of truncating the file
+    
+    Returns:
+        file: Text file opened for appending (or writing)
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    f = open(path, 'a' if append else 'w', encoding='utf-8')
+    
+    if append and f.tell():
+        with open(path, 'rb') as existing:
+            existing.seek(-1, os.SEEK_END)
+            if existing.read(1) != b'\n':
+                f.write('\n')
+                f.flush()
+    return f
+
+
+class ResultWriter:
+    """
+    Append-only JSON Lines writer for scraped results
+    
+    Every package is written as its own record the moment it is extracted,
+    followed by one record per site once the site is finished. Each record
+    is flushed immediately, so a crash loses at most the record being
+    written. compact_results() turns the file into the legacy
+    website_packages.json layout.
+    
+    Record shapes:
+        {"type": "package", "site": <site key>, "domain": ..., "package": {...}}
+        {"type": "site", "site": <site key>, "website": {... without packages}}
+    """
+    
+    def __init__(self, path, append=False):
+        """
+        Open the results file
+        
+        Args:
+            path (str): JSON Lines file to write
+            append (bool): Keep existing records instead of truncating the file
+        """
+        self.path = path
+        self._file = open_jsonl(path, append)
+        self._lock = threading.Lock()
+    
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+    
+    def write_package(self, site, domain, package):
+        """Write one extracted package"""
+        self._write({"type": "package", "site": site, "domain": domain, "package": package})
+    
+    def write_site(self, site, website_data):
+        """Write a finished site's metadata (its packages are written separately)"""
+        website = {key: value for key, value in website_data.items() if key != 'packages'}
+        self._write({"type": "site", "site": site, "website": website})
+    
+    def close(self):
+        """Close the results file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def iter_records(path):
+    """Yield records from a JSON Lines results file, skipping a torn last line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping unreadable record on line {line_number} of {path}")
+
+
+def merge_records(records):
+    """
+    Merge JSON Lines records into the legacy results layout
+    
+    Args:
+        records (iterable): Records written by ResultWriter
+    
+    Returns:
+        dict: Website data keyed by site, each with its list of packages
+    """
+    sites = {}
+    packages = {}
+    
+    for record in records:
+        site = record.get('site')
+        if record.get('type') == 'package':
+            packages.setdefault(site, []).append(record.get('package'))
+            if site not in sites:
+                # Placeholder until (unless) the site's own record shows up
+                sites[site] = {"domain": record.get('domain'), "error": "Scrape did not finish"}
+        elif record.get('type') == 'site':
+            sites[site] = dict(record.get('website') or {})
+    
+    results = {}
+    for site, website in sites.items():
+        website['packages'] = packages.get(site, [])
+        results[site] = website
+    return results
+
+
+def compact_results(jsonl_path, json_path, transform=None):
+    """
+    Compact a JSON Lines results file into the legacy JSON file
+    
+    Args:
+        jsonl_path (str): Results written by ResultWriter
+        json_path (str): website_packages.json to (over)write
+        transform (callable): Called with the merged results to update them
+            in place before they are written
+    
+    Returns:
+        dict: The compacted results
+    """
+    results = merge_records(iter_records(jsonl_path))
+    if transform is not None:
+        transform(results)
+    
+    tmp_path = f"{json_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, json_path)
+    
+    logger.info(f"Compacted {jsonl_path} into {json_path}")
+    return results
+
+
+def load_results(path):
+    """
+    Load scraped results from either format
+    
+    Args:
+        path (str): website_packages.json or a JSON Lines results file
+    
+    Returns:
+        dict: Website data keyed by site
+    """
+    if path.endswith('.jsonl'):
+        return merge_records(iter_records(path))
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for TrippyPick's hot paths
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+# Modules timed by the imports benchmark
+IMPORT_MODULES = ['backend.config', 'backend.models', 'backend.scrapers.web', 'backend.scrapers.instagram', 'app']
+
+# Heavy libraries the imports benchmark reports as loaded
+HEAVY_LIBRARIES = ['pandas', 'numpy', 'sqlalchemy', 'selenium', 'undetected_chromedriver', 'spacy', 'requests', 'lxml']
+
+# Run in a fresh interpreter: import the module and report the time and what it loaded
+IMPORT_PROBE = """
+import sys, json, time
+start = time.perf_counter()
+__import__(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [name for name in sys.argv[2:] if name in sys.modules]}))
+"""
+
+
+def sample_package_page(cards=40, days=8):
+    """Build a synthetic but realistic travel package page"""
+    card_html = "\n".join(
+        f"""
+        <div class="col-md-4 package-card">
+            <a href="/india-trips/trip-{i}"><img src="/img/trip-{i}.jpg" alt="Trip {i}"></a>
+            <h3 class="card-title">Kashmir Getaway {i}</h3>
+            <span class="card-duration">{i % 7 + 2} Days {i % 7 + 1} Nights</span>
+            <span class="card-price">₹{12000 + i * 500:,}</span>
+            <ul class="tags"><li>Group tour</li><li>Meals</li></ul>
+        </div>"""
+        for i in range(cards)
+    )
+    itinerary_html = "\n".join(
+        f"<h4>Day {d}: Explore the valley</h4><p>Visit gardens, lakes and local markets on day {d}.</p>"
+        for d in range(1, days + 1)
+    )
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Kashmir Tour Packages</title>
+    <meta name="description" content="Book Kashmir tour packages with houseboat stays, Gulmarg gondola rides and guided sightseeing across the valley.">
+    <script>window.__STATE__ = {{"prices": [12999, 15999]}};</script>
+</head>
+<body>
+    <header><nav class="navbar"><a href="/">Home</a><a href="/tours">Tours</a><a href="/blog">Blog</a></nav></header>
+    <article>
+        <h1 class="page-title">Kashmir Tour Package - Paradise on Earth</h1>
+        <p>Kashmir is a land of snow-capped peaks, alpine meadows and serene lakes waiting to be explored.</p>
+        <div class="package-meta">
+            <span class="package-price">Starting from ₹18,999 per person</span>
+            <span class="package-duration">6 Days 5 Nights</span>
+            <span class="tour-location">Srinagar, Gulmarg, Pahalgam</span>
+        </div>
+        <div class="gallery"><img src="/img/k1.jpg"><img data-src="/img/k2.jpg"><img src="data:image/png;base64,xx"></div>
+        <div class="itinerary">{itinerary_html}</div>
+        <div class="inclusions"><h3>Inclusions</h3><ul><li>Accommodation on twin sharing</li><li>Daily breakfast and dinner</li><li>All transfers by private cab</li></ul></div>
+        <div class="exclusions"><h3>Exclusions</h3><ul><li>Airfare to Srinagar</li><li>Personal expenses</li></ul></div>
+        <div class="highlights"><ul><li>Shikara ride on Dal Lake</li><li>Gondola ride in Gulmarg</li></ul></div>
+    </article>
+    <section class="related">{card_html}</section>
+    <footer><p>© TrippyPick</p></footer>
+</body>
+</html>"""
+
+
+def sample_package_text(i=0):
+    """Build a synthetic package description like the ones the scrapers collect"""
+    return (
+        f"Kashmir Getaway {i} - 6 Days 5 Nights. Visit Srinagar, Gulmarg and Pahalgam with TrippyPick. "
+        "Stay in a luxury houseboat on Dal Lake, go trekking in the meadows and enjoy a shikara ride at sunset. "
+        "Explore Mughal gardens, heritage temples and local markets. Ideal for family trips with kids. "
+        "Inclusions: hotel accommodation, daily breakfast and dinner, airport pickup and drop, "
+        "private transport and an English speaking guide. Best time to visit is March to October. "
+        f"Starting from Rs. {12000 + i * 500} per person on twin sharing. Camping and rafting in Sonmarg on request."
+    )
+
+
+def load_pages(pages_dir):
+    """Load HTML pages from a directory, or fall back to a synthetic page"""
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, '**', '*'), recursive=True)):
+            if os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
+                if '<' in content:
+                    pages.append(content)
+        if pages:
+            return pages
+        print(f"No HTML pages found in {pages_dir}, using a synthetic page")
+    return [sample_package_page()]
+
+
+def time_per_call(func, items, repeat):
+    """Return the median time (seconds) of one call of func over items"""
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        for item in items:
+            func(item)
+        timings.append((time.process_time() - start) / len(items))
+    return statistics.median(timings)
+
+
+def bench_extraction(args):
+    """Compare the single-pass extractor with per-selector BeautifulSoup passes"""
+    from bs4 import BeautifulSoup
+    from backend.scrapers.package_extractor import PackageExtractor
+    
+    pages = load_pages(args.pages)
+    extractor = PackageExtractor()
+    selectors = [
+        selector for selector in extractor.matcher.keys
+        if ':contains(' not in selector
+    ]
+    
+    def legacy(html):
+        # The previous extraction parsed with html.parser and ran a separate
+        # soup.select pass per selector (a lower bound of its total cost)
+        soup = BeautifulSoup(html, 'html.parser')
+        for selector in selectors:
+            soup.select(selector)
+    
+    def single_pass(html):
+        extractor.extract(html, "https://example.com/kashmir-tour-packages")
+    
+    legacy_time = time_per_call(legacy, pages, args.repeat)
+    new_time = time_per_call(single_pass, pages, args.repeat)
+    
+    print(f"Pages: {len(pages)}")
+    print(f"BeautifulSoup per-selector passes: {legacy_time * 1000:.2f} ms/page")
+    print(f"Single-pass lxml extractor:        {new_time * 1000:.2f} ms/page")
+    print(f"Speedup: {legacy_time / new_time:.1f}x")
+
+
+def bench_nlp(args):
+    """Compare the shared per-document analysis with computing every field on its own"""
+    from backend.processors.nlp import NLPProcessor, DocAnalysis
+    
+    processor = NLPProcessor(args.model)
+    texts = [sample_package_text(i) for i in range(args.packages)]
+    
+    # Parse once up front so only the analysis is timed
+    items = list(zip(texts, processor.nlp.pipe(texts)))
+    extractors = {
+        'entities': processor._extract_entities,
+        'keywords': processor._extract_keywords,
+        'trip_type': processor._classify_trip_type,
+        'locations': processor._extract_locations,
+        'activities': processor._extract_activities,
+        'amenities': processor._extract_amenities,
+        'tags': processor._generate_tags
+    }
+    
+    def unshared(item):
+        # Every field on a fresh context, redoing trip type, locations,
+        # activities and lowercasing the way the helpers used to
+        text, doc = item
+        for field in processor.fields:
+            DocAnalysis(text, doc).get(field, extractors[field])
+    
+    def shared(item):
+        processor._analyze(*item)
+    
+    unshared_time = time_per_call(unshared, items, args.repeat)
+    shared_time = time_per_call(shared, items, args.repeat)
+    
+    print(f"Packages: {len(items)} ({args.model}, profile {processor.profile})")
+    print(f"Per-field analysis:    {unshared_time * 1e6:.1f} us/package")
+    print(f"Shared analysis:       {shared_time * 1e6:.1f} us/package")
+    print(f"Speedup: {unshared_time / shared_time:.1f}x")
+
+
+def bench_imports(args):
+    """Time importing each module in a fresh interpreter and list the heavy libraries it pulls in"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    
+    for module in args.modules:
+        timings = []
+        for _ in range(args.repeat):
+            probe = subprocess.run(
+                [sys.executable, '-c', IMPORT_PROBE, module] + HEAVY_LIBRARIES,
+                cwd=root, capture_output=True, text=True
+            )
+            if probe.returncode != 0:
+                print(f"{module}: import failed\n{probe.stderr.strip()}")
+                break
+            result = json.loads(probe.stdout.splitlines()[-1])
+            timings.append(result['seconds'])
+        else:
+            loaded = ', '.join(result['loaded']) or 'none'
+            print(f"{module:<28} {statistics.median(timings) * 1000:8.1f} ms   heavy libraries: {loaded}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TrippyPick micro-benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    extraction = subparsers.add_parser('extraction', help="Package page extraction CPU time")
+    extraction.add_argument('--pages', help="Directory of saved HTML pages, e.g. data/cache/http/bodies (default: synthetic page)")
+    extraction.add_argument('--repeat', type=int, default=5, help="Timing repetitions")
+    extraction.set_defaults(func=bench_extraction)
+    
+    nlp = subparsers.add_parser('nlp', help="Per-package NLP analysis CPU time (spaCy parsing excluded)")
+    nlp.add_argument('--model', default='en_core_web_sm', help="spaCy model name or path")
+    nlp.add_argument('--packages', type=int, default=200, help="Number of synthetic packages")
+    nlp.add_argument('--repeat', type=int, default=5, help="Timing repetitions")
+    nlp.set_defaults(func=bench_nlp)
+    
+    imports = subparsers.add_parser('imports', help="Import time of the entry points, each in a fresh interpreter")
+    imports.add_argument('modules', nargs='*', default=IMPORT_MODULES, help="Modules to import (default: %(default)s)")
+    imports.add_argument('--repeat', type=int, default=5, help="Timing repetitions")
+    imports.set_defaults(func=bench_imports)
+    
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,11 +7,6 @@ import time
 import re
 import json
 import logging
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import requests
 
@@ -46,6 +41,10 @@ class GoogleInstagramScraper(BaseScraper):
     
     def start_driver(self):
         """Start Chrome driver for Google search"""
+        # Selenium is only imported once a driver is needed
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        
         if not self.driver:
             options = Options()
             options.add_argument('--no-sandbox')
@@ -61,8 +60,20 @@ class GoogleInstagramScraper(BaseScraper):
     
     def search_google(self, query):
         """Search Google and return results"""
-        self.driver.get(f"https://www.google.com/search?q={query}")
-        time.sleep(random.uniform(2, 4))
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+        
+        search_url = f"https://www.google.com/search?q={query}"
+        self.rate_limiter.acquire(search_url)
+        self.driver.get(search_url)
+        
+        # Wait for the results to render before reading the page
+        try:
+            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.ID, "search")))
+        except TimeoutException:
+            self.logger.warning(f"Google results did not load for: {query}")
         return self.driver.page_source
     
     def extract_follower_count(self, text):
@@ -138,7 +149,7 @@ class GoogleInstagramScraper(BaseScraper):
             
             self.results[username] = profile_data
             return profile_data
-            
+        
         except Exception as e:
             self.logger.error(f"Error scraping {username}: {e}")
             return None
@@ -150,12 +161,14 @@ class GoogleInstagramScraper(BaseScraper):
             headers = {'User-Agent': random.choice(USER_AGENTS)}
             search_url = f"https://duckduckgo.com/html/?q=site:instagram.com/{username}+followers"
             
+            self.rate_limiter.acquire(search_url)
             response = requests.get(search_url, headers=headers)
+            self.rate_limiter.update(search_url, response.status_code, response.headers.get('Retry-After'))
             if response.status_code == 200:
                 followers = self.extract_follower_count(response.text)
                 if followers:
                     profile_data['followers'] = followers
-                    
+        
         except Exception as e:
             self.logger.debug(f"Alternative method failed: {e}")
         
@@ -165,10 +178,8 @@ class GoogleInstagramScraper(BaseScraper):
         """Scrape multiple Instagram profiles"""
         for username in usernames:
             self.logger.info(f"Scraping {username}...")
+            # Google and DuckDuckGo requests are paced by the rate limiter
             self.scrape_instagram_info(username)
-            
-            # Random delay
-            time.sleep(random.uniform(3, 6))
         
         # Save results
         self._save_results()
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+from backend.storage.archive import CrawlArchive
+from backend.storage.columnar import packages_frame
+
+RESULTS = {
+    "Goa Trips": {
+        "domain": "goatrips.in",
+        "category": "Tour Operator",
+        "packages": [
+            {"url": "https://goatrips.in/p/1", "title": "Goa Escape", "price": "₹9,999",
+             "duration": "3 Nights / 4 Days", "destination": "Goa"},
+            {"url": "https://goatrips.in/p/2", "title": "Goa Deluxe", "price": "Rs. 15,500",
+             "duration": "5D/4N", "destination": "goa"}
+        ]
+    },
+    "Empty Site": {"domain": "empty.in", "category": "OTA", "packages": []}
+}
+
+
+def test_archive_price_history_and_movers(tmp_path):
+    packages = packages_frame(RESULTS)
+    cheaper = packages.copy()
+    cheaper.loc[0, 'price_paise'] = 799900
+    
+    with CrawlArchive(str(tmp_path / 'archive')) as archive:
+        first = archive.append(packages, datetime(2024, 1, 1, 9))
+        second = archive.append(cheaper, datetime(2024, 1, 8, 9))
+        
+        assert list(archive.crawls()['crawl_id']) == [first, second]
+        assert len(archive.load(since='2024-01-05')) == 2
+        
+        history = archive.price_history("https://goatrips.in/p/1")
+        assert list(history['price_paise']) == [999900, 799900]
+        
+        movers = archive.price_movers(10)
+        assert list(movers['url']) == ["https://goatrips.in/p/1"]
+        assert movers.loc[0, 'change_pct'] == (799900 - 999900) * 100.0 / 999900
+        assert archive.price_movers(50).empty
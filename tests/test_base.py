@@ -0,0 +1,48 @@
+import time
+import asyncio
+import threading
+from collections import Counter
+
+from backend.scrapers import cache
+from backend.scrapers.base import BaseScraper
+from backend.scrapers.ratelimit import HostRateLimiter
+
+
+class StubScraper(BaseScraper):
+    """Scraper whose fetch_url records how many requests each host has in flight"""
+    
+    def __init__(self, output_dir):
+        super().__init__(output_dir)
+        self.rate_limiter = HostRateLimiter(rate=1000, burst=100)
+        self.in_flight = Counter()
+        self.most_in_flight = Counter()
+        self._lock = threading.Lock()
+    
+    def fetch_url(self, url, timeout=30, rate_limited=False):
+        host = url.split('/')[2]
+        with self._lock:
+            self.in_flight[host] += 1
+            self.most_in_flight[host] = max(self.most_in_flight[host], self.in_flight[host])
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight[host] -= 1
+        return f"<html>{url}</html>"
+    
+    def scrape(self, target):
+        return None
+
+
+def test_fetch_many_keeps_order_and_caps_each_host(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'HTTP_CACHE_ENABLED', False)
+    scraper = StubScraper(str(tmp_path))
+    urls = [f"https://{host}.com/{i}" for i in range(6) for host in ('a', 'b')]
+    
+    pages = asyncio.run(scraper.fetch_many(urls, max_per_host=2))
+    
+    assert pages == [f"<html>{url}</html>" for url in urls]
+    assert scraper.most_in_flight == {'a.com': 2, 'b.com': 2}
+
+
+def test_fetch_many_without_urls(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'HTTP_CACHE_ENABLED', False)
+    assert asyncio.run(StubScraper(str(tmp_path)).fetch_many([])) == []
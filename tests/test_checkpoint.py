@@ -0,0 +1,30 @@
+from backend.storage.checkpoint import CrawlCheckpoint
+
+
+def test_checkpoint_resume_replays_journal(tmp_path):
+    path = str(tmp_path / 'checkpoint.jsonl')
+    with CrawlCheckpoint(path) as checkpoint:
+        checkpoint.mark_package("goatrips.in", "https://goatrips.in/p/1")
+        checkpoint.mark_site_done("Goa Trips")
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"event": "site", "si')
+    
+    with CrawlCheckpoint(path, resume=True) as checkpoint:
+        assert checkpoint.is_site_done("Goa Trips")
+        assert checkpoint.done_packages("goatrips.in") == {"https://goatrips.in/p/1"}
+        assert checkpoint.done_packages("other.in") == set()
+        checkpoint.mark_site_done("Other")
+    
+    with CrawlCheckpoint(path, resume=True) as checkpoint:
+        assert checkpoint.is_site_done("Other")
+
+
+def test_checkpoint_without_resume_starts_over(tmp_path):
+    path = str(tmp_path / 'checkpoint.jsonl')
+    with CrawlCheckpoint(path) as checkpoint:
+        checkpoint.mark_site_done("Goa Trips")
+    
+    with CrawlCheckpoint(path) as checkpoint:
+        assert not checkpoint.is_site_done("Goa Trips")
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == ''
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from backend.storage.columnar import read_packages_table, read_sites_table, write_packages_table
+
+RESULTS = {
+    "Goa Trips": {
+        "domain": "goatrips.in",
+        "category": "Tour Operator",
+        "packages": [
+            {"url": "https://goatrips.in/p/1", "title": "Goa Escape", "price": "₹9,999",
+             "duration": "3 Nights / 4 Days", "destination": "Goa"},
+            {"url": "https://goatrips.in/p/2", "title": "Goa Deluxe", "price": "Rs. 15,500",
+             "duration": "5D/4N", "destination": "goa"}
+        ]
+    },
+    "Empty Site": {"domain": "empty.in", "category": "OTA", "packages": []}
+}
+
+
+def test_packages_table_round_trip(tmp_path):
+    path = str(tmp_path / 'packages.parquet')
+    written = write_packages_table(RESULTS, path)
+    
+    table = read_packages_table(path)
+    pd.testing.assert_frame_equal(table, written)
+    assert list(table['price_paise']) == [999900, 1550000]
+    assert list(table['days']) == [4, 5]
+    assert str(table['price_paise'].dtype) == 'Int64'
+    
+    assert list(read_packages_table(path, columns=['url']).columns) == ['url']
+
+
+def test_sites_table_keeps_websites_without_packages(tmp_path):
+    path = str(tmp_path / 'packages.parquet')
+    write_packages_table(RESULTS, path)
+    
+    sites = read_sites_table(path)
+    assert list(sites['site']) == ["Goa Trips", "Empty Site"]
+    assert list(sites['category']) == ["Tour Operator", "OTA"]
+
+
+def test_read_sites_table_missing(tmp_path):
+    assert read_sites_table(str(tmp_path / 'packages.parquet')) is None
@@ -0,0 +1,42 @@
+from backend.processors.dedup import DuplicateDetector, annotate_duplicates, package_id
+
+BOILERPLATE = (
+    "Experience the magic of the hills with our all inclusive holiday. Stay in handpicked hotels, "
+    "enjoy daily breakfast and dinner, private cab transfers and guided sightseeing with an expert local guide. "
+    "Book now and get free cancellation up to seven days before departure."
+)
+
+
+def test_cluster_groups_near_duplicates_only():
+    detector = DuplicateDetector()
+    clusters = detector.cluster([
+        ('a', f"Manali Escape. {BOILERPLATE}"),
+        ('b', f"Manali Escape! {BOILERPLATE}"),
+        ('c', "Scuba diving in the Andaman islands with two nights on Havelock beach and a glass bottom boat ride"),
+    ])
+    assert sorted(map(sorted, clusters)) == [['a', 'b']]
+
+
+def test_cluster_handles_a_large_bucket_of_boilerplate_copies():
+    # Thousands of listings sharing one description land in the same LSH
+    # buckets; they must come back as one cluster without pairwise comparisons
+    items = [(f"p{i}", f"Package {i}. {BOILERPLATE}") for i in range(3000)]
+    items.append(('other', "Desert safari in Jaisalmer with camel rides, folk music and a night in a Swiss tent camp"))
+    
+    clusters = DuplicateDetector().cluster(items)
+    
+    assert len(clusters) == 1
+    assert sorted(clusters[0]) == sorted(item_id for item_id, _ in items[:-1])
+
+
+def test_annotate_duplicates_shares_the_most_complete_canonical_id():
+    results = {
+        'site-a': {'packages': [{'url': 'https://a.com/manali', 'title': 'Manali Escape', 'description': BOILERPLATE}]},
+        'site-b': {'packages': [{'url': 'https://b.com/manali', 'title': 'Manali Escape', 'description': BOILERPLATE,
+                                 'price': '₹9,999'}]},
+    }
+    
+    assert annotate_duplicates(results) == 1
+    
+    canonical = package_id({'url': 'https://b.com/manali'})
+    assert [website['packages'][0]['canonical_id'] for website in results.values()] == [canonical, canonical]
@@ -0,0 +1,19 @@
+from backend.processors.enrichment import _analyze
+from backend.processors.nlp import NLPProcessor
+from backend.processors.nlp_cache import NLPCache
+
+
+def test_packages_sharing_text_keep_their_own_itinerary(tmp_path):
+    processor = NLPProcessor('blank:en', use_cache=False)
+    processor.cache = NLPCache(str(tmp_path / 'nlp.sqlite3'))
+    texts = [
+        ("Goa beach holiday", "Day 1: Arrive in Goa"),
+        ("Goa beach holiday", "Day 1: Fly to Delhi\nDay 2: Trek to the fort"),
+        ("Goa beach holiday", "")
+    ]
+    
+    results = _analyze(processor, texts)
+    
+    assert [day['activities'] for day in results[0]['itinerary']] == ["Arrive in Goa"]
+    assert [day['activities'] for day in results[1]['itinerary']] == ["Fly to Delhi", "Trek to the fort"]
+    assert 'itinerary' not in results[2]
@@ -0,0 +1,22 @@
+from backend.matchers import KeywordAutomaton
+
+
+def test_find_all_reports_overlapping_and_prefix_keywords():
+    automaton = KeywordAutomaton(['tour', 'tours', 'our', 'package', 'trek'])
+    
+    assert automaton.find_all("goa tours and packages") == {'tour', 'tours', 'our', 'package'}
+
+
+def test_search_any():
+    automaton = KeywordAutomaton(['itinerary', 'holiday'])
+    
+    assert automaton.search_any("a 5 day itinerary")
+    assert not automaton.search_any("contact us")
+    assert not automaton.search_any("")
+
+
+def test_empty_automaton_matches_nothing():
+    automaton = KeywordAutomaton([''])
+    
+    assert automaton.find_all("anything") == set()
+    assert not automaton.search_any("anything")
@@ -0,0 +1,22 @@
+from backend.processors.nlp import NLPProcessor
+from backend.processors.nlp_cache import NLPCache, normalize_text
+
+
+def test_normalize_text_keeps_one_line_break_between_fields():
+    assert normalize_text("  Goa\t Beach  Holiday \r\n\n  Visit  Goa ") == "Goa Beach Holiday\nVisit Goa"
+    assert normalize_text("Cafe\u0301") == "Caf\u00e9"
+
+
+def test_whitespace_variants_share_one_cached_result(tmp_path):
+    processor = NLPProcessor('blank:en', use_cache=False)
+    processor.cache = NLPCache(str(tmp_path / 'nlp.sqlite3'))
+    
+    first = processor.process_package_text("Goa Beach Holiday\nWe visit Goa and\nRelax on the beach")
+    computed = []
+    processor._analyze = lambda text, doc: computed.append(text)
+    second = processor.process_package_text("  Goa  Beach Holiday \n\n We visit Goa and\n  Relax on the beach\n")
+    
+    assert second == first
+    assert computed == []
+    # A location name stops at the end of its line
+    assert first['locations'] == ["Goa and"]
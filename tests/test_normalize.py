@@ -0,0 +1,53 @@
+import pytest
+
+from backend.processors.normalize import canonical_destination, parse_duration, parse_price
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("₹12,999", (1299900, 'INR')),
+    ("Rs. 1.2 Lakh", (12000000, 'INR')),
+    ("$1,299.50", (129950, 'USD')),
+    ("US$ 99", (9900, 'USD')),
+    ("EUR 450 per person", (45000, 'EUR')),
+    ("12999 INR", (1299900, 'INR')),
+    ("12,999/-", (1299900, 'INR')),
+    ("Price: 15000", (1500000, 'INR')),
+    ("", (None, None)),
+    (None, (None, None)),
+    ("Price on request", (None, None)),
+])
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    # A number next to another amount's marker is not the price
+    ("5D/4N ₹9,999", (999900, 'INR')),
+    ("Save 20% ₹9,999", (999900, 'INR')),
+    ("From 3 ₹ 4999", (499900, 'INR')),
+    ("Rs.45,000 + 5% GST", (4500000, 'INR')),
+])
+def test_parse_price_uses_the_amount_the_marker_is_attached_to(text, expected):
+    assert parse_price(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("5 Days 4 Nights", (5, 4)),
+    ("4N/5D", (5, 4)),
+    ("6 days", (6, 5)),
+    ("3 Nights", (4, 3)),
+    ("Flexible", (None, None)),
+])
+def test_parse_duration(text, expected):
+    assert parse_duration(text) == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("goa tour", "Goa"),
+    ("Goa  Packages", "Goa"),
+    ("Bangalore", "Bengaluru"),
+    ("Leh Ladakh Trip", "Ladakh"),
+    ("Tour Packages", None),
+])
+def test_canonical_destination(text, expected):
+    assert canonical_destination(text) == expected
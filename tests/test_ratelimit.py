@@ -0,0 +1,102 @@
+import time
+import asyncio
+
+import pytest
+
+from backend.scrapers import ratelimit
+from backend.scrapers.ratelimit import HostRateLimiter, parse_retry_after
+
+
+class FakeTime:
+    """Clock the limiter reads instead of the real one"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self):
+        return self.now
+    
+    def time(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(ratelimit, 'time', fake)
+    return fake
+
+
+def test_burst_then_paced_per_host(clock):
+    limiter = HostRateLimiter(rate=2, burst=2)
+    
+    assert [limiter.reserve('https://a.com/p/1') for _ in range(4)] == [0, 0, 0.5, 1.0]
+    # Another host has its own bucket
+    assert limiter.reserve('https://b.com/') == 0
+
+
+def test_bucket_refills_over_time(clock):
+    limiter = HostRateLimiter(rate=2, burst=2)
+    limiter.reserve('https://a.com/')
+    limiter.reserve('https://a.com/')
+    
+    clock.now += 0.5
+    assert limiter.reserve('https://a.com/') == 0
+
+
+def test_try_acquire_takes_nothing_while_the_host_must_wait(clock):
+    limiter = HostRateLimiter(rate=2, burst=1)
+    
+    assert limiter.try_acquire('https://a.com/') == 0
+    assert limiter.try_acquire('https://a.com/') == pytest.approx(0.5)
+    assert limiter.try_acquire('https://a.com/') == pytest.approx(0.5)
+    
+    clock.now += 0.5
+    assert limiter.try_acquire('https://a.com/') == 0
+
+
+def test_throttle_response_halves_rate_and_honours_retry_after(clock):
+    limiter = HostRateLimiter(rate=2, burst=2, min_rate=0.5)
+    
+    limiter.update('https://a.com/', 429, '10')
+    assert limiter._buckets['a.com'].rate == 1
+    assert limiter.reserve('https://a.com/') == pytest.approx(10)
+    
+    # Successful responses win the rate back a tenth of the base rate at a time
+    limiter.update('https://a.com/', 200)
+    assert limiter._buckets['a.com'].rate == pytest.approx(1.2)
+
+
+def test_rate_never_drops_below_min_rate(clock):
+    limiter = HostRateLimiter(rate=1, burst=1, min_rate=0.25, max_wait=1)
+    for _ in range(5):
+        limiter.update('https://a.com/', 503)
+    
+    assert limiter._buckets['a.com'].rate == 0.25
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('7', 7.0),
+    (None, None),
+    ('soon', None),
+    ('Wed, 21 Oct 2015 07:28:00 GMT', 0.0),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_acquire_async_spaces_requests_by_the_rate():
+    limiter = HostRateLimiter(rate=20, burst=1)
+    
+    async def acquire_twice():
+        started = time.monotonic()
+        delays = [await limiter.acquire_async('https://a.com/1'), await limiter.acquire_async('https://a.com/2')]
+        return delays, time.monotonic() - started
+    
+    delays, elapsed = asyncio.run(acquire_twice())
+    assert delays[0] == 0
+    assert delays[1] == pytest.approx(1 / 20, abs=0.005)
+    assert elapsed >= delays[1]
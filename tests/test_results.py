@@ -0,0 +1,33 @@
+from backend.storage.results import ResultWriter, compact_results, load_results
+
+
+def test_result_writer_compacts_to_legacy_layout(tmp_path):
+    jsonl_path = tmp_path / 'results.jsonl'
+    with ResultWriter(str(jsonl_path)) as writer:
+        writer.write_package("Goa Trips", "goatrips.in", {"url": "https://goatrips.in/p/1"})
+        writer.write_site("Goa Trips", {"domain": "goatrips.in", "category": "OTA", "packages": ["dropped"]})
+        # This site was interrupted before its own record was written
+        writer.write_package("Half Done", "half.in", {"url": "https://half.in/p/1"})
+    with open(jsonl_path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "site", "site": "Torn"')
+    
+    results = compact_results(str(jsonl_path), str(tmp_path / 'results.json'))
+    
+    assert results == {
+        "Goa Trips": {"domain": "goatrips.in", "category": "OTA", "packages": [{"url": "https://goatrips.in/p/1"}]},
+        "Half Done": {"domain": "half.in", "error": "Scrape did not finish", "packages": [{"url": "https://half.in/p/1"}]}
+    }
+    assert load_results(str(tmp_path / 'results.json')) == results
+    assert load_results(str(jsonl_path)) == results
+
+
+def test_result_writer_append_after_torn_line(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    with ResultWriter(path) as writer:
+        writer.write_site("A", {"domain": "a.in"})
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "site", "si')
+    with ResultWriter(path, append=True) as writer:
+        writer.write_site("B", {"domain": "b.in"})
+    
+    assert set(load_results(path)) == {"A", "B"}
@@ -0,0 +1,79 @@
+import time
+import asyncio
+
+import pytest
+
+from backend.scrapers import cache, web
+from backend.scrapers.fetch_strategy import FetchModeStore
+from backend.scrapers.ratelimit import HostRateLimiter
+from backend.storage.results import ResultWriter
+
+SITE = "https://tours.example"
+PAGES = [f"{SITE}/package/{i}" for i in range(6)]
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """WebsiteScraper over a fake site whose pages finish in reverse order"""
+    monkeypatch.setattr(cache, 'HTTP_CACHE_ENABLED', False)
+    monkeypatch.setattr(web, 'MAX_CONNECTIONS_PER_HOST', 4)
+    monkeypatch.setattr(web, 'get_fetch_mode_store', lambda: FetchModeStore(str(tmp_path / 'fetch_modes.json')))
+    
+    scraper = web.WebsiteScraper(
+        output_dir=str(tmp_path), use_selenium=False,
+        result_writer=ResultWriter(str(tmp_path / 'results.jsonl'))
+    )
+    scraper.rate_limiter = HostRateLimiter(rate=1000, burst=100)
+    scraper.fetched = []
+    
+    def fetch_page(url, rate_limited=False):
+        scraper.fetched.append(url)
+        if url in PAGES:
+            time.sleep(0.01 * (len(PAGES) - PAGES.index(url)))
+        return f"<html>{url}</html>"
+    
+    scraper._fetch_page = fetch_page
+    scraper.discovery.discover = lambda url, html_content, find_links: list(PAGES)
+    scraper._identify_site_type = lambda html_content, domain: 'tour_operator'
+    scraper._extract_package_details = lambda html_content, url, site_type: {"title": url, "url": url}
+    
+    yield scraper
+    scraper.close()
+    scraper.result_writer.close()
+
+
+def test_iter_packages_yields_in_page_order(scraper):
+    packages = [package["url"] for package in scraper.iter_packages(SITE)]
+    
+    assert packages == PAGES
+    assert scraper.results["tours.example"]["package_count"] == len(PAGES)
+
+
+def test_aiter_packages_yields_in_page_order(scraper):
+    async def collect():
+        return [package["url"] async for package in scraper.aiter_packages(SITE)]
+    
+    assert asyncio.run(collect()) == PAGES
+
+
+def test_look_ahead_stops_at_the_rate_limit(scraper):
+    # Three requests now, the next one in 100 seconds
+    scraper.rate_limiter = HostRateLimiter(rate=0.01, burst=3)
+    packages = scraper.iter_packages(SITE)
+    
+    assert [next(packages)["url"] for _ in range(3)] == PAGES[:3]
+    assert scraper.fetched[0] == SITE
+    assert set(scraper.fetched[1:]) == set(PAGES[:3]) and len(scraper.fetched) == 4
+    packages.close()
+
+
+def test_close_shuts_the_fetch_pool_down(scraper):
+    list(scraper.iter_packages(SITE))
+    executor = scraper._fetch_executor
+    assert executor is not None
+    
+    scraper.close()
+    
+    assert scraper._fetch_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)